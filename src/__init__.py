@@ -1,7 +1,19 @@
 # Main package initialization
-from .core.scraper import WebScraper
-from .core.analyzer import DataAnalyzer
-from .utils.config import config
-from .utils.logging import logger
+import importlib
+
+# Exports are imported on first access, so importing a submodule (e.g. in
+# tests or crawl workers) does not load the analyzer's torch/transformers stack
+_EXPORTS = {
+    'WebScraper': 'src.core.scraper',
+    'DataAnalyzer': 'src.core.analyzer',
+    'config': 'src.utils.config',
+    'logger': 'src.utils.logging'
+}
 
 __all__ = ['WebScraper', 'DataAnalyzer', 'config', 'logger']
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
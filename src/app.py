@@ -1,12 +1,15 @@
 import streamlit as st
 import os
 import sys
+import json
 import pandas as pd
 
 # Ensure the src directory is in the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.utils.config import config
+from src.utils.metrics import metrics
+from src.utils.profiling import profile_history
 from src.ui.styles import (
     apply_custom_theme, 
     sidebar_menu, 
@@ -16,8 +19,12 @@ from src.ui.styles import (
     success_message,
     error_message
 )
+from src.ui.results import render_results_table
 from src.core.scraper import WebScraper
 from src.core.analyzer import AIAnalyzer
+from src.core.analytics import ANALYTICS_COLUMNS, catalog_report, load_tools
+from src.core.ingestion import detect_file_kind, file_digest, iter_row_batches, iter_row_texts, read_columns
+from src.core.proxies import get_proxy_pool
 
 def render_home_page():
     """Render the home page with multilingual support"""
@@ -65,13 +72,27 @@ def render_scraper_page():
             'title': 'أداة استخراج محتوى الويب',
             'url_label': 'أدخل رابط الموقع للاستخراج',
             'scrape_button': 'استخراج المحتوى',
-            'max_pages_label': 'الحد الأقصى لعدد الصفحات'
+            'max_pages_label': 'الحد الأقصى لعدد الصفحات',
+            'profile_label': 'تحليل أداء هذا التشغيل',
+            'incremental_label': 'استخراج تزايدي (تخطي الصفحات غير المتغيرة)',
+            'diff_title': 'التغييرات منذ آخر تشغيل',
+            'added': 'مضافة',
+            'changed': 'معدلة',
+            'removed': 'محذوفة',
+            'unchanged_pages': 'صفحات غير متغيرة'
         },
         'en': {
             'title': 'Web Content Extraction Tool',
             'url_label': 'Enter website URL to scrape',
             'scrape_button': 'Scrape Content',
-            'max_pages_label': 'Maximum number of pages'
+            'max_pages_label': 'Maximum number of pages',
+            'profile_label': 'Profile this run',
+            'incremental_label': 'Incremental (skip unchanged pages)',
+            'diff_title': 'Changes since last run',
+            'added': 'Added',
+            'changed': 'Changed',
+            'removed': 'Removed',
+            'unchanged_pages': 'Unchanged pages'
         }
     }
     
@@ -89,6 +110,15 @@ def render_scraper_page():
         value=5
     )
     
+    # Opt-in profiling
+    profile = st.checkbox(
+        texts[current_lang]['profile_label'],
+        value=config.get('profiling.enabled', False)
+    )
+    
+    # Incremental re-scrape
+    incremental = st.checkbox(texts[current_lang]['incremental_label'])
+    
     # Scrape button
     if st.button(texts[current_lang]['scrape_button']):
         if not url:
@@ -105,7 +135,12 @@ def render_scraper_page():
                 
                 # Perform scraping with proper error handling
                 try:
-                    results = scraper.scrape(url, max_pages=max_pages)
+                    results = scraper.scrape(
+                        url, 
+                        max_pages=max_pages, 
+                        profile=profile, 
+                        incremental=incremental
+                    )
                     
                     if not results:
                         error_message(
@@ -114,28 +149,9 @@ def render_scraper_page():
                             else "No content found on this website"
                         )
                         return
-                        
-                    # Display results
-                    st.subheader(
-                        "نتائج الاستخراج" if current_lang == 'ar' else "Scraping Results"
-                    )
                     
-                    for result in results:
-                        st.markdown(f"**URL:** {result['url']}")
-                        st.markdown(f"**Page:** {result['page']}")
-                        
-                        if 'tools' in result and result['tools']:
-                            for tool in result['tools']:
-                                with st.expander(f"🛠️ {tool.get('name', 'Unknown Tool')}"):
-                                    st.markdown(f"**Description:** {tool.get('description', 'No description')}")
-                                    st.markdown(f"**Category:** {tool.get('category', 'Uncategorized')}")
-                                    st.markdown(f"**Rating:** {tool.get('rating', 'N/A')}")
-                        else:
-                            st.warning(
-                                "تم الوصول للصفحة ولكن لم يتم العثور على أدوات" 
-                                if current_lang == 'ar' 
-                                else "Page accessed but no tools found"
-                            )
+                    # Keep the results across the reruns triggered by the results grid
+                    st.session_state['scrape_results'] = results
                     
                     success_message(
                         "تم استخراج المحتوى بنجاح" 
@@ -156,6 +172,49 @@ def render_scraper_page():
                     if current_lang == 'ar' 
                     else f"Scraping error: {str(e)}"
                 )
+    
+    results = st.session_state.get('scrape_results')
+    if results is None:
+        return
+    
+    # Display incremental diff
+    if results.diff is not None:
+        st.subheader(texts[current_lang]['diff_title'])
+        diff_summary = results.diff.summary()
+        columns = st.columns(4)
+        for column, key in zip(columns, ['added', 'changed', 'removed', 'unchanged_pages']):
+            column.metric(texts[current_lang][key], diff_summary[key])
+    
+    # Display results
+    st.subheader(
+        "نتائج الاستخراج" if current_lang == 'ar' else "Scraping Results"
+    )
+    render_results_table(results, current_lang, key='scraper')
+
+def render_catalog_report(report, page_texts):
+    """Render catalog analytics computed without any model call"""
+    overview = report['overview']
+    columns = st.columns(4)
+    columns[0].metric(page_texts['overview_tools'], f"{overview['tools']:,}")
+    columns[1].metric(page_texts['overview_sites'], f"{overview['sites']:,}")
+    columns[2].metric(page_texts['overview_categories'], f"{overview['categories']:,}")
+    columns[3].metric(page_texts['overview_rated'], f"{overview['rated_share']:.0%}")
+    
+    st.subheader(page_texts['categories_header'])
+    st.bar_chart(report['categories'].set_index('category')['tools'])
+    st.dataframe(report['categories'], use_container_width=True)
+    
+    st.subheader(page_texts['ratings_header'])
+    st.dataframe(report['ratings'], use_container_width=True)
+    st.dataframe(report['ratings_by_category'], use_container_width=True)
+    
+    st.subheader(page_texts['sites_header'])
+    st.dataframe(report['sites'], use_container_width=True)
+    
+    st.subheader(page_texts['growth_header'])
+    if not report['growth'].empty:
+        st.line_chart(report['growth'].set_index('period')['total_tools'])
+    st.dataframe(report['growth'], use_container_width=True)
 
 def render_analysis_page():
     """Render the data analysis page with multilingual support"""
@@ -167,13 +226,43 @@ def render_analysis_page():
             'title': 'تحليل البيانات باستخدام الذكاء الاصطناعي',
             'upload_label': 'تحميل ملف البيانات',
             'analyze_button': 'تحليل البيانات',
-            'analysis_type_label': 'اختر نوع التحليل'
+            'analysis_type_label': 'اختر نوع التحليل',
+            'profile_label': 'تحليل أداء هذا التشغيل',
+            'columns_label': 'الأعمدة المستخدمة في التحليل',
+            'template_label': 'قالب نص الصف (اختياري)',
+            'template_help': 'مثال: {name}: {description}',
+            'custom_prompt_label': 'سؤالك أو التعليمات المخصصة',
+            'retrieval_label': 'إرسال المقاطع ذات الصلة فقط',
+            'analytics_source_help': 'بدون ملف تُستخدم النتائج المخزنة',
+            'overview_tools': 'الأدوات',
+            'overview_sites': 'المواقع',
+            'overview_categories': 'الفئات',
+            'overview_rated': 'نسبة المقيّمة',
+            'categories_header': 'توزيع الفئات',
+            'ratings_header': 'إحصاءات التقييم',
+            'sites_header': 'الأدوات لكل موقع',
+            'growth_header': 'النمو عبر الزمن'
         },
         'en': {
             'title': 'AI-Powered Data Analysis',
             'upload_label': 'Upload Data File',
             'analyze_button': 'Analyze Data',
-            'analysis_type_label': 'Select Analysis Type'
+            'analysis_type_label': 'Select Analysis Type',
+            'profile_label': 'Profile this run',
+            'columns_label': 'Columns to analyze',
+            'template_label': 'Row text template (optional)',
+            'template_help': 'Example: {name}: {description}',
+            'custom_prompt_label': 'Your question or custom instructions',
+            'retrieval_label': 'Send only relevant chunks',
+            'analytics_source_help': 'Without a file, stored results are used',
+            'overview_tools': 'Tools',
+            'overview_sites': 'Sites',
+            'overview_categories': 'Categories',
+            'overview_rated': 'Rated share',
+            'categories_header': 'Category Distribution',
+            'ratings_header': 'Rating Statistics',
+            'sites_header': 'Tools per Site',
+            'growth_header': 'Growth over Time'
         }
     }
     
@@ -182,20 +271,42 @@ def render_analysis_page():
     # File upload
     uploaded_file = st.file_uploader(
         texts[current_lang]['upload_label'], 
-        type=['csv', 'json', 'xlsx', 'txt']
+        type=['csv', 'json', 'jsonl', 'xlsx', 'txt']
     )
     
+    # Column selection and row template (only the header is read here)
+    selected_columns = []
+    row_template = ''
+    if uploaded_file:
+        file_kind = detect_file_kind(uploaded_file.name)
+        try:
+            available_columns = read_columns(uploaded_file, file_kind)
+        except Exception:
+            available_columns = []
+        if available_columns:
+            selected_columns = st.multiselect(
+                texts[current_lang]['columns_label'], 
+                available_columns, 
+                default=available_columns
+            )
+            row_template = st.text_input(
+                texts[current_lang]['template_label'], 
+                help=texts[current_lang]['template_help']
+            )
+    
     # Analysis type selection
     analysis_types = {
         'ar': {
             'تلخيص': 'summarize',
             'تحليل تقني': 'technical_analysis',
-            'تحليل مخصص': 'custom_analysis'
+            'تحليل مخصص': 'custom_analysis',
+            'تحليلات الكتالوج': 'catalog_analytics'
         },
         'en': {
             'Summarization': 'summarize',
             'Technical Analysis': 'technical_analysis',
-            'Custom Analysis': 'custom_analysis'
+            'Custom Analysis': 'custom_analysis',
+            'Catalog Analytics': 'catalog_analytics'
         }
     }
     
@@ -203,20 +314,64 @@ def render_analysis_page():
         texts[current_lang]['analysis_type_label'], 
         list(analysis_types[current_lang].keys())
     )
+    catalog_analytics = analysis_types[current_lang][analysis_type] == 'catalog_analytics'
+    
+    # Custom prompt and retrieval mode
+    analysis_options = {}
+    if analysis_types[current_lang][analysis_type] == 'custom_analysis':
+        analysis_options['custom_prompt'] = st.text_area(
+            texts[current_lang]['custom_prompt_label']
+        ) or None
+        analysis_options['retrieval'] = st.checkbox(
+            texts[current_lang]['retrieval_label'],
+            value=config.get('analyzer.retrieval.enabled', True)
+        ) and bool(analysis_options['custom_prompt'])
+    if catalog_analytics and not uploaded_file:
+        st.caption(texts[current_lang]['analytics_source_help'])
+    
+    # Opt-in profiling
+    profile = st.checkbox(
+        texts[current_lang]['profile_label'],
+        value=config.get('profiling.enabled', False)
+    )
     
     # Analyze button
-    if st.button(texts[current_lang]['analyze_button']) and uploaded_file:
+    if st.button(texts[current_lang]['analyze_button']) and (uploaded_file or catalog_analytics):
         with loading_spinner(current_lang):
             try:
-                # Read uploaded file
-                if uploaded_file.type == 'application/json':
-                    df = pd.read_json(uploaded_file)
-                elif uploaded_file.type == 'text/csv':
-                    df = pd.read_csv(uploaded_file)
-                elif uploaded_file.type == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet':
-                    df = pd.read_excel(uploaded_file)
-                else:
-                    df = pd.read_csv(uploaded_file, sep='\t')
+                if catalog_analytics:
+                    # Aggregations over exported or stored tools, no model call
+                    if uploaded_file:
+                        uploaded_file.seek(0)
+                        file_kind = detect_file_kind(uploaded_file.name)
+                        available_columns = set(read_columns(uploaded_file, file_kind))
+                        tools_df = load_tools(
+                            'frame', 
+                            batches=iter_row_batches(
+                                uploaded_file, 
+                                file_kind, 
+                                columns=[c for c in ANALYTICS_COLUMNS if c in available_columns]
+                            )
+                        )
+                    else:
+                        tools_df = load_tools('store')
+                    
+                    render_catalog_report(catalog_report(tools_df), texts[current_lang])
+                    return
+                
+                # Interrupted runs over the same file, columns and template resume
+                source = json.dumps([file_digest(uploaded_file), selected_columns, row_template])
+                
+                # Stream uploaded file rows straight into the chunker
+                uploaded_file.seek(0)
+                rows = iter_row_texts(
+                    iter_row_batches(
+                        uploaded_file, 
+                        detect_file_kind(uploaded_file.name), 
+                        columns=selected_columns
+                    ),
+                    template=row_template or None
+                )
                 
                 # Initialize AI Analyzer
                 analyzer = AIAnalyzer(language=current_lang)
@@ -227,7 +382,7 @@ def render_analysis_page():
                 )
                 
                 # Analyze data
-                results = analysis_method(df)
+                results = analysis_method(rows, profile=profile, source=source, **analysis_options)
                 
                 # Display results
                 st.subheader(
@@ -248,6 +403,107 @@ def render_analysis_page():
                     else f"Analysis error: {str(e)}"
                 )
 
+def render_diagnostics_page():
+    """Render the pipeline diagnostics page with multilingual support"""
+    current_lang = get_current_language()
+    
+    # Multilingual text
+    texts = {
+        'ar': {
+            'title': 'تشخيص الأداء',
+            'disabled': 'المقاييس معطلة في الإعدادات',
+            'stages': 'زمن المراحل',
+            'counters': 'العدادات',
+            'empty': 'لا توجد مقاييس مسجلة بعد',
+            'prometheus': 'صيغة Prometheus',
+            'download': 'تنزيل المقاييس',
+            'reset': 'إعادة تعيين المقاييس',
+            'profiles': 'ملفات تحليل الأداء',
+            'hot_functions': 'أكثر الدوال استهلاكًا للوقت',
+            'allocators': 'أكبر مواقع حجز الذاكرة',
+            'proxies': 'حالة الوكلاء',
+            'proxy_domains': 'الوكلاء حسب النطاق'
+        },
+        'en': {
+            'title': 'Performance Diagnostics',
+            'disabled': 'Metrics are disabled in the configuration',
+            'stages': 'Stage Latency',
+            'counters': 'Counters',
+            'empty': 'No metrics recorded yet',
+            'prometheus': 'Prometheus Format',
+            'download': 'Download Metrics',
+            'reset': 'Reset Metrics',
+            'profiles': 'Run Profiles',
+            'hot_functions': 'Top Hot Functions',
+            'allocators': 'Top Allocators',
+            'proxies': 'Proxy Pool Health',
+            'proxy_domains': 'Proxies by Domain'
+        }
+    }
+    
+    st.title(texts[current_lang]['title'])
+    
+    # Recent run profiles
+    if profile_history:
+        st.subheader(texts[current_lang]['profiles'])
+        for summary in profile_history:
+            label = (
+                f"{summary['run']} | {summary['started_at']} | "
+                f"{summary['wall_seconds']}s | {summary['peak_memory_kb']} KB"
+            )
+            with st.expander(label):
+                st.json(summary['metadata'])
+                if summary.get('path'):
+                    st.caption(summary['path'])
+                st.markdown(f"**{texts[current_lang]['hot_functions']}**")
+                st.dataframe(pd.DataFrame(summary['top_functions']), use_container_width=True)
+                st.markdown(f"**{texts[current_lang]['allocators']}**")
+                st.dataframe(pd.DataFrame(summary['top_allocators']), use_container_width=True)
+    
+    # Proxy pool health (when scraper.proxies is configured)
+    proxy_pool = get_proxy_pool()
+    if proxy_pool is not None:
+        st.subheader(texts[current_lang]['proxies'])
+        st.dataframe(pd.DataFrame(proxy_pool.stats()), use_container_width=True)
+        domain_stats = proxy_pool.domain_stats()
+        if domain_stats:
+            with st.expander(texts[current_lang]['proxy_domains']):
+                st.dataframe(pd.DataFrame(domain_stats), use_container_width=True)
+    
+    if not metrics.enabled:
+        st.warning(texts[current_lang]['disabled'])
+        return
+    
+    snapshot = metrics.snapshot()
+    
+    if not snapshot['stages'] and not snapshot['counters']:
+        st.info(texts[current_lang]['empty'])
+    
+    # Stage latency table
+    if snapshot['stages']:
+        st.subheader(texts[current_lang]['stages'])
+        st.dataframe(pd.DataFrame(snapshot['stages']), use_container_width=True)
+    
+    # Counters table
+    if snapshot['counters']:
+        st.subheader(texts[current_lang]['counters'])
+        st.dataframe(pd.DataFrame(snapshot['counters']), use_container_width=True)
+    
+    # Prometheus exposition
+    prometheus_text = metrics.to_prometheus()
+    with st.expander(texts[current_lang]['prometheus']):
+        st.code(prometheus_text, language='text')
+    st.download_button(
+        texts[current_lang]['download'],
+        data=prometheus_text,
+        file_name='metrics.prom',
+        mime='text/plain'
+    )
+    
+    if st.button(texts[current_lang]['reset']):
+        metrics.reset()
+        st.experimental_rerun()
+
 def render_settings_page():
     """Render the settings page with multilingual support"""
     current_lang = get_current_language()
@@ -311,6 +567,8 @@ def main():
         render_scraper_page()
     elif selected_page == "📊 تحليل البيانات" or selected_page == "📊 Data Analysis":
         render_analysis_page()
+    elif selected_page == "🩺 التشخيص" or selected_page == "🩺 Diagnostics":
+        render_diagnostics_page()
     elif selected_page == "⚙️ الإعدادات" or selected_page == "⚙️ Settings":
         render_settings_page()
 
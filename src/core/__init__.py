@@ -1,5 +1,18 @@
 # Core package initialization
-from .scraper import WebScraper
-from .analyzer import DataAnalyzer
+import importlib
 
-__all__ = ['WebScraper', 'DataAnalyzer']
+# Exports are imported on first access, so importing one core module does not
+# load the analyzer's torch/transformers stack
+_EXPORTS = {
+    'WebScraper': 'src.core.scraper',
+    'DataAnalyzer': 'src.core.analyzer',
+    'ToolTable': 'src.core.records'
+}
+
+__all__ = ['WebScraper', 'DataAnalyzer', 'ToolTable']
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
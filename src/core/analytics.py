@@ -0,0 +1,203 @@
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core.datasets import load_dataset, typed_tools_frame
+from src.core.storage import get_store
+from src.utils.metrics import metrics
+
+# Columns catalog analytics reads from exports, datasets or the store
+ANALYTICS_COLUMNS = ('name', 'category', 'rating', 'url', 'page', 'language', 'domain', 'scraped_at')
+
+# Percentiles reported by rating_stats
+_RATING_PERCENTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+def load_tools(source: str = 'store',
+               frame: Optional[pd.DataFrame] = None,
+               batches: Optional[Iterable[pd.DataFrame]] = None,
+               **filters) -> pd.DataFrame:
+    """
+    Load tool records as a typed frame for analytics
+
+    Args:
+        source (str): store, parquet, arrow or frame
+        frame (Optional[pd.DataFrame]): Records when source is frame
+        batches (Optional[Iterable[pd.DataFrame]]): Row batches when source is
+                                                    frame (e.g. an uploaded export)
+        **filters: Store query arguments or (column, value) dataset filters
+
+    Returns:
+        pd.DataFrame: Typed frame (numeric ratings, categorical text columns)
+    """
+    if source == 'store':
+        store = get_store()
+        df = store.query_tools(**filters) if store is not None else pd.DataFrame(columns=list(ANALYTICS_COLUMNS))
+    elif source in ('parquet', 'arrow'):
+        table = load_dataset(format=source, filters=list(filters.items()))
+        df = table.to_pandas()
+    elif source == 'frame':
+        df = frame if frame is not None else pd.concat(list(batches or []), ignore_index=True)
+    else:
+        raise ValueError(f"Unsupported analytics source: {source}")
+
+    for column in ('name', 'category', 'rating', 'url', 'page', 'language'):
+        if column not in df.columns:
+            df[column] = pd.NA
+    return typed_tools_frame(df)
+
+
+def _ratings(df: pd.DataFrame) -> np.ndarray:
+    # Nullable Float64 to a plain float array with NaN for missing ratings
+    return df['rating'].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def category_distribution(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count tools per category
+
+    Args:
+        df (pd.DataFrame): Typed tools frame
+
+    Returns:
+        pd.DataFrame: category, tools and share, most frequent first
+    """
+    categories = df['category'].astype('category').cat
+    codes = categories.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories.categories))
+    total = counts.sum()
+
+    result = pd.DataFrame({
+        'category': categories.categories.astype(str),
+        'tools': counts,
+        'share': counts / total if total else np.zeros(len(counts))
+    })
+    return result.sort_values('tools', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def rating_stats(df: pd.DataFrame, by: Optional[str] = None) -> pd.DataFrame:
+    """
+    Summarize numeric ratings, overall or per group
+
+    Args:
+        df (pd.DataFrame): Typed tools frame
+        by (Optional[str]): Grouping column (e.g. category or domain)
+
+    Returns:
+        pd.DataFrame: rated count, mean, std, min, percentiles and max
+    """
+    ratings = pd.Series(_ratings(df), index=df.index, name='rating')
+
+    if by is None:
+        values = ratings.to_numpy()
+        rated = values[~np.isnan(values)]
+        stats = {'tools': len(values), 'rated': len(rated)}
+        if len(rated):
+            stats.update({
+                'mean': rated.mean(),
+                'std': rated.std(ddof=1) if len(rated) > 1 else np.nan,
+                'min': rated.min(),
+                **{f'p{int(q * 100)}': value
+                   for q, value in zip(_RATING_PERCENTILES, np.quantile(rated, _RATING_PERCENTILES))},
+                'max': rated.max()
+            })
+        return pd.DataFrame([stats])
+
+    grouped = ratings.groupby(df[by], observed=True)
+    result = grouped.agg(['size', 'count', 'mean', 'std', 'min', 'median', 'max'])
+    result = result.rename(columns={'size': 'tools', 'count': 'rated', 'median': 'p50'})
+    return result.sort_values('tools', ascending=False).reset_index()
+
+
+def tools_per_site(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count tools, distinct tools, pages and mean rating per site
+
+    Args:
+        df (pd.DataFrame): Typed tools frame
+
+    Returns:
+        pd.DataFrame: One row per domain, largest first
+    """
+    frame = pd.DataFrame({
+        'domain': df['domain'],
+        'name': df['name'],
+        'url': df['url'],
+        'rating': _ratings(df)
+    })
+    grouped = frame.groupby('domain', observed=True)
+    result = pd.DataFrame({
+        'tools': grouped.size(),
+        'distinct_tools': grouped['name'].nunique(),
+        'pages': grouped['url'].nunique(),
+        'mean_rating': grouped['rating'].mean()
+    })
+    if 'scraped_at' in df.columns:
+        result['last_scraped_at'] = df.groupby('domain', observed=True)['scraped_at'].max()
+    return result.sort_values('tools', ascending=False).reset_index()
+
+
+def growth_over_time(df: pd.DataFrame, freq: str = 'D') -> pd.DataFrame:
+    """
+    Count newly discovered tools per period
+
+    A tool is identified by name and domain and counted in the period it was
+    first scraped.
+
+    Args:
+        df (pd.DataFrame): Typed tools frame
+        freq (str): Pandas period alias (D, W, M)
+
+    Returns:
+        pd.DataFrame: period, new_tools and cumulative total_tools
+    """
+    if 'scraped_at' in df.columns:
+        seen_at = df['scraped_at']
+    else:
+        seen_at = pd.to_datetime(df['date'].astype(str), utc=True)
+
+    first_seen = (
+        pd.DataFrame({'name': df['name'], 'domain': df['domain'], 'seen_at': seen_at})
+        .groupby(['name', 'domain'], observed=True, sort=False)['seen_at']
+        .min()
+    )
+    if first_seen.empty:
+        return pd.DataFrame(columns=['period', 'new_tools', 'total_tools'])
+
+    periods = first_seen.dt.tz_localize(None).dt.to_period(freq)
+    new_tools = periods.value_counts().sort_index()
+    new_tools = new_tools.reindex(pd.period_range(new_tools.index.min(), new_tools.index.max(), freq=freq),
+                                  fill_value=0)
+    return pd.DataFrame({
+        'period': new_tools.index.to_timestamp(),
+        'new_tools': new_tools.to_numpy(),
+        'total_tools': new_tools.cumsum().to_numpy()
+    })
+
+
+def catalog_report(df: pd.DataFrame, freq: str = 'D') -> Dict[str, Any]:
+    """
+    Run all catalog analytics over one frame
+
+    Args:
+        df (pd.DataFrame): Typed tools frame
+        freq (str): Period for growth_over_time
+
+    Returns:
+        Dict[str, Any]: Overview counts and one frame per analysis
+    """
+    with metrics.timer('analytics'):
+        return {
+            'overview': {
+                'tools': len(df),
+                'sites': int(df['domain'].nunique()),
+                'categories': int(df['category'].nunique()),
+                'rated_share': float(np.mean(~np.isnan(_ratings(df)))) if len(df) else 0.0
+            },
+            'categories': category_distribution(df),
+            'ratings': rating_stats(df),
+            'ratings_by_category': rating_stats(df, by='category'),
+            'sites': tools_per_site(df),
+            'growth': growth_over_time(df, freq)
+        }
@@ -1,16 +1,28 @@
 import os
 import json
+import time
+import hashlib
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Any
 
 import torch
-from sentence_transformers import SentenceTransformer
 from transformers import AutoModelForQuestionAnswering, AutoTokenizer
-import ollama
 
+from src.core.checkpoint import ChunkJournal
+from src.core.embeddings import encode_batched, load_embedding_model
+from src.core.ingestion import iter_row_texts
+from src.core.llm import get_session
+from src.core.retrieval import get_embedding_cache, retrieve
+from src.core.segmentation import split_sentences
+from src.core.storage import get_store
 from src.utils.config import config
 from src.utils.logging import logger
+from src.utils.metrics import metrics
+from src.utils.profiling import profile_run
+
+# Content accepted by the analysis methods
+AnalysisInput = Union[str, pd.DataFrame, pd.Series, Iterable[str]]
 
 class AIAnalyzer:
     def __init__(self, 
@@ -27,12 +39,17 @@ class AIAnalyzer:
         self.language = language or config.get('app.languages.default', 'ar')
         
         # Model configuration
-        self.model_name = model or config.get('analyzer.model', 'llama3.2')
-        self.embedding_model_name = config.get('analyzer.embedding_model', 'sentence-transformers/all-mpnet-base-v2')
+        settings = config.analyzer
+        self.model_name = model or settings.model
+        self.embedding_model_name = settings.embedding_model
+        self.embedding_backend = settings.embedding_backend
         
         # Chunk configuration
-        self.chunk_size = config.get('analyzer.chunk_size', 2000)
-        self.chunk_overlap = config.get('analyzer.chunk_overlap', 400)
+        self.chunk_size = settings.chunk_size
+        self.chunk_overlap = settings.chunk_overlap
+        
+        # Shared Ollama session (keep-alive, model options, warm pings)
+        self.session = get_session(self.model_name)
         
         # Load models
         self._load_models()
@@ -42,48 +59,84 @@ class AIAnalyzer:
         Load AI models with multilingual support
         """
         try:
-            # Embedding model
-            self.embedding_model = SentenceTransformer(self.embedding_model_name)
+            # Embedding model on the configured backend (shared across analyzers)
+            self.embedding_model = load_embedding_model(self.embedding_model_name, self.embedding_backend)
             
-            # Ensure Ollama model is available
-            try:
-                ollama.pull(self.model_name)
-            except Exception as e:
-                logger.warning(f"Could not pull Ollama model: {e}")
+            # Ensure Ollama model is available and keep it loaded
+            self.session.pull()
+            self.session.start_warmer()
         
         except Exception as e:
-            logger.error(f"Model loading error: {e} | خطأ في تحميل النماذج: {e}")
+            logger.error("Model loading error: %s | خطأ في تحميل النماذج: %s", e, e)
             raise
 
-    def _chunk_text(self, text: str) -> List[str]:
+    def _prepare_segments(self, file_or_text: AnalysisInput) -> Iterable[str]:
         """
-        Split text into manageable chunks
+        Turn analysis input into a stream of text segments
+        
+        DataFrames are rendered row by row (cell text, not column labels),
+        and iterables of strings such as streamed upload rows pass through.
         
         Args:
-            text (str): Input text to chunk
+            file_or_text (AnalysisInput): Content to analyze
         
         Returns:
-            List[str]: List of text chunks
+            Iterable[str]: Text segments
+        """
+        if isinstance(file_or_text, str):
+            return [file_or_text]
+        if isinstance(file_or_text, pd.DataFrame):
+            return iter_row_texts([file_or_text])
+        if isinstance(file_or_text, pd.Series):
+            return (str(value) for value in file_or_text.dropna())
+        if isinstance(file_or_text, Iterable):
+            return file_or_text
+        raise ValueError("Unsupported input type")
+
+    def _iter_chunks(self, segments: Iterable[str]) -> Iterator[str]:
+        """
+        Lazily split a stream of text segments into overlapping chunks
+        
+        Args:
+            segments (Iterable[str]): Text segments (e.g. rows of an upload)
+        
+        Yields:
+            str: Text chunks
         """
         # Multilingual chunk splitting
-        words = text.split()
-        chunks = []
+        overlap_words = int(self.chunk_overlap / 2)
         current_chunk = []
         current_length = 0
+        started = time.perf_counter()
 
-        for word in words:
-            current_chunk.append(word)
-            current_length += len(word)
+        for segment in segments:
+            for word in segment.split():
+                current_chunk.append(word)
+                current_length += len(word)
 
-            if current_length >= self.chunk_size:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = current_chunk[-int(self.chunk_overlap/2):]
-                current_length = len(' '.join(current_chunk))
+                if current_length >= self.chunk_size:
+                    chunk = ' '.join(current_chunk)
+                    current_chunk = current_chunk[-overlap_words:] if overlap_words else []
+                    current_length = len(' '.join(current_chunk))
+                    metrics.observe('chunk', time.perf_counter() - started)
+                    yield chunk
+                    started = time.perf_counter()
 
         if current_chunk:
-            chunks.append(' '.join(current_chunk))
+            metrics.observe('chunk', time.perf_counter() - started)
+            yield ' '.join(current_chunk)
 
-        return chunks
+    def _chunk_text(self, text: str) -> List[str]:
+        """
+        Split text into manageable chunks
+        
+        Args:
+            text (str): Input text to chunk
+        
+        Returns:
+            List[str]: List of text chunks
+        """
+        return list(self._iter_chunks([text]))
 
     def _get_prompt(self, prompt_type: str) -> str:
         """
@@ -98,155 +151,294 @@ class AIAnalyzer:
         return config.get(f'analyzer.prompts.{self.language}.{prompt_type}', 
                           config.get(f'analyzer.prompts.en.{prompt_type}'))
 
-    def summarize(self, file_or_text: Union[str, pd.DataFrame, pd.Series]) -> Dict[str, Any]:
+    def _run_metadata(self) -> Dict[str, Any]:
+        """
+        Describe the analyzer configuration for profiling output
+        
+        Returns:
+            Dict[str, Any]: Run metadata
+        """
+        return {
+            'language': self.language,
+            'model': self.model_name,
+            'embedding_model': self.embedding_model_name,
+            'embedding_backend': self.embedding_backend,
+            'chunk_size': self.chunk_size,
+            'chunk_overlap': self.chunk_overlap
+        }
+
+    def _chat(self, system_prompt: str, content: str) -> str:
+        """
+        Send a single chunk to the Ollama model
+        
+        Args:
+            system_prompt (str): System instruction for the model
+            content (str): Chunk content
+        
+        Returns:
+            str: Model response text
+        """
+        return self.session.chat(system_prompt, content)
+
+    @staticmethod
+    def _source_identity(file_or_text: AnalysisInput, source: Optional[str] = None) -> Optional[str]:
+        """
+        Identify the analysis input so an interrupted run can find its journal
+        
+        Args:
+            file_or_text (AnalysisInput): Content to analyze
+            source (Optional[str]): Caller-provided identity (e.g. a file digest)
+        
+        Returns:
+            Optional[str]: Identity, None for unnamed streams (not journaled)
+        """
+        if source:
+            return source
+        if isinstance(file_or_text, str):
+            return hashlib.sha256(file_or_text.encode('utf-8')).hexdigest()
+        if isinstance(file_or_text, (pd.DataFrame, pd.Series)):
+            digest = hashlib.sha256(pd.util.hash_pandas_object(file_or_text, index=False).to_numpy().tobytes())
+            if isinstance(file_or_text, pd.DataFrame):
+                digest.update('\0'.join(map(str, file_or_text.columns)).encode('utf-8'))
+            return digest.hexdigest()
+        # A generic stream cannot be hashed without consuming it
+        return None
+
+    def _chat_chunks(self, 
+                     kind: str, 
+                     system_prompt: str, 
+                     chunks: Iterable[str], 
+                     source: Optional[str] = None) -> List[str]:
+        """
+        Send every chunk to the model, skipping chunks completed by an interrupted run
+        
+        Args:
+            kind (str): Analysis kind (journal namespace)
+            system_prompt (str): System instruction for the model
+            chunks (Iterable[str]): Text chunks, consumed lazily
+            source (Optional[str]): Input identity from _source_identity
+                                    (no journal when None)
+        
+        Returns:
+            List[str]: Model responses in chunk order
+        """
+        journal = None
+        if config.get('checkpoint.enabled', True):
+            if source:
+                journal = ChunkJournal(kind, self.model_name, system_prompt, source)
+            else:
+                logger.debug("Input has no identity, not journaling | المدخلات بلا معرّف، لن يُحفظ التقدم")
+        
+        outputs = []
+        try:
+            for chunk in chunks:
+                key = journal.key(chunk) if journal is not None else None
+                output = journal.get(key) if journal is not None else None
+                if output is None:
+                    output = self._chat(system_prompt, chunk)
+                    if journal is not None:
+                        journal.put(key, output)
+                else:
+                    metrics.inc('chunks_resumed')
+                outputs.append(output)
+        finally:
+            # On failure the journal is kept so the next run resumes after the last completed chunk
+            if journal is not None:
+                journal.close()
+        
+        if journal is not None:
+            journal.finish()
+        return outputs
+
+    def summarize(self, 
+                  file_or_text: AnalysisInput, 
+                  profile: Optional[bool] = None, 
+                  source: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate a summary of the input content
         
         Args:
-            file_or_text (Union[str, pd.DataFrame, pd.Series]): Content to summarize
+            file_or_text (AnalysisInput): Content to summarize
+            profile (Optional[bool]): Profile this run (defaults to profiling.enabled)
+            source (Optional[str]): Input identity for resuming (e.g. file_digest
+                                    of an upload); derived for text and frames
         
         Returns:
             Dict[str, Any]: Summary results
         """
-        try:
-            # Prepare text
-            if isinstance(file_or_text, (pd.DataFrame, pd.Series)):
-                text = ' '.join(file_or_text.astype(str))
-            elif isinstance(file_or_text, str):
-                text = file_or_text
-            else:
-                raise ValueError("Unsupported input type")
+        with profile_run('summarize', profile, self._run_metadata()):
+            try:
+                # Prepare text segments
+                segments = self._prepare_segments(file_or_text)
 
-            # Chunk text
-            chunks = self._chunk_text(text)
+                # Chunk text lazily
+                chunks = self._iter_chunks(segments)
 
-            # Prepare prompt
-            prompt = self._get_prompt('summary')
+                # Prepare prompt
+                prompt = self._get_prompt('summary')
 
-            # Analyze using Ollama
-            summaries = []
-            for chunk in chunks:
-                response = ollama.chat(model=self.model_name, messages=[
-                    {'role': 'system', 'content': prompt},
-                    {'role': 'user', 'content': chunk}
-                ])
-                summaries.append(response['message']['content'])
+                # Analyze using Ollama
+                summaries = self._chat_chunks('summary', prompt, chunks,
+                                               self._source_identity(file_or_text, source))
 
-            # Combine summaries
-            final_summary = ' '.join(summaries)
+                # Combine summaries
+                final_summary = ' '.join(summaries)
 
-            return {
-                'language': self.language,
-                'summary_length': len(final_summary),
-                'summary': final_summary
-            }
+                return {
+                    'language': self.language,
+                    'summary_length': len(final_summary),
+                    'summary': final_summary
+                }
 
-        except Exception as e:
-            logger.error(f"Summarization error: {e} | خطأ في التلخيص: {e}")
-            raise
+            except Exception as e:
+                logger.error("Summarization error: %s | خطأ في التلخيص: %s", e, e)
+                raise
 
-    def technical_analysis(self, file_or_text: Union[str, pd.DataFrame, pd.Series]) -> Dict[str, Any]:
+    def technical_analysis(self, 
+                           file_or_text: AnalysisInput, 
+                           profile: Optional[bool] = None, 
+                           source: Optional[str] = None) -> Dict[str, Any]:
         """
         Perform technical analysis of the content
         
         Args:
-            file_or_text (Union[str, pd.DataFrame, pd.Series]): Content to analyze
+            file_or_text (AnalysisInput): Content to analyze
+            profile (Optional[bool]): Profile this run (defaults to profiling.enabled)
+            source (Optional[str]): Input identity for resuming (e.g. file_digest
+                                    of an upload); derived for text and frames
         
         Returns:
             Dict[str, Any]: Technical analysis results
         """
-        try:
-            # Prepare text
-            if isinstance(file_or_text, (pd.DataFrame, pd.Series)):
-                text = ' '.join(file_or_text.astype(str))
-            elif isinstance(file_or_text, str):
-                text = file_or_text
-            else:
-                raise ValueError("Unsupported input type")
+        with profile_run('technical_analysis', profile, self._run_metadata()):
+            try:
+                # Prepare text segments
+                segments = self._prepare_segments(file_or_text)
 
-            # Chunk text
-            chunks = self._chunk_text(text)
+                # Chunk text lazily
+                chunks = self._iter_chunks(segments)
 
-            # Prepare prompt
-            prompt = self._get_prompt('technical')
+                # Prepare prompt
+                prompt = self._get_prompt('technical')
 
-            # Analyze using Ollama
-            technical_insights = []
-            for chunk in chunks:
-                response = ollama.chat(model=self.model_name, messages=[
-                    {'role': 'system', 'content': prompt},
-                    {'role': 'user', 'content': chunk}
-                ])
-                technical_insights.append(response['message']['content'])
+                # Analyze using Ollama
+                technical_insights = self._chat_chunks('technical', prompt, chunks,
+                                                        self._source_identity(file_or_text, source))
 
-            # Combine insights
-            final_insights = ' '.join(technical_insights)
+                # Combine insights
+                final_insights = ' '.join(technical_insights)
 
-            # Compute embeddings for key insights
-            embeddings = self.embedding_model.encode(final_insights.split('.'))
+                # Compute embeddings for key insights, one per sentence
+                sentences = split_sentences(final_insights)
+                embeddings = encode_batched(self.embedding_model, sentences)
 
-            return {
-                'language': self.language,
-                'insights_length': len(final_insights),
-                'technical_insights': final_insights,
-                'embedding_dimensions': embeddings.shape[1]
-            }
+                return {
+                    'language': self.language,
+                    'insights_length': len(final_insights),
+                    'technical_insights': final_insights,
+                    'sentences': len(sentences),
+                    'embedding_dimensions': (embeddings.shape[1] if len(sentences)
+                                             else self.embedding_model.get_sentence_embedding_dimension())
+                }
 
-        except Exception as e:
-            logger.error(f"Technical analysis error: {e} | خطأ في التحليل التقني: {e}")
-            raise
+            except Exception as e:
+                logger.error("Technical analysis error: %s | خطأ في التحليل التقني: %s", e, e)
+                raise
 
     def custom_analysis(self, 
-                        file_or_text: Union[str, pd.DataFrame, pd.Series], 
-                        custom_prompt: Optional[str] = None) -> Dict[str, Any]:
+                        file_or_text: AnalysisInput, 
+                        custom_prompt: Optional[str] = None, 
+                        profile: Optional[bool] = None, 
+                        retrieval: Optional[bool] = None, 
+                        top_k: Optional[int] = None, 
+                        source: Optional[str] = None) -> Dict[str, Any]:
         """
         Perform custom analysis with user-provided prompt
         
+        In retrieval mode only the chunks most similar to the prompt (within
+        analyzer.retrieval.token_budget) are sent, in one model call, instead
+        of one call per chunk of the whole document.
+        
         Args:
-            file_or_text (Union[str, pd.DataFrame, pd.Series]): Content to analyze
+            file_or_text (AnalysisInput): Content to analyze
             custom_prompt (Optional[str]): User-defined analysis prompt
+            profile (Optional[bool]): Profile this run (defaults to profiling.enabled)
+            retrieval (Optional[bool]): Send only relevant chunks (defaults to
+                                        analyzer.retrieval.enabled when a
+                                        custom prompt is given)
+            top_k (Optional[int]): Maximum chunks sent in retrieval mode
+            source (Optional[str]): Input identity for resuming (e.g. file_digest
+                                    of an upload); derived for text and frames
         
         Returns:
             Dict[str, Any]: Custom analysis results
         """
-        try:
-            # Prepare text
-            if isinstance(file_or_text, (pd.DataFrame, pd.Series)):
-                text = ' '.join(file_or_text.astype(str))
-            elif isinstance(file_or_text, str):
-                text = file_or_text
-            else:
-                raise ValueError("Unsupported input type")
-
-            # Use default prompt if not provided
-            if not custom_prompt:
-                custom_prompt = self._get_prompt('custom')
-
-            # Chunk text
-            chunks = self._chunk_text(text)
+        if retrieval is None:
+            retrieval = bool(custom_prompt) and config.get('analyzer.retrieval.enabled', True)
+        
+        with profile_run('custom_analysis', profile, dict(self._run_metadata(), retrieval=retrieval)):
+            try:
+                # Prepare text segments
+                segments = self._prepare_segments(file_or_text)
+
+                # Use default prompt if not provided
+                if not custom_prompt:
+                    custom_prompt = self._get_prompt('custom')
+
+                # Chunk text lazily
+                chunks = self._iter_chunks(segments)
+
+                if retrieval:
+                    # Embed chunks and prompt, keep the top-k within the token budget
+                    cache = get_embedding_cache(self.embedding_model_name, self.embedding_model)
+                    relevant, total_chunks = retrieve(chunks, custom_prompt, cache, top_k=top_k)
+                    final_insights = self._chat(custom_prompt, '\n\n---\n\n'.join(relevant)) if relevant else ''
+
+                    return {
+                        'language': self.language,
+                        'prompt': custom_prompt,
+                        'retrieval': True,
+                        'chunks_total': total_chunks,
+                        'chunks_sent': len(relevant),
+                        'insights_length': len(final_insights),
+                        'custom_insights': final_insights
+                    }
+
+                # Analyze using Ollama
+                custom_insights = self._chat_chunks('custom', custom_prompt, chunks,
+                                                     self._source_identity(file_or_text, source))
+
+                # Combine insights
+                final_insights = ' '.join(custom_insights)
+
+                return {
+                    'language': self.language,
+                    'prompt': custom_prompt,
+                    'insights_length': len(final_insights),
+                    'custom_insights': final_insights
+                }
 
-            # Analyze using Ollama
-            custom_insights = []
-            for chunk in chunks:
-                response = ollama.chat(model=self.model_name, messages=[
-                    {'role': 'system', 'content': custom_prompt},
-                    {'role': 'user', 'content': chunk}
-                ])
-                custom_insights.append(response['message']['content'])
-
-            # Combine insights
-            final_insights = ' '.join(custom_insights)
-
-            return {
-                'language': self.language,
-                'prompt': custom_prompt,
-                'insights_length': len(final_insights),
-                'custom_insights': final_insights
-            }
+            except Exception as e:
+                logger.error("Custom analysis error: %s | خطأ في التحليل المخصص: %s", e, e)
+                raise
 
-        except Exception as e:
-            logger.error(f"Custom analysis error: {e} | خطأ في التحليل المخصص: {e}")
-            raise
+    @staticmethod
+    def _analysis_kind(results: Dict[str, Any]) -> Optional[str]:
+        """
+        Infer the analysis type from a result dict
+        
+        Args:
+            results (Dict[str, Any]): Analysis results
+        
+        Returns:
+            Optional[str]: summary, technical or custom
+        """
+        for key, kind in (('summary', 'summary'), 
+                          ('technical_insights', 'technical'), 
+                          ('custom_insights', 'custom')):
+            if key in results:
+                return kind
+        return None
 
     def export_results(self, 
                        results: Dict[str, Any], 
@@ -265,26 +457,33 @@ class AIAnalyzer:
         export_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'exports')
         os.makedirs(export_dir, exist_ok=True)
         
+        # Persist the result and export the stored record
+        store = get_store()
+        if store is not None:
+            analysis_id = store.save_analysis(results, kind=self._analysis_kind(results), model=self.model_name)
+            results = store.get_analysis(analysis_id)
+        
         # Generate filename
         timestamp = pd.Timestamp.now().strftime("%Y%m%d-%H%M%S")
         base_filename = f'analysis_results_{timestamp}'
         
         # Export based on format
-        if format == 'json':
-            filepath = os.path.join(export_dir, f'{base_filename}.json')
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=4)
-        elif format == 'csv':
-            filepath = os.path.join(export_dir, f'{base_filename}.csv')
-            df = pd.DataFrame.from_dict(results, orient='index').transpose()
-            df.to_csv(filepath, index=False, encoding='utf-8')
-        elif format == 'txt':
-            filepath = os.path.join(export_dir, f'{base_filename}.txt')
-            with open(filepath, 'w', encoding='utf-8') as f:
-                for key, value in results.items():
-                    f.write(f"{key}: {value}\n")
-        else:
-            raise ValueError(f"Unsupported export format: {format}")
+        with metrics.timer('export'):
+            if format == 'json':
+                filepath = os.path.join(export_dir, f'{base_filename}.json')
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(results, f, ensure_ascii=False, indent=4)
+            elif format == 'csv':
+                filepath = os.path.join(export_dir, f'{base_filename}.csv')
+                df = pd.DataFrame.from_dict(results, orient='index').transpose()
+                df.to_csv(filepath, index=False, encoding='utf-8')
+            elif format == 'txt':
+                filepath = os.path.join(export_dir, f'{base_filename}.txt')
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    for key, value in results.items():
+                        f.write(f"{key}: {value}\n")
+            else:
+                raise ValueError(f"Unsupported export format: {format}")
         
         return filepath
 
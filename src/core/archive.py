@@ -0,0 +1,307 @@
+import os
+import time
+import uuid
+import atexit
+import threading
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+SEGMENT_SUFFIX = '.warc.zst'
+INDEX_SUFFIX = '.idx'
+
+
+class ArchiveEntry(NamedTuple):
+    """Location of one archived response"""
+    segment: str
+    offset: int
+    length: int
+    status: int
+    fetched_at: str
+    page: int
+    url: str
+
+
+class ArchivedPage(NamedTuple):
+    """One archived response"""
+    url: str
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    fetched_at: str
+    page: int
+    # WARC-Truncated reason ('length' or 'unspecified'), None for complete bodies
+    truncated: Optional[str] = None
+
+
+def _encode_record(url: str,
+                   status: int,
+                   reason: str,
+                   headers: Mapping[str, str],
+                   body: bytes,
+                   fetched_at: str,
+                   page: int,
+                   truncated: Optional[str]) -> bytes:
+    http_block = '\r\n'.join(
+        [f'HTTP/1.1 {status} {reason}'.rstrip()]
+        + [f'{name}: {value}' for name, value in headers.items()]
+    ).encode('utf-8') + b'\r\n\r\n' + body
+
+    warc_headers = [
+        'WARC/1.0',
+        'WARC-Type: response',
+        f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>',
+        f'WARC-Target-URI: {url}',
+        f'WARC-Date: {fetched_at}',
+        f'WARC-Listing-Page: {page}',
+        'Content-Type: application/http; msgtype=response',
+        f'Content-Length: {len(http_block)}'
+    ]
+    if truncated:
+        warc_headers.append(f'WARC-Truncated: {truncated}')
+    return '\r\n'.join(warc_headers).encode('utf-8') + b'\r\n\r\n' + http_block + b'\r\n\r\n'
+
+
+def _parse_headers(block: bytes) -> CaseInsensitiveDict:
+    headers = CaseInsensitiveDict()
+    for line in block.decode('utf-8', errors='replace').split('\r\n'):
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip()] = value.strip()
+    return headers
+
+
+def _decode_record(record: bytes) -> ArchivedPage:
+    warc_block, _, rest = record.partition(b'\r\n\r\n')
+    warc_headers = _parse_headers(warc_block.split(b'\r\n', 1)[1])
+    http_block = rest[:int(warc_headers['Content-Length'])]
+
+    head, _, body = http_block.partition(b'\r\n\r\n')
+    status_line, _, header_lines = head.partition(b'\r\n')
+    return ArchivedPage(
+        url=warc_headers['WARC-Target-URI'],
+        status=int(status_line.split()[1]),
+        headers=_parse_headers(header_lines),
+        body=body,
+        fetched_at=warc_headers['WARC-Date'],
+        page=int(warc_headers.get('WARC-Listing-Page', 1)),
+        truncated=warc_headers.get('WARC-Truncated')
+    )
+
+
+class PageArchive:
+    """
+    Append-only archive of raw responses for offline re-extraction
+
+    Each response is stored as a WARC-style record (WARC headers, then the
+    HTTP status line, headers and body) compressed as its own zstd frame, so
+    any record can be read back with one seek. Records go to segment files
+    that are never reopened for writing; each segment has a tab-separated
+    index of ``offset, length, status, date, page, url`` lines. Segment names
+    start with their creation time, so sorting them orders the archive
+    chronologically, and several processes can write to one directory.
+    """
+
+    def __init__(self,
+                 directory: Optional[str] = None,
+                 segment_bytes: Optional[int] = None,
+                 level: Optional[int] = None):
+        """
+        Initialize the archive
+
+        Args:
+            directory (Optional[str]): Archive directory
+            segment_bytes (Optional[int]): Compressed size after which a new segment starts
+            level (Optional[int]): zstd compression level
+
+        Raises:
+            ImportError: If zstandard is not installed
+        """
+        import zstandard
+
+        self.directory = directory or config.get('scraper.archive.directory', 'data/archive')
+        self.segment_bytes = segment_bytes or config.get('scraper.archive.segment_bytes', 256 * 1024 * 1024)
+        self.level = level or config.get('scraper.archive.level', 3)
+        self._compressor = zstandard.ZstdCompressor(level=self.level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+        self._lock = threading.Lock()
+        self._segment: Optional[str] = None
+        self._file = None
+        self._index = None
+        self._sequence = 0
+
+    def _segment_path(self, segment: str, suffix: str = SEGMENT_SUFFIX) -> str:
+        return os.path.join(self.directory, segment + suffix)
+
+    def _roll(self):
+        self._close_segment()
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        self._segment = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{self._sequence:04d}-{uuid.uuid4().hex[:8]}"
+        self._file = open(self._segment_path(self._segment), 'ab')
+        self._index = open(self._segment_path(self._segment, INDEX_SUFFIX), 'a', encoding='utf-8')
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.close()
+            self._index.close()
+            self._file = self._index = None
+
+    def append(self,
+               url: str,
+               status: int,
+               headers: Mapping[str, str],
+               body: bytes,
+               reason: str = '',
+               page: int = 1,
+               truncated: Optional[str] = None,
+               fetched_at: Optional[str] = None) -> ArchiveEntry:
+        """
+        Archive one response
+
+        Args:
+            url (str): Final page URL
+            status (int): HTTP status code
+            headers (Mapping[str, str]): Response headers
+            body (bytes): Response body as read (possibly capped)
+            reason (str): HTTP reason phrase
+            page (int): Listing page number
+            truncated (Optional[str]): WARC-Truncated reason if the body is incomplete:
+                                       'length' (size limit) or 'unspecified'
+                                       (reading stopped after the listing)
+            fetched_at (Optional[str]): ISO 8601 UTC fetch time (defaults to now)
+
+        Returns:
+            ArchiveEntry: Location of the stored record
+        """
+        fetched_at = fetched_at or time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        with metrics.timer('archive'):
+            frame = self._compressor.compress(
+                _encode_record(url, status, reason, headers, body, fetched_at, page, truncated)
+            )
+            with self._lock:
+                if self._file is None or self._file.tell() >= self.segment_bytes:
+                    self._roll()
+                offset = self._file.tell()
+                self._file.write(frame)
+                self._file.flush()
+                # The index line is written last so it never points at a partial record
+                self._index.write(f'{offset}\t{len(frame)}\t{status}\t{fetched_at}\t{page}\t{url}\n')
+                self._index.flush()
+                segment = self._segment
+
+        metrics.inc('pages_archived')
+        metrics.inc('archive_bytes', len(frame))
+        return ArchiveEntry(segment, offset, len(frame), status, fetched_at, page, url)
+
+    def segments(self) -> List[str]:
+        """
+        List archived segments, oldest first
+
+        Returns:
+            List[str]: Segment names
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(INDEX_SUFFIX)] for name in os.listdir(self.directory)
+                      if name.endswith(INDEX_SUFFIX))
+
+    def iter_entries(self, latest_only: bool = False) -> Iterator[ArchiveEntry]:
+        """
+        Read the segment indexes
+
+        Args:
+            latest_only (bool): Yield only the most recent record of each URL
+
+        Returns:
+            Iterator[ArchiveEntry]: Entries in archive order
+        """
+        def scan() -> Iterator[ArchiveEntry]:
+            for segment in self.segments():
+                with open(self._segment_path(segment, INDEX_SUFFIX), encoding='utf-8') as index:
+                    for line in index:
+                        fields = line.rstrip('\n').split('\t', 5)
+                        if len(fields) < 6:
+                            # Partially written last line
+                            continue
+                        offset, length, status, fetched_at, page, url = fields
+                        yield ArchiveEntry(segment, int(offset), int(length), int(status),
+                                           fetched_at, int(page), url)
+
+        if not latest_only:
+            yield from scan()
+            return
+
+        latest: Dict[str, ArchiveEntry] = {}
+        for entry in scan():
+            latest.pop(entry.url, None)
+            latest[entry.url] = entry
+        yield from latest.values()
+
+    def read_many(self, segment: str, entries: List[ArchiveEntry]) -> Iterator[ArchivedPage]:
+        """
+        Read records of one segment in a single sequential pass
+
+        Args:
+            segment (str): Segment name
+            entries (List[ArchiveEntry]): Entries of that segment
+
+        Returns:
+            Iterator[ArchivedPage]: Records in offset order
+        """
+        with open(self._segment_path(segment), 'rb') as segment_file:
+            for entry in sorted(entries, key=lambda entry: entry.offset):
+                segment_file.seek(entry.offset)
+                yield _decode_record(self._decompressor.decompress(segment_file.read(entry.length)))
+
+    def read(self, entry: ArchiveEntry) -> ArchivedPage:
+        """
+        Read one archived response
+
+        Args:
+            entry (ArchiveEntry): Entry from iter_entries
+
+        Returns:
+            ArchivedPage: Stored response
+        """
+        return next(self.read_many(entry.segment, [entry]))
+
+    def close(self):
+        """
+        Close the open segment; the next append starts a new one
+        """
+        with self._lock:
+            self._close_segment()
+
+
+_archive: Optional[PageArchive] = None
+_archive_failed = False
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> Optional[PageArchive]:
+    """
+    Get the shared archive that fetched pages are written to
+
+    Returns:
+        Optional[PageArchive]: Archive, or None if scraper.archive.enabled is
+                               off or zstandard is not installed
+    """
+    global _archive, _archive_failed
+    if not config.get('scraper.archive.enabled', False) or _archive_failed:
+        return None
+    with _archive_lock:
+        if _archive is None:
+            try:
+                _archive = PageArchive()
+            except ImportError as e:
+                _archive_failed = True
+                logger.warning("Page archive disabled: %s | تم تعطيل أرشيف الصفحات: %s", e, e)
+                return None
+            atexit.register(_archive.close)
+        return _archive
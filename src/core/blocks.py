@@ -0,0 +1,226 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+from src.utils.config import config
+from src.utils.metrics import metrics
+
+# Elements whose text never counts (scripts, styles and other non-content)
+_SKIPPED_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg', 'head'})
+
+# Elements naming a card, most specific first
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'b')
+_HEADING_RANK = {name: rank for rank, name in enumerate(_HEADING_TAGS)}
+
+# Class name fragments marking a rating inside a card
+_RATING_CLASS = re.compile(r'rating|stars|score', re.IGNORECASE)
+
+
+class TextBlock(NamedTuple):
+    """A content block found by the detector"""
+    name: str
+    description: str
+    rating: Optional[str]
+    text_length: int
+    link_density: float
+
+
+class _NodeStats:
+    """Aggregates of one element's subtree, filled in by its children"""
+    __slots__ = ('text', 'link_text', 'links', 'heading', 'heading_rank', 'paragraph', 'paragraph_text',
+                 'rating', 'groups', 'contains_cards')
+
+    def __init__(self):
+        self.text = 0
+        self.link_text = 0
+        self.links = 0
+        self.heading: Optional[Tag] = None
+        self.heading_rank = len(_HEADING_TAGS)
+        self.paragraph: Optional[Tag] = None
+        self.paragraph_text = 0
+        self.rating: Optional[Tag] = None
+        # Child elements by (tag name, classes), in reverse document order
+        self.groups: Optional[Dict[Tuple, List[Tag]]] = None
+        self.contains_cards = False
+
+    @property
+    def link_density(self) -> float:
+        if not self.text:
+            return 1.0
+        if self.links == 1 and self.link_text == self.text:
+            # The whole card is one link to its detail page
+            return 0.0
+        return self.link_text / self.text
+
+
+class BlockDetector:
+    """
+    Find the repeated content cards of a page with unknown markup
+
+    A single bottom-up pass over the DOM computes, for every element, its
+    visible text length, the share of that text inside links, its best
+    heading, its longest paragraph and its child elements grouped by tag
+    and class. Each parent's groups are scored as soon as the parent is
+    reached: a group of at least ``min_repeats`` siblings with a heading,
+    ``min_text`` characters of text and a link density below
+    ``max_link_density`` is a card list. Lists sharing tag and classes are
+    merged across parents, and the one with the most non-link text wins.
+    Navigation menus (repeated but mostly links) and single article bodies
+    (dense but not repeated) are thereby rejected.
+    """
+
+    def __init__(self,
+                 min_repeats: Optional[int] = None,
+                 min_text: Optional[int] = None,
+                 max_link_density: Optional[float] = None):
+        """
+        Initialize the detector
+
+        Args:
+            min_repeats (Optional[int]): Minimum sibling cards sharing tag and classes
+            min_text (Optional[int]): Minimum visible characters of a card
+            max_link_density (Optional[float]): Maximum share of card text inside links
+        """
+        self.min_repeats = min_repeats or config.get('scraper.blocks.min_repeats', 3)
+        self.min_text = min_text or config.get('scraper.blocks.min_text', 40)
+        self.max_link_density = max_link_density or config.get('scraper.blocks.max_link_density', 0.5)
+
+    def _is_card(self, stats: _NodeStats) -> bool:
+        # Wrappers of card lists (e.g. one section per category) are not cards
+        return (not stats.contains_cards
+                and stats.heading is not None
+                and stats.text >= self.min_text
+                and stats.link_density <= self.max_link_density)
+
+    def _card_groups(self,
+                     stats: Dict[int, _NodeStats],
+                     node_stats: _NodeStats) -> Iterator[Tuple[Tuple, float, List[Tag]]]:
+        for key, members in node_stats.groups.items():
+            if len(members) < self.min_repeats:
+                continue
+            cards = [member for member in reversed(members) if self._is_card(stats[id(member)])]
+            # Most of the group must look like cards, not just a few of its siblings
+            if len(cards) < self.min_repeats or 2 * len(cards) < len(members):
+                continue
+            yield key, float(sum(stats[id(card)].text - stats[id(card)].link_text for card in cards)), cards
+
+    def find_cards(self, soup: BeautifulSoup) -> Tuple[List[Tag], Dict[int, _NodeStats]]:
+        """
+        Locate the best repeated card group of a page
+
+        Args:
+            soup (BeautifulSoup): Parsed HTML content
+
+        Returns:
+            Tuple[List[Tag], Dict[int, _NodeStats]]: Card elements in document
+            order (empty if the page has no card list) and the subtree
+            statistics of every element
+        """
+        stats: Dict[int, _NodeStats] = {}
+        # Card groups by (tag name, classes): lists split over several
+        # parents (one per section or row) are merged
+        candidates: Dict[Tuple, List] = {}
+
+        # Reversed pre-order visits every element after all of its descendants
+        for node in reversed(list(soup.descendants)):
+            parent = node.parent
+            if parent is None or parent.name in _SKIPPED_TAGS:
+                continue
+
+            if isinstance(node, NavigableString):
+                if isinstance(node, PreformattedString):
+                    # Comments, CDATA, doctypes and processing instructions
+                    continue
+                length = len(node.strip())
+                if length:
+                    parent_stats = stats.get(id(parent))
+                    if parent_stats is None:
+                        parent_stats = stats[id(parent)] = _NodeStats()
+                    parent_stats.text += length
+                continue
+
+            if node.name in _SKIPPED_TAGS:
+                continue
+            node_stats = stats.get(id(node))
+            if node_stats is None:
+                node_stats = stats[id(node)] = _NodeStats()
+
+            if node.name == 'a':
+                node_stats.link_text = node_stats.text
+                node_stats.links = 1
+            elif node.name in _HEADING_RANK and node_stats.text:
+                node_stats.heading, node_stats.heading_rank = node, _HEADING_RANK[node.name]
+            elif node.name == 'p' and node_stats.text:
+                node_stats.paragraph, node_stats.paragraph_text = node, node_stats.text
+            if node_stats.rating is None and _RATING_CLASS.search(' '.join(node.get('class') or ())):
+                node_stats.rating = node
+
+            if node_stats.groups is not None:
+                for key, score, cards in self._card_groups(stats, node_stats):
+                    node_stats.contains_cards = True
+                    candidate = candidates.setdefault(key, [0.0, []])
+                    candidate[0] += score
+                    # Parents are reached last-first as well
+                    candidate[1][:0] = cards
+                # Sibling lists are only needed while their parent is scored
+                node_stats.groups = None
+
+            # Fold this subtree into its parent
+            parent_stats = stats.get(id(parent))
+            if parent_stats is None:
+                parent_stats = stats[id(parent)] = _NodeStats()
+            parent_stats.text += node_stats.text
+            parent_stats.link_text += node_stats.link_text
+            parent_stats.links += node_stats.links
+            parent_stats.contains_cards |= node_stats.contains_cards
+            # Children arrive last-first, so ties keep the earliest heading
+            if node_stats.heading is not None and node_stats.heading_rank <= parent_stats.heading_rank:
+                parent_stats.heading, parent_stats.heading_rank = node_stats.heading, node_stats.heading_rank
+            if node_stats.paragraph_text >= parent_stats.paragraph_text and node_stats.paragraph is not None:
+                parent_stats.paragraph, parent_stats.paragraph_text = node_stats.paragraph, node_stats.paragraph_text
+            if node_stats.rating is not None:
+                parent_stats.rating = node_stats.rating
+            if parent_stats.groups is None:
+                parent_stats.groups = defaultdict(list)
+            parent_stats.groups[(node.name, tuple(sorted(node.get('class') or ())))].append(node)
+
+        if not candidates:
+            return [], stats
+        _, cards = max(candidates.values(), key=lambda candidate: candidate[0])
+        return cards, stats
+
+    def detect(self, soup: BeautifulSoup) -> List[TextBlock]:
+        """
+        Extract name, description and rating from each card of a page
+
+        Args:
+            soup (BeautifulSoup): Parsed HTML content
+
+        Returns:
+            List[TextBlock]: Cards in document order
+        """
+        with metrics.timer('detect_blocks'):
+            cards, stats = self.find_cards(soup)
+
+            blocks = []
+            for card in cards:
+                card_stats = stats[id(card)]
+                name = card_stats.heading.get_text(' ', strip=True)
+                if card_stats.paragraph is not None:
+                    description = card_stats.paragraph.get_text(' ', strip=True)
+                else:
+                    # No paragraph: everything except the heading
+                    text = card.get_text(' ', strip=True)
+                    description = text.replace(name, '', 1).strip()
+                rating = card_stats.rating.get_text(strip=True) if card_stats.rating is not None else None
+                if name and description:
+                    blocks.append(TextBlock(name, description, rating, card_stats.text, card_stats.link_density))
+
+        metrics.inc('blocks_detected', len(blocks))
+        return blocks
+
+
+block_detector = BlockDetector()
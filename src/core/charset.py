@@ -0,0 +1,182 @@
+import re
+import codecs
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.core.storage import domain_of
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+# Byte order marks, longest first so UTF-32 is not mistaken for UTF-16
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+
+# <meta charset="..."> and <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.IGNORECASE)
+
+# Labels browsers decode as windows-1252 (WHATWG encoding standard)
+_WINDOWS_1252_ALIASES = frozenset({'latin_1', 'ascii', 'iso8859_1'})
+
+
+def normalize_encoding(label: Optional[str]) -> Optional[str]:
+    """
+    Resolve an encoding label to a Python codec name
+
+    Args:
+        label (Optional[str]): Label from a header, meta tag or config
+
+    Returns:
+        Optional[str]: Codec name, or None if the label is unknown
+    """
+    if not label:
+        return None
+    try:
+        name = codecs.lookup(label.strip().strip('"\'')).name
+    except LookupError:
+        return None
+    name = name.replace('-', '_')
+    return 'cp1252' if name in _WINDOWS_1252_ALIASES else name
+
+
+def _decodes_cleanly(body: bytes, encoding: str) -> bool:
+    # A truncated body may end mid-character, so the tail is not final
+    try:
+        codecs.getincrementaldecoder(encoding)(errors='strict').decode(body, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+class CharsetDecoder:
+    """
+    Decode fetched pages without full-body charset detection in the common case
+
+    The encoding is taken from the first of: the Content-Type header, a byte
+    order mark, a ``<meta charset>`` within the first few KB, the encoding
+    last found for the same domain, and ``scraper.encoding`` (each of the
+    last two only if the body decodes cleanly). Statistical detection over
+    the body runs only when all of them fail, and its result is remembered
+    for the domain.
+    """
+
+    def __init__(self, sniff_bytes: Optional[int] = None, default_encoding: Optional[str] = None):
+        """
+        Initialize the decoder
+
+        Args:
+            sniff_bytes (Optional[int]): Bytes searched for a meta charset
+            default_encoding (Optional[str]): Fallback (defaults to scraper.encoding)
+        """
+        self.sniff_bytes = sniff_bytes or config.get('scraper.charset.sniff_bytes', 4096)
+        self.default_encoding = default_encoding
+        self._domains: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def detect(self, body: bytes, content_type: Optional[str] = None, url: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Choose the encoding of a page body
+
+        Args:
+            body (bytes): Raw body
+            content_type (Optional[str]): Content-Type header value
+            url (Optional[str]): Page URL (per-domain cache key)
+
+        Returns:
+            Tuple[str, str]: Codec name and where it came from
+                             (header, bom, meta, domain, default, detected)
+        """
+        if content_type:
+            match = _HEADER_CHARSET.search(content_type)
+            encoding = normalize_encoding(match.group(1)) if match else None
+            if encoding:
+                return encoding, 'header'
+
+        for bom, encoding in _BOMS:
+            if body.startswith(bom):
+                return encoding, 'bom'
+
+        match = _META_CHARSET.search(body[:self.sniff_bytes])
+        encoding = normalize_encoding(match.group(1).decode('ascii')) if match else None
+        if encoding:
+            return encoding, 'meta'
+
+        domain = domain_of(url) if url else None
+        with self._lock:
+            cached = self._domains.get(domain) if domain else None
+        if cached and _decodes_cleanly(body, cached):
+            return cached, 'domain'
+
+        default = normalize_encoding(self.default_encoding or config.scraper.encoding)
+        if default and _decodes_cleanly(body, default):
+            encoding, source = default, 'default'
+        else:
+            encoding, source = self._detect_statistically(body) or default or 'utf_8', 'detected'
+
+        if domain:
+            with self._lock:
+                self._domains[domain] = encoding
+        return encoding, source
+
+    @staticmethod
+    def _detect_statistically(body: bytes) -> Optional[str]:
+        metrics.inc('charset_detections')
+        try:
+            from charset_normalizer import from_bytes
+        except ImportError:
+            return None
+        best = from_bytes(body).best()
+        return normalize_encoding(best.encoding) if best else None
+
+    def guess(self, content_type: Optional[str] = None, url: Optional[str] = None) -> str:
+        """
+        Best encoding known before the body arrives (for incremental decoding)
+
+        Args:
+            content_type (Optional[str]): Content-Type header value
+            url (Optional[str]): Page URL
+
+        Returns:
+            str: Codec name from the header, the domain cache or scraper.encoding
+        """
+        match = _HEADER_CHARSET.search(content_type) if content_type else None
+        encoding = normalize_encoding(match.group(1)) if match else None
+        if encoding:
+            return encoding
+        with self._lock:
+            encoding = self._domains.get(domain_of(url)) if url else None
+        return encoding or normalize_encoding(self.default_encoding or config.scraper.encoding) or 'utf_8'
+
+    def decode(self, body: bytes, content_type: Optional[str] = None, url: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Decode a page body
+
+        Args:
+            body (bytes): Raw body
+            content_type (Optional[str]): Content-Type header value
+            url (Optional[str]): Page URL
+
+        Returns:
+            Tuple[str, str]: Text and codec name
+        """
+        with metrics.timer('decode'):
+            encoding, source = self.detect(body, content_type, url)
+            if source == 'detected':
+                logger.debug("Detected %s for %s | تم اكتشاف الترميز %s", encoding, url, encoding)
+            return body.decode(encoding, errors='replace'), encoding
+
+    def clear(self):
+        """Forget the per-domain encodings"""
+        with self._lock:
+            self._domains.clear()
+
+
+# Shared decoder so the per-domain cache spans scrapers and crawl workers
+charset_decoder = CharsetDecoder()
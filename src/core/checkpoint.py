@@ -0,0 +1,295 @@
+import os
+import json
+import time
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+# Relative checkpoint paths are resolved against the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+def checkpoint_dir(kind: str, directory: Optional[str] = None) -> str:
+    """
+    Resolve the directory holding one kind of checkpoint
+
+    Args:
+        kind (str): Checkpoint kind (crawl, frontier, analysis)
+        directory (Optional[str]): Base directory (defaults to checkpoint.directory)
+
+    Returns:
+        str: Absolute directory path
+    """
+    base = directory or config.get('checkpoint.directory', 'data/checkpoints')
+    if not os.path.isabs(base):
+        base = os.path.join(PROJECT_ROOT, base)
+    return os.path.join(base, kind)
+
+
+def atomic_write_json(path: str, data: Any):
+    """
+    Write JSON so that readers see either the old or the new file, never a torn one
+
+    Args:
+        path (str): Target path
+        data (Any): JSON-serializable data
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_json(path: str) -> Optional[Any]:
+    """
+    Read a JSON checkpoint
+
+    Args:
+        path (str): File path
+
+    Returns:
+        Optional[Any]: Parsed data, None if the file does not exist
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class CrawlCheckpoint:
+    """
+    Resumable state of a single-site scrape
+
+    Pages are appended to ``<job>.pages.jsonl`` as they are scraped; every
+    ``interval_pages`` pages or ``interval_seconds`` the crawl state (next
+    URL, page number, result store run) is written atomically to
+    ``<job>.json`` together with the byte length of the page log at that
+    moment. Resuming truncates the log back to that length, so the restored
+    results always match the restored position exactly.
+    """
+
+    def __init__(self,
+                 job: str,
+                 directory: Optional[str] = None,
+                 interval_pages: Optional[int] = None,
+                 interval_seconds: Optional[float] = None):
+        """
+        Initialize the checkpoint files of a job
+
+        Args:
+            job (str): Job id
+            directory (Optional[str]): Base checkpoint directory
+            interval_pages (Optional[int]): Pages between checkpoints
+            interval_seconds (Optional[float]): Seconds between checkpoints
+        """
+        self.job = job
+        self.directory = checkpoint_dir('crawl', directory)
+        self.state_path = os.path.join(self.directory, f'{job}.json')
+        self.pages_path = os.path.join(self.directory, f'{job}.pages.jsonl')
+        self.interval_pages = interval_pages or config.get('checkpoint.interval_pages', 10)
+        self.interval_seconds = interval_seconds or config.get('checkpoint.interval_seconds', 60)
+
+        self._pages = None
+        self._unsaved_pages = 0
+        self._saved_at = time.monotonic()
+
+    @staticmethod
+    def new_job_id(url: str) -> str:
+        """
+        Create a job id for a scrape starting at url
+
+        Args:
+            url (str): Start URL
+
+        Returns:
+            str: Job id
+        """
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+        return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{digest}"
+
+    def start(self):
+        """
+        Start a fresh page log
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._pages = open(self.pages_path, 'wb')
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Restore the last saved state and reopen the page log for appending
+
+        Returns:
+            Optional[Dict[str, Any]]: State with a 'results' list of page
+                                      dicts, None if the job has no checkpoint
+        """
+        state = read_json(self.state_path)
+        if state is None:
+            return None
+
+        # Drop pages logged after the last saved state; they are scraped again
+        with open(self.pages_path, 'ab') as pages:
+            pages.truncate(state['pages_bytes'])
+        with open(self.pages_path, 'rb') as pages:
+            state['results'] = [json.loads(line) for line in pages]
+
+        self._pages = open(self.pages_path, 'ab')
+        return state
+
+    def record_page(self, url: str, page: int, language: str, tools: List[Dict[str, str]]):
+        """
+        Append one scraped page to the page log
+
+        Args:
+            url (str): Page URL
+            page (int): Page number
+            language (str): Scraping language
+            tools (List[Dict[str, str]]): Extracted tools
+        """
+        record = {'url': url, 'page': page, 'language': language, 'tools': tools}
+        self._pages.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._unsaved_pages += 1
+
+    def due(self) -> bool:
+        """True when enough pages or time have passed since the last save"""
+        return (self._unsaved_pages >= self.interval_pages
+                or (self._unsaved_pages > 0 and time.monotonic() - self._saved_at >= self.interval_seconds))
+
+    def save(self, state: Dict[str, Any]):
+        """
+        Make the logged pages durable and atomically record the crawl state
+
+        Args:
+            state (Dict[str, Any]): Position to resume from (JSON-serializable)
+        """
+        with metrics.timer('checkpoint'):
+            self._pages.flush()
+            os.fsync(self._pages.fileno())
+            atomic_write_json(self.state_path, dict(state, job=self.job, pages_bytes=self._pages.tell(),
+                                                    saved_at=time.time()))
+        self._unsaved_pages = 0
+        self._saved_at = time.monotonic()
+        metrics.inc('checkpoints_saved')
+
+    def close(self):
+        if self._pages is not None:
+            self._pages.close()
+            self._pages = None
+
+    def finish(self):
+        """
+        Remove the checkpoint once the crawl completed
+        """
+        self.close()
+        for path in (self.state_path, self.pages_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def list_crawl_checkpoints(directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    List resumable scrapes, most recent first
+
+    Args:
+        directory (Optional[str]): Base checkpoint directory
+
+    Returns:
+        List[Dict[str, Any]]: Saved states (without results)
+    """
+    crawl_dir = checkpoint_dir('crawl', directory)
+    if not os.path.isdir(crawl_dir):
+        return []
+    states = [read_json(os.path.join(crawl_dir, name)) for name in os.listdir(crawl_dir)
+              if name.endswith('.json')]
+    return sorted((state for state in states if state), key=lambda state: state['saved_at'], reverse=True)
+
+
+class ChunkJournal:
+    """
+    Completed analysis chunk outputs keyed by chunk hash
+
+    Each model answer is appended and fsynced as soon as it arrives, so an
+    interrupted analysis re-run over the same input only sends the chunks that
+    never completed. A torn last line (crash mid-write) is ignored. The
+    journal file is named after the kind, model, prompt and an identity of
+    the input (e.g. a hash of the uploaded file), so analyses of different
+    inputs never share or delete each other's journal.
+    """
+
+    def __init__(self,
+                 kind: str,
+                 model: str,
+                 prompt: str,
+                 source: str,
+                 directory: Optional[str] = None):
+        """
+        Open (or create) the journal of one analysis
+
+        Args:
+            kind (str): Analysis kind (summary, technical, custom)
+            model (str): Model name
+            prompt (str): System prompt sent with every chunk
+            source (str): Identity of the analyzed input, stable across re-runs
+            directory (Optional[str]): Base checkpoint directory
+        """
+        job = hashlib.sha256('\0'.join((kind, model, prompt, source)).encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(checkpoint_dir('analysis', directory), f'{kind}-{job}.jsonl')
+        self._outputs: Dict[str, str] = {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._outputs[entry['chunk']] = entry['output']
+        except FileNotFoundError:
+            pass
+        if self._outputs:
+            logger.info("Resuming analysis with %d completed chunks | استئناف التحليل مع %d جزء مكتمل",
+                        len(self._outputs), len(self._outputs))
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def key(chunk: str) -> str:
+        return hashlib.sha256(chunk.encode('utf-8')).hexdigest()
+
+    def get(self, chunk_key: str) -> Optional[str]:
+        return self._outputs.get(chunk_key)
+
+    def put(self, chunk_key: str, output: str):
+        """
+        Durably record the model output of a chunk
+
+        Args:
+            chunk_key (str): Chunk hash from key()
+            output (str): Model output
+        """
+        self._outputs[chunk_key] = output
+        self._file.write(json.dumps({'chunk': chunk_key, 'output': output}, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """
+        Close the journal but keep it, so a later run can resume from it
+        """
+        if not self._file.closed:
+            self._file.close()
+
+    def finish(self):
+        """
+        Remove the journal once the analysis completed
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,276 @@
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.utils.config import config
+
+# Arabic diacritics (tashkeel), superscript alef and tatweel are dropped before matching
+_ARABIC_MARKS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+
+# Letter variants folded to one form so spelling variations match
+_ARABIC_FOLDS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ة': 'ه', 'ؤ': 'و', 'ئ': 'ي'
+})
+
+# Used when the taxonomy is not configured
+DEFAULT_TAXONOMY = {
+    'Productivity': {'en': ['productivity tool', 'productivity'], 'ar': ['إنتاجية']},
+    'Marketing': {'en': ['marketing tool', 'marketing', 'seo'], 'ar': ['تسويق']},
+    'Web': {'en': ['web tool', 'web service'], 'ar': ['خدمة ويب']}
+}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for keyword matching
+
+    Case is folded, Arabic diacritics and tatweel are removed, alef/yaa/taa
+    marbuta variants are unified and whitespace is collapsed.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Normalized text
+    """
+    text = _ARABIC_MARKS.sub('', text.casefold()).translate(_ARABIC_FOLDS)
+    return ' '.join(text.split())
+
+
+def _is_word_char(char: str) -> bool:
+    # Only Latin letters and digits bound English keywords; Arabic words take
+    # attached prefixes (ال، و، ب) so they may match inside a token
+    return char.isascii() and char.isalnum()
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton matching many keywords in one pass over a text
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        """
+        Build the automaton
+
+        Args:
+            patterns (Iterable[Tuple[str, Any]]): (normalized keyword, value) pairs
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+        for keyword, value in patterns:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((len(keyword), value))
+
+        # Breadth-first failure links; outputs of suffix states are inherited
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Find all keyword occurrences on word boundaries
+
+        Args:
+            text (str): Normalized text
+
+        Yields:
+            Tuple[int, int, Any]: Start, end and value of each match
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in out[state]:
+                start, end = index - length + 1, index + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                yield start, end, value
+
+
+class CategoryClassifier:
+    """
+    Keyword taxonomy classifier for tool records
+
+    Every Arabic and English keyword of every category is compiled into one
+    KeywordMatcher, so a record is classified with a single scan of its text
+    no matter how large the taxonomy grows.
+    """
+
+    def __init__(self,
+                 taxonomy: Optional[Mapping[str, Mapping[str, Sequence[str]]]] = None,
+                 default_category: Optional[str] = None):
+        """
+        Compile the taxonomy
+
+        Args:
+            taxonomy (Optional[Mapping]): Category -> language -> keywords
+                                          (defaults to classifier.taxonomy)
+            default_category (Optional[str]): Category when nothing matches
+        """
+        taxonomy = taxonomy or config.get('classifier.taxonomy') or DEFAULT_TAXONOMY
+        self.default_category = default_category or config.get('classifier.default_category', 'Uncategorized')
+        self.categories = list(taxonomy)
+
+        patterns = []
+        for rank, category in enumerate(self.categories):
+            keywords = taxonomy[category]
+            if not isinstance(keywords, Mapping):
+                keywords = {'any': keywords}
+            for words in keywords.values():
+                for word in words:
+                    patterns.append((normalize_text(str(word)), rank))
+        self._matcher = KeywordMatcher(patterns)
+
+    def _rank_scores(self, text: str) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        for start, end, rank in self._matcher.iter_matches(normalize_text(text)):
+            # Longer keywords are more specific and weigh more
+            counts[rank] = counts.get(rank, 0) + (end - start)
+        return counts
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """
+        Score each matched category by the length of its keyword hits
+
+        Args:
+            text (str): Record text
+
+        Returns:
+            Dict[str, int]: Score per matched category
+        """
+        return {self.categories[rank]: score for rank, score in self._rank_scores(text).items()}
+
+    def classify(self, text: Optional[str]) -> Optional[str]:
+        """
+        Pick the best matching category
+
+        Args:
+            text (Optional[str]): Record text
+
+        Returns:
+            Optional[str]: Category, or None if no keyword matched
+        """
+        if not text:
+            return None
+        counts = self._rank_scores(text)
+        if not counts:
+            return None
+        # Highest score wins; ties go to the category listed first
+        return self.categories[min(counts, key=lambda rank: (-counts[rank], rank))]
+
+    def classify_many(self, texts: Iterable[Optional[str]]) -> List[str]:
+        """
+        Classify a batch of texts
+
+        Args:
+            texts (Iterable[Optional[str]]): Record texts
+
+        Returns:
+            List[str]: Categories (default_category when nothing matched)
+        """
+        return [self.classify(text) or self.default_category for text in texts]
+
+    def classify_column(self,
+                        df: pd.DataFrame,
+                        text_columns: Sequence[str] = ('name', 'description')) -> pd.Categorical:
+        """
+        Classify every row of a frame
+
+        Repeated texts are classified once: rows are factorized and only the
+        distinct values are scanned.
+
+        Args:
+            df (pd.DataFrame): Records
+            text_columns (Sequence[str]): Columns joined to form each row's text
+
+        Returns:
+            pd.Categorical: Category per row
+        """
+        text = df[text_columns[0]].astype('string').fillna('')
+        for column in text_columns[1:]:
+            text = text + ' ' + df[column].astype('string').fillna('')
+
+        codes, uniques = pd.factorize(text)
+        labels = pd.Index(self.classify_many(uniques))
+        categories = pd.Index(list(dict.fromkeys([*self.categories, self.default_category])))
+        return pd.Categorical.from_codes(categories.get_indexer(labels)[codes], categories=categories)
+
+    def fill_missing(self,
+                     df: pd.DataFrame,
+                     column: str = 'category',
+                     text_columns: Sequence[str] = ('name', 'description')) -> pd.DataFrame:
+        """
+        Classify only rows whose category is missing or the default
+
+        Args:
+            df (pd.DataFrame): Records
+            column (str): Category column
+            text_columns (Sequence[str]): Columns joined to form each row's text
+
+        Returns:
+            pd.DataFrame: Copy of df with the category column filled
+        """
+        result = df.copy(deep=False)
+        current = result[column].astype('string')
+        missing = (current.isna() | (current == self.default_category)).to_numpy()
+        if missing.any():
+            filled = current.to_numpy(dtype=object, na_value=None)
+            filled[missing] = self.classify_column(result.loc[missing], text_columns).astype(object)
+            result[column] = pd.Categorical(filled)
+        return result
+
+
+_classifier: Optional[CategoryClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> CategoryClassifier:
+    """
+    Get the shared classifier compiled from the configured taxonomy
+
+    Returns:
+        CategoryClassifier: Classifier instance
+    """
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = CategoryClassifier()
+        return _classifier
+
+
+def _reset_classifier(snapshot):
+    global _classifier
+    with _classifier_lock:
+        _classifier = None
+
+
+# Recompile when the taxonomy is edited
+config.on_reload(_reset_classifier)
@@ -0,0 +1,170 @@
+import os
+import time
+from typing import Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from src.core.storage import domain_of
+from src.utils.config import config
+from src.utils.metrics import metrics
+
+# Relative dataset paths are resolved against the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+# Columns stored as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = ('category', 'url', 'language', 'domain')
+
+# Supported dataset formats and their file extensions
+DATASET_FORMATS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+
+def typed_tools_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert an exported tools frame to typed columns
+
+    ``rating`` becomes a nullable float (the ``'N/A'`` sentinel turns into
+    nulls), ``page`` a nullable int, low-cardinality text columns become
+    categoricals, and ``domain``/``date`` columns are derived for partitioning.
+
+    Args:
+        df (pd.DataFrame): Tools frame with at least name, description,
+                           category, rating, url, page and language
+
+    Returns:
+        pd.DataFrame: Typed frame
+    """
+    typed = df.copy(deep=False)
+    typed['rating'] = pd.to_numeric(typed['rating'].astype('string'), errors='coerce').astype('Float64')
+    typed['page'] = pd.to_numeric(typed['page'], errors='coerce').astype('Int32')
+
+    if 'domain' not in typed.columns:
+        # Mapping a categorical parses each distinct URL once
+        typed['domain'] = typed['url'].astype('category').map(domain_of)
+
+    if 'scraped_at' in typed.columns:
+        scraped_at = typed['scraped_at']
+        if not pd.api.types.is_datetime64_any_dtype(scraped_at):
+            scraped_at = pd.to_datetime(scraped_at, unit='s', utc=True)
+        typed['scraped_at'] = scraped_at
+        # Format each distinct day once instead of every row
+        days = scraped_at.dt.floor('D').astype('category')
+        typed['date'] = days.cat.rename_categories(days.cat.categories.strftime('%Y-%m-%d'))
+    else:
+        typed['date'] = pd.Categorical([time.strftime('%Y-%m-%d')] * len(typed))
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in typed.columns and not isinstance(typed[column].dtype, pd.CategoricalDtype):
+            typed[column] = typed[column].astype('category')
+
+    return typed
+
+
+def _resolve_path(path: str) -> str:
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+def _default_dir(format: str) -> str:
+    # Each format gets its own root so scans never mix file types
+    return os.path.join(config.get('export.dataset.path', 'exports/datasets'), format)
+
+
+def write_dataset(df: pd.DataFrame,
+                  base_dir: Optional[str] = None,
+                  format: str = 'parquet',
+                  partition_by: Optional[Sequence[str]] = None,
+                  compression: Optional[str] = None) -> str:
+    """
+    Write tools as a hive-partitioned Parquet or Arrow IPC dataset
+
+    Arrow IPC files are always written uncompressed, so load_dataset can
+    memory-map them and read columns without copying; compression applies
+    to Parquet only.
+
+    Args:
+        df (pd.DataFrame): Tools frame (typed or as exported)
+        base_dir (Optional[str]): Dataset root directory
+                                  (defaults to export.dataset.path/<format>)
+        format (str): parquet or arrow
+        partition_by (Optional[Sequence[str]]): Partition columns
+        compression (Optional[str]): Parquet codec (e.g. zstd, snappy, lz4, none)
+
+    Returns:
+        str: Dataset root directory
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if format not in DATASET_FORMATS:
+        raise ValueError(f"Unsupported dataset format: {format}")
+
+    base_dir = _resolve_path(base_dir or _default_dir(format))
+    partition_by = list(partition_by or config.get('export.dataset.partition_by', ['language', 'domain', 'date']))
+    compression = compression or config.get('export.dataset.compression.parquet', 'zstd')
+    if compression == 'none':
+        compression = None
+
+    typed = typed_tools_frame(df)
+    missing = [column for column in partition_by if column not in typed.columns]
+    if missing:
+        raise ValueError(f"Unknown partition columns: {missing}")
+
+    table = pa.Table.from_pandas(typed, preserve_index=False)
+
+    if format == 'parquet':
+        file_format = ds.ParquetFileFormat()
+        file_options = file_format.make_write_options(compression=compression)
+    else:
+        # pyarrow compresses IPC files with lz4 by default, which rules out memory mapping
+        file_format = ds.IpcFileFormat()
+        file_options = file_format.make_write_options(compression=None)
+
+    with metrics.timer('export'):
+        ds.write_dataset(
+            table,
+            base_dir,
+            format=file_format,
+            file_options=file_options,
+            partitioning=partition_by,
+            partitioning_flavor='hive',
+            basename_template=f"part-{time.strftime('%Y%m%d-%H%M%S')}-{{i}}.{DATASET_FORMATS[format]}",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+    metrics.inc('rows_exported', len(typed))
+    return base_dir
+
+
+def load_dataset(base_dir: Optional[str] = None,
+                 format: str = 'parquet',
+                 columns: Optional[List[str]] = None,
+                 filters: Optional[Iterable[tuple]] = None):
+    """
+    Scan a partitioned dataset, reading only the needed partitions and columns
+
+    Arrow datasets are memory-mapped, so their columns are not copied into memory.
+
+    Args:
+        base_dir (Optional[str]): Dataset root directory
+        format (str): parquet or arrow
+        columns (Optional[List[str]]): Columns to read
+        filters (Optional[Iterable[tuple]]): (column, value) equality filters,
+                                             partition columns are pruned
+
+    Returns:
+        pyarrow.Table: Matching rows
+    """
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+
+    base_dir = _resolve_path(base_dir or _default_dir(format))
+    if format == 'arrow':
+        dataset = ds.dataset(base_dir, format='ipc', partitioning='hive',
+                             filesystem=fs.LocalFileSystem(use_mmap=True))
+    else:
+        dataset = ds.dataset(base_dir, format=format, partitioning='hive')
+
+    expression = None
+    for column, value in filters or []:
+        condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+
+    return dataset.to_table(columns=columns, filter=expression)
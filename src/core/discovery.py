@@ -0,0 +1,226 @@
+import io
+import re
+import gzip
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+
+import requests
+
+from src.core.incremental import FingerprintStore
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+# Elements holding one URL in sitemaps (url, sitemap), RSS (item) and Atom (entry)
+_ENTRY_TAGS = frozenset({'url', 'sitemap', 'item', 'entry'})
+
+# Child elements carrying the modification date, most specific first
+_DATE_TAGS = ('lastmod', 'updated', 'pubDate', 'date', 'published')
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+class DiscoveredURL(NamedTuple):
+    """A page URL found in a sitemap or feed"""
+    url: str
+    lastmod: Optional[float]
+    source: str
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a W3C datetime (sitemaps, Atom) or RFC 822 date (RSS)
+
+    Args:
+        value (Optional[str]): Date text
+
+    Returns:
+        Optional[float]: Unix timestamp, None if missing or unparseable
+    """
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _entry_fields(element: ElementTree.Element) -> Tuple[Optional[str], Optional[float]]:
+    url, dates = None, {}
+    for child in element:
+        name = _local_name(child.tag)
+        if name in ('loc', 'link'):
+            # Atom links carry the URL in href; only the alternate (page) link counts
+            href = child.get('href')
+            if href is not None:
+                if child.get('rel', 'alternate') == 'alternate' and url is None:
+                    url = href.strip()
+            elif child.text and url is None:
+                url = child.text.strip()
+        elif name in _DATE_TAGS:
+            dates.setdefault(name, child.text)
+    lastmod = next((parse_lastmod(dates[tag]) for tag in _DATE_TAGS if tag in dates), None)
+    return url or None, lastmod
+
+
+def iter_feed_entries(stream) -> Iterator[Tuple[str, str, Optional[float]]]:
+    """
+    Stream the entries of a sitemap, sitemap index, RSS or Atom document
+
+    Elements are cleared as soon as they are read, so memory does not grow
+    with the document (sitemaps may hold 50,000 URLs).
+
+    Args:
+        stream: Binary file-like object with the XML document
+
+    Returns:
+        Iterator[Tuple[str, str, Optional[float]]]: (kind, url, lastmod) where
+        kind is 'sitemap' for nested sitemaps and 'page' otherwise
+    """
+    for _, element in ElementTree.iterparse(stream, events=('end',)):
+        name = _local_name(element.tag)
+        if name not in _ENTRY_TAGS:
+            continue
+        url, lastmod = _entry_fields(element)
+        element.clear()
+        if url:
+            yield ('sitemap' if name == 'sitemap' else 'page'), url, lastmod
+
+
+class URLDiscoverer:
+    """
+    Bulk URL discovery from robots.txt sitemaps and RSS/Atom feeds
+
+    Sitemap indexes are followed breadth-first (gzipped sitemaps included),
+    so a crawl can start from every known page at once instead of walking
+    "Next" links one fetch at a time.
+    """
+
+    def __init__(self,
+                 timeout: Optional[int] = None,
+                 max_documents: Optional[int] = None,
+                 max_urls: Optional[int] = None,
+                 include: Optional[str] = None):
+        """
+        Initialize the discoverer
+
+        Args:
+            timeout (Optional[int]): Request timeout in seconds
+            max_documents (Optional[int]): Maximum sitemaps and feeds fetched
+            max_urls (Optional[int]): Maximum page URLs yielded
+            include (Optional[str]): Regex page URLs must match (defaults to scraper.discovery.include)
+        """
+        self.timeout = timeout or config.scraper.default_timeout
+        self.max_documents = max_documents or config.get('scraper.discovery.max_documents', 500)
+        self.max_urls = max_urls or config.get('scraper.discovery.max_urls', 100000)
+        include = include or config.get('scraper.discovery.include')
+        self.include = re.compile(include) if include else None
+        self.fallback_sitemaps = tuple(config.get('scraper.discovery.fallback_sitemaps', ('/sitemap.xml',)))
+        self.headers = {'User-Agent': config.get('scraper.discovery.user_agent', 'Mozilla/5.0 (compatible; AI-WebScraper)')}
+
+    def sitemaps_from_robots(self, site_url: str) -> List[str]:
+        """
+        Read the Sitemap lines of a site's robots.txt
+
+        Args:
+            site_url (str): Any URL on the site
+
+        Returns:
+            List[str]: Sitemap URLs, or the fallback sitemap paths if none are declared
+        """
+        parsed = urlparse(site_url)
+        root = f'{parsed.scheme}://{parsed.netloc}'
+        sitemaps = []
+        try:
+            response = requests.get(f'{root}/robots.txt', headers=self.headers, timeout=self.timeout)
+            if response.ok:
+                for line in response.text.splitlines():
+                    name, sep, value = line.partition(':')
+                    if sep and name.strip().lower() == 'sitemap' and value.strip():
+                        sitemaps.append(urljoin(root, value.strip()))
+        except requests.exceptions.RequestException as e:
+            logger.warning("Could not read robots.txt of %s: %s | تعذر قراءة robots.txt للموقع %s: %s",
+                           root, e, root, e)
+        return sitemaps or [urljoin(root, path) for path in self.fallback_sitemaps]
+
+    def _open(self, url: str) -> Tuple[requests.Response, io.BufferedIOBase]:
+        response = requests.get(url, headers=self.headers, timeout=self.timeout, stream=True)
+        response.raise_for_status()
+        # Undo Content-Encoding, then gunzip .xml.gz files served as-is
+        response.raw.decode_content = True
+        # GzipFile reads past the end of the body, so keep the raw stream open until response.close()
+        response.raw.auto_close = False
+        stream = io.BufferedReader(response.raw)
+        if stream.peek(2)[:2] == _GZIP_MAGIC:
+            return response, gzip.GzipFile(fileobj=stream)
+        return response, stream
+
+    def discover(self,
+                 site_urls: Iterable[str] = (),
+                 feeds: Iterable[str] = (),
+                 fingerprints: Optional[FingerprintStore] = None) -> Iterator[DiscoveredURL]:
+        """
+        Yield page URLs from the sites' sitemaps and the given feeds
+
+        Args:
+            site_urls (Iterable[str]): Sites whose robots.txt sitemaps are read
+            feeds (Iterable[str]): Extra sitemap, RSS or Atom URLs
+                                   (defaults to scraper.discovery.feeds)
+            fingerprints (Optional[FingerprintStore]): Skip pages scraped after
+                                                       their lastmod
+
+        Returns:
+            Iterator[DiscoveredURL]: Distinct page URLs with their lastmod
+        """
+        documents = deque()
+        for site_url in site_urls:
+            documents.extend(self.sitemaps_from_robots(site_url))
+        documents.extend(feeds or config.get('scraper.discovery.feeds', ()))
+
+        queued = set(documents)
+        seen = set()
+        fetched = 0
+
+        while documents and fetched < self.max_documents and len(seen) < self.max_urls:
+            document = documents.popleft()
+            fetched += 1
+            try:
+                with metrics.timer('discover'):
+                    response, stream = self._open(document)
+                with response:
+                    for kind, url, lastmod in iter_feed_entries(stream):
+                        if kind == 'sitemap':
+                            if url not in queued:
+                                queued.add(url)
+                                documents.append(url)
+                            continue
+                        if url in seen or (self.include is not None and not self.include.search(url)):
+                            continue
+                        seen.add(url)
+                        if fingerprints is not None and fingerprints.is_fresh(url, lastmod):
+                            metrics.inc('urls_unchanged_skipped')
+                        else:
+                            metrics.inc('urls_discovered')
+                            yield DiscoveredURL(url, lastmod, document)
+                        if len(seen) >= self.max_urls:
+                            break
+            except (requests.exceptions.RequestException, ElementTree.ParseError, OSError, EOFError) as e:
+                logger.warning("Could not read %s: %s | تعذر قراءة %s: %s", document, e, document, e)
+
+        if documents:
+            logger.warning("Discovery stopped after %d documents | توقف الاكتشاف بعد %d مستند", fetched, fetched)
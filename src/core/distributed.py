@@ -0,0 +1,799 @@
+import os
+import json
+import time
+import uuid
+import argparse
+import itertools
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+from src.core.checkpoint import atomic_write_json, checkpoint_dir, read_json
+from src.core.discovery import URLDiscoverer
+from src.core.incremental import FingerprintStore
+from src.core.records import ToolTable
+from src.core.scraper import WebScraper
+from src.core.storage import domain_of
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+
+class _InMemoryPipeline:
+    """
+    Command queue with the redis-py pipeline interface
+    """
+
+    def __init__(self, client: 'InMemoryRedis'):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> list:
+        commands, self._commands = self._commands, []
+        # Holding the client lock makes the batch atomic, like MULTI/EXEC
+        with self._client._lock:
+            return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+class InMemoryRedis:
+    """
+    Thread-safe, in-process stand-in for the subset of Redis used by the crawler
+
+    Lets the distributed crawl run (and be tested) without a Redis server;
+    workers must then be threads of the same process.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data: Dict[str, Any] = {}
+        self._expiry: Dict[str, float] = {}
+
+    def _live(self, key: str) -> bool:
+        expires = self._expiry.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(key, None)
+            self._expiry.pop(key, None)
+        return key in self._data
+
+    def _list(self, key: str) -> list:
+        if not self._live(key):
+            self._data[key] = []
+        return self._data[key]
+
+    def _set(self, key: str) -> set:
+        if not self._live(key):
+            self._data[key] = set()
+        return self._data[key]
+
+    def _hash(self, key: str) -> dict:
+        if not self._live(key):
+            self._data[key] = {}
+        return self._data[key]
+
+    def set(self, key: str, value: Any, nx: bool = False, px: Optional[int] = None) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(key):
+                return None
+            self._data[key] = value
+            if px is not None:
+                self._expiry[key] = time.monotonic() + px / 1000
+            else:
+                self._expiry.pop(key, None)
+            return True
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            return self._data.get(key) if self._live(key) else None
+
+    def exists(self, key: str) -> int:
+        with self._lock:
+            return int(self._live(key))
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._live(key):
+                    del self._data[key]
+                    self._expiry.pop(key, None)
+                    removed += 1
+            return removed
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._data.get(key, 0) if self._live(key) else 0) + 1
+            self._data[key] = value
+            return value
+
+    def lpush(self, key: str, *values: Any) -> int:
+        with self._lock:
+            items = self._list(key)
+            for value in values:
+                items.insert(0, value)
+            return len(items)
+
+    def rpush(self, key: str, *values: Any) -> int:
+        with self._lock:
+            items = self._list(key)
+            items.extend(values)
+            return len(items)
+
+    def rpoplpush(self, source: str, destination: str) -> Any:
+        with self._lock:
+            items = self._list(source)
+            if not items:
+                return None
+            value = items.pop()
+            self._list(destination).insert(0, value)
+            return value
+
+    def lrem(self, key: str, count: int, value: Any) -> int:
+        with self._lock:
+            items = self._list(key)
+            removed = 0
+            while value in items and (count == 0 or removed < count):
+                items.remove(value)
+                removed += 1
+            return removed
+
+    def llen(self, key: str) -> int:
+        with self._lock:
+            return len(self._list(key))
+
+    def lrange(self, key: str, start: int, end: int) -> list:
+        with self._lock:
+            items = self._list(key)
+            return list(items[start:] if end == -1 else items[start:end + 1])
+
+    def sadd(self, key: str, *values: Any) -> int:
+        with self._lock:
+            members = self._set(key)
+            added = len(set(values) - members)
+            members.update(values)
+            return added
+
+    def srem(self, key: str, *values: Any) -> int:
+        with self._lock:
+            members = self._set(key)
+            removed = len(members & set(values))
+            members.difference_update(values)
+            return removed
+
+    def smembers(self, key: str) -> set:
+        with self._lock:
+            return set(self._set(key))
+
+    def sismember(self, key: str, value: Any) -> bool:
+        with self._lock:
+            return value in self._set(key)
+
+    def hset(self, key: str, field: Any = None, value: Any = None, mapping: Optional[Dict] = None) -> int:
+        with self._lock:
+            items = self._hash(key)
+            updates = dict(mapping or {})
+            if field is not None:
+                updates[field] = value
+            added = len(set(updates) - set(items))
+            items.update(updates)
+            return added
+
+    def hsetnx(self, key: str, field: Any, value: Any) -> int:
+        with self._lock:
+            items = self._hash(key)
+            if field in items:
+                return 0
+            items[field] = value
+            return 1
+
+    def hvals(self, key: str) -> list:
+        with self._lock:
+            return list(self._hash(key).values())
+
+    def hlen(self, key: str) -> int:
+        with self._lock:
+            return len(self._hash(key))
+
+    def pipeline(self, transaction: bool = True) -> _InMemoryPipeline:
+        return _InMemoryPipeline(self)
+
+
+def connect(redis_url: Optional[str] = None):
+    """
+    Connect to the Redis server shared by crawl workers
+
+    Args:
+        redis_url (Optional[str]): Redis URL (defaults to distributed.redis_url)
+
+    Returns:
+        redis.Redis: Client returning str values
+    """
+    import redis
+
+    return redis.Redis.from_url(
+        redis_url or config.get('distributed.redis_url', 'redis://localhost:6379/0'),
+        decode_responses=True
+    )
+
+
+def _text(value: Any) -> Optional[str]:
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+class CrawlFrontier:
+    """
+    Shared URL frontier, visited set, leases and per-host rate limits
+
+    Work is claimed with RPOPLPUSH into a per-worker processing list guarded by
+    a heartbeat key with a TTL, which workers renew from a background thread
+    while they run. When a worker stops heart-beating, any other worker moves
+    its in-flight URLs back onto the queue. Claims and completions skip URLs
+    that are already visited and results are stored per (url, page), so a
+    page whose claim was reclaimed while it was still being processed is
+    recorded once. A page whose fetch fails is re-queued until it has been
+    tried ``max_attempts`` times, and only then marked visited.
+    """
+
+    def __init__(self,
+                 client,
+                 job: str = 'default',
+                 max_pages: int = 10,
+                 max_attempts: Optional[int] = None):
+        """
+        Initialize the frontier keys for a crawl job
+
+        Args:
+            client: Redis client or InMemoryRedis
+            job (str): Crawl job name (namespaces all keys)
+            max_pages (int): Maximum listing depth followed from each seed
+            max_attempts (Optional[int]): Fetches of a failing URL before it is given up
+        """
+        self.client = client
+        self.max_pages = max_pages
+        self.max_attempts = max_attempts or config.get('distributed.max_attempts', 3)
+        self.prefix = f"{config.get('distributed.key_prefix', 'ai_web_scraper')}:crawl:{job}"
+        self.queue_key = f'{self.prefix}:queue'
+        self.seen_key = f'{self.prefix}:seen'
+        self.visited_key = f'{self.prefix}:visited'
+        self.workers_key = f'{self.prefix}:workers'
+        self.results_key = f'{self.prefix}:pages'
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f'{self.prefix}:processing:{worker_id}'
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f'{self.prefix}:heartbeat:{worker_id}'
+
+    def enqueue(self, url: str, page: int = 1) -> bool:
+        """
+        Add a URL unless it was already enqueued by any worker
+
+        Args:
+            url (str): Page URL
+            page (int): Listing depth of the page
+
+        Returns:
+            bool: True if the URL was newly enqueued
+        """
+        if page > self.max_pages or not self.client.sadd(self.seen_key, url):
+            return False
+        self.client.lpush(self.queue_key, json.dumps({'url': url, 'page': page}))
+        return True
+
+    def enqueue_many(self, urls: Iterable[str], page: int = 1, batch_size: Optional[int] = None) -> int:
+        """
+        Bulk-add URLs, skipping any already enqueued by any worker
+
+        Each batch costs two round trips: one pipelined SADD per URL to learn
+        which are new, then a single LPUSH of all new tasks.
+
+        Args:
+            urls (Iterable[str]): Page URLs
+            page (int): Listing depth of the pages
+            batch_size (Optional[int]): URLs per round trip
+
+        Returns:
+            int: Number of URLs newly enqueued
+        """
+        if page > self.max_pages:
+            return 0
+        batch_size = batch_size or config.get('distributed.enqueue_batch_size', 1000)
+        urls = iter(urls)
+        added = 0
+        while True:
+            batch = list(itertools.islice(urls, batch_size))
+            if not batch:
+                return added
+            pipeline = self.client.pipeline(transaction=False)
+            for url in batch:
+                pipeline.sadd(self.seen_key, url)
+            new_urls = [url for url, is_new in zip(batch, pipeline.execute()) if is_new]
+            if new_urls:
+                self.client.lpush(self.queue_key, *(json.dumps({'url': url, 'page': page}) for url in new_urls))
+                added += len(new_urls)
+
+    def heartbeat(self, worker_id: str, lease_seconds: float):
+        self.client.sadd(self.workers_key, worker_id)
+        self.client.set(self._heartbeat_key(worker_id), str(time.time()), px=int(lease_seconds * 1000))
+
+    def _result_field(self, url: str, page: int) -> str:
+        return f'{page}:{url}'
+
+    def claim(self, worker_id: str) -> Optional[str]:
+        """
+        Move the next unvisited task onto this worker's processing list
+
+        Tasks of URLs that were completed meanwhile (e.g. reclaimed from a
+        slow worker that finished anyway) are dropped.
+
+        Args:
+            worker_id (str): Claiming worker
+
+        Returns:
+            Optional[str]: Task JSON, None if the queue is empty
+        """
+        processing_key = self._processing_key(worker_id)
+        while True:
+            task = _text(self.client.rpoplpush(self.queue_key, processing_key))
+            if task is None or not self.client.sismember(self.visited_key, json.loads(task)['url']):
+                return task
+            self.client.lrem(processing_key, 1, task)
+            metrics.inc('crawl_duplicates_dropped')
+
+    def defer(self, worker_id: str, task: str):
+        # Re-queue at the back of the line, then drop the claim
+        self.client.lpush(self.queue_key, task)
+        self.client.lrem(self._processing_key(worker_id), 1, task)
+
+    def retry(self, worker_id: str, task: str) -> bool:
+        """
+        Re-queue a task whose fetch failed, or give it up after max_attempts
+
+        Args:
+            worker_id (str): Worker that claimed the task
+            task (str): Task JSON from claim
+
+        Returns:
+            bool: True if the task was re-queued, False if it was given up
+        """
+        item = json.loads(task)
+        attempts = item.get('attempts', 0) + 1
+        if attempts >= self.max_attempts:
+            logger.error("Giving up %s after %d attempts | التخلي عن %s بعد %d محاولات",
+                         item['url'], attempts, item['url'], attempts)
+            metrics.inc('crawl_pages_given_up')
+            self.complete(worker_id, task, None)
+            return False
+
+        # Back of the line, so other hosts go first while this one recovers
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.lpush(self.queue_key, json.dumps(dict(item, attempts=attempts)))
+        pipeline.lrem(self._processing_key(worker_id), 1, task)
+        pipeline.execute()
+        metrics.inc('crawl_retries')
+        return True
+
+    def complete(self, worker_id: str, task: str, result: Optional[Dict[str, Any]]) -> bool:
+        """
+        Record a processed task and release its claim in one transaction
+
+        Results are stored in a hash keyed by (url, page) with HSETNX, so a
+        page processed twice (its lease expired while it was still running)
+        is stored once.
+
+        Args:
+            worker_id (str): Worker that processed the task
+            task (str): Task JSON from claim
+            result (Optional[Dict[str, Any]]): Scraped page, None if it had no
+                                               tools or was given up
+
+        Returns:
+            bool: False if another worker had already completed the URL
+        """
+        item = json.loads(task)
+        processing_key = self._processing_key(worker_id)
+        if self.client.sismember(self.visited_key, item['url']):
+            self.client.lrem(processing_key, 1, task)
+            metrics.inc('crawl_duplicates_dropped')
+            return False
+
+        pipeline = self.client.pipeline(transaction=True)
+        if result is not None:
+            pipeline.hsetnx(self.results_key, self._result_field(item['url'], item['page']),
+                            json.dumps(result, ensure_ascii=False))
+        pipeline.sadd(self.visited_key, item['url'])
+        pipeline.lrem(processing_key, 1, task)
+        pipeline.execute()
+        return True
+
+    def acquire_host(self, url: str, worker_id: str, delay_seconds: float) -> bool:
+        """
+        Reserve a host for one request, enforcing a minimum delay between requests
+
+        Args:
+            url (str): Page URL
+            worker_id (str): Requesting worker
+            delay_seconds (float): Minimum delay between requests to the host
+
+        Returns:
+            bool: True if the request may proceed now
+        """
+        if delay_seconds <= 0:
+            return True
+        key = f'{self.prefix}:host:{domain_of(url)}'
+        return bool(self.client.set(key, worker_id, nx=True, px=int(delay_seconds * 1000)))
+
+    def reclaim_expired(self, worker_id: str) -> int:
+        """
+        Move in-flight URLs of workers whose lease expired back onto the queue
+
+        Args:
+            worker_id (str): Worker performing the reclaim
+
+        Returns:
+            int: Number of reclaimed URLs
+        """
+        reclaimed = 0
+        for other in map(_text, self.client.smembers(self.workers_key)):
+            if other == worker_id or self.client.exists(self._heartbeat_key(other)):
+                continue
+            while self.client.rpoplpush(self._processing_key(other), self.queue_key) is not None:
+                reclaimed += 1
+            self.client.srem(self.workers_key, other)
+        if reclaimed:
+            metrics.inc('crawl_leases_reclaimed', reclaimed)
+            logger.warning("Reclaimed %d URLs from expired workers | تمت استعادة %d روابط من عمال منتهية المهلة",
+                           reclaimed, reclaimed)
+        return reclaimed
+
+    def in_flight(self) -> int:
+        return sum(
+            self.client.llen(self._processing_key(_text(worker)))
+            for worker in self.client.smembers(self.workers_key)
+        )
+
+    def is_drained(self) -> bool:
+        return self.client.llen(self.queue_key) == 0 and self.in_flight() == 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Capture the frontier, seen and visited sets and results in one transaction
+
+        URLs claimed by workers but not completed are put back on the queue,
+        so they are crawled again after a restore.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable frontier state
+        """
+        workers = [_text(worker) for worker in self.client.smembers(self.workers_key)]
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.lrange(self.queue_key, 0, -1)
+        for worker in workers:
+            pipeline.lrange(self._processing_key(worker), 0, -1)
+        pipeline.smembers(self.seen_key)
+        pipeline.smembers(self.visited_key)
+        pipeline.hvals(self.results_key)
+        queue, *claimed, seen, visited, results = pipeline.execute()
+
+        # The queue is consumed from its tail: claimed URLs go first again
+        return {
+            'max_pages': self.max_pages,
+            'queue': [_text(task) for task in queue] + [_text(task) for tasks in claimed for task in tasks],
+            'seen': sorted(map(_text, seen)),
+            'visited': sorted(map(_text, visited)),
+            'results': [_text(result) for result in results]
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        """
+        Replace the frontier of this job with a snapshot
+
+        Args:
+            state (Dict[str, Any]): State from snapshot()
+        """
+        workers = [_text(worker) for worker in self.client.smembers(self.workers_key)]
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.delete(self.queue_key, self.seen_key, self.visited_key, self.results_key, self.workers_key,
+                        *(self._processing_key(worker) for worker in workers))
+        if state['queue']:
+            pipeline.rpush(self.queue_key, *state['queue'])
+        if state['seen']:
+            pipeline.sadd(self.seen_key, *state['seen'])
+        if state['visited']:
+            pipeline.sadd(self.visited_key, *state['visited'])
+        if state['results']:
+            pages = {}
+            for raw in state['results']:
+                page = json.loads(raw)
+                pages.setdefault(self._result_field(page['url'], page['page']), raw)
+            pipeline.hset(self.results_key, mapping=pages)
+        pipeline.execute()
+        self.max_pages = state.get('max_pages', self.max_pages)
+
+    def merged_results(self) -> ToolTable:
+        """
+        Merge the pages scraped by all workers into one table
+
+        Returns:
+            ToolTable: Pages ordered by URL discovery depth, one per (url, page)
+        """
+        pages = {}
+        for raw in self.client.hvals(self.results_key):
+            page = json.loads(_text(raw))
+            pages.setdefault((page['page'], page['url']), page)
+        return ToolTable.from_results(pages[key] for key in sorted(pages))
+
+
+class CrawlWorker:
+    """
+    One crawl worker pulling URLs from a shared frontier
+    """
+
+    def __init__(self,
+                 frontier: CrawlFrontier,
+                 scraper: Optional[WebScraper] = None,
+                 worker_id: Optional[str] = None,
+                 lease_seconds: Optional[float] = None,
+                 host_delay: Optional[float] = None):
+        """
+        Initialize the worker
+
+        Args:
+            frontier (CrawlFrontier): Shared frontier
+            scraper (Optional[WebScraper]): Scraper used to fetch and extract pages
+            worker_id (Optional[str]): Unique worker id
+            lease_seconds (Optional[float]): Heartbeat TTL after which claims are reclaimed
+            host_delay (Optional[float]): Minimum delay between requests to one host
+        """
+        self.frontier = frontier
+        self.scraper = scraper or WebScraper()
+        self.worker_id = worker_id or uuid.uuid4().hex[:12]
+        self.lease_seconds = lease_seconds or config.get('distributed.lease_seconds', 60)
+        self.host_delay = self.scraper.wait_time if host_delay is None else host_delay
+        self.poll_interval = config.get('distributed.poll_interval', 0.2)
+
+    def _process(self, task: str, use_proxy: bool) -> Optional[Dict[str, Any]]:
+        # Fetch errors propagate, so the caller can retry the task
+        item = json.loads(task)
+        tools, next_url = self.scraper.scrape_page(item['url'], use_proxy, item['page'])
+
+        if next_url:
+            self.frontier.enqueue(next_url, item['page'] + 1)
+        if not tools:
+            logger.warning("No tools found on page %d | لم يتم العثور على أدوات في الصفحة %d",
+                           item['page'], item['page'])
+            return None
+
+        metrics.inc('tools_extracted', len(tools))
+        return {
+            'url': item['url'],
+            'page': item['page'],
+            'language': self.scraper.language,
+            'tools': tools,
+            'worker': self.worker_id
+        }
+
+    def run(self, use_proxy: bool = False, idle_timeout: Optional[float] = None) -> int:
+        """
+        Process URLs until the frontier is drained
+
+        Args:
+            use_proxy (bool): Whether to use proxy servers
+            idle_timeout (Optional[float]): Give up after this long without work
+
+        Returns:
+            int: Number of pages processed by this worker
+        """
+        idle_timeout = idle_timeout or config.get('distributed.idle_timeout', 30)
+        processed = 0
+        idle_since = time.monotonic()
+
+        self.frontier.heartbeat(self.worker_id, self.lease_seconds)
+        stopped = threading.Event()
+        keeper = threading.Thread(target=self._keep_lease, args=(stopped,),
+                                  name=f'lease-{self.worker_id}', daemon=True)
+        keeper.start()
+        try:
+            while True:
+                task = self.frontier.claim(self.worker_id)
+
+                if task is None:
+                    self.frontier.reclaim_expired(self.worker_id)
+                    if self.frontier.is_drained() or time.monotonic() - idle_since > idle_timeout:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+
+                if not self.frontier.acquire_host(json.loads(task)['url'], self.worker_id, self.host_delay):
+                    # Host is rate limited: let other hosts go first
+                    self.frontier.defer(self.worker_id, task)
+                    time.sleep(self.poll_interval)
+                    continue
+
+                try:
+                    result = self._process(task, use_proxy)
+                except requests.exceptions.RequestException as e:
+                    metrics.inc('fetch_errors')
+                    logger.error("Scraping error: %s | خطأ في استخراج المحتوى: %s", e, e)
+                    self.frontier.retry(self.worker_id, task)
+                else:
+                    self.frontier.complete(self.worker_id, task, result)
+                processed += 1
+                idle_since = time.monotonic()
+        finally:
+            stopped.set()
+            keeper.join()
+
+        return processed
+
+    def _keep_lease(self, stopped: threading.Event):
+        # Renew well before expiry so slow fetches and renders keep their claims
+        while not stopped.wait(self.lease_seconds / 3):
+            try:
+                self.frontier.heartbeat(self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning("Lease renewal failed: %s | فشل تجديد المهلة: %s", e, e)
+
+
+def frontier_checkpoint_path(job: str) -> str:
+    return os.path.join(checkpoint_dir('frontier'), f'{job}.json')
+
+
+def save_frontier_checkpoint(frontier: CrawlFrontier, path: str):
+    """
+    Atomically write a frontier snapshot
+
+    Args:
+        frontier (CrawlFrontier): Frontier to snapshot
+        path (str): Checkpoint file
+    """
+    with metrics.timer('checkpoint'):
+        atomic_write_json(path, frontier.snapshot())
+    metrics.inc('checkpoints_saved')
+
+
+def seed_from_discovery(frontier: CrawlFrontier,
+                        site_urls: Iterable[str],
+                        feeds: Iterable[str] = (),
+                        skip_unchanged: bool = True) -> int:
+    """
+    Enqueue every page listed in the sites' sitemaps and the given feeds
+
+    Args:
+        frontier (CrawlFrontier): Frontier to seed
+        site_urls (Iterable[str]): Sites whose robots.txt sitemaps are read
+        feeds (Iterable[str]): Extra sitemap, RSS or Atom URLs
+        skip_unchanged (bool): Skip pages scraped since their lastmod
+                               (per the incremental fingerprint store)
+
+    Returns:
+        int: Number of URLs newly enqueued
+    """
+    fingerprints = FingerprintStore() if skip_unchanged else None
+    discovered = URLDiscoverer().discover(site_urls, feeds, fingerprints)
+    added = frontier.enqueue_many(entry.url for entry in discovered)
+    logger.info("Enqueued %d discovered URLs | تمت إضافة %d رابط مكتشف", added, added)
+    return added
+
+
+def crawl(start_urls: Iterable[str],
+          workers: int = 4,
+          client=None,
+          job: Optional[str] = None,
+          max_pages: int = 10,
+          use_proxy: bool = False,
+          language: Optional[str] = None,
+          discover: bool = False,
+          checkpoint: Optional[bool] = None,
+          resume: bool = False) -> ToolTable:
+    """
+    Run a distributed crawl with worker threads in this process
+
+    Workers on other processes or nodes can join the same job with
+    ``python -m src.core.distributed worker --job <job>``. While workers run,
+    the frontier is checkpointed every checkpoint.interval_seconds; the
+    checkpoint is removed once the crawl completes.
+
+    Args:
+        start_urls (Iterable[str]): Seed URLs
+        workers (int): Number of worker threads
+        client: Redis client (defaults to an in-process stand-in)
+        job (Optional[str]): Crawl job name
+        max_pages (int): Maximum listing depth followed from each seed
+        use_proxy (bool): Whether to use proxy servers
+        language (Optional[str]): Scraping language
+        discover (bool): Also enqueue the pages listed in the seeds' sitemaps
+        checkpoint (Optional[bool]): Checkpoint the frontier (defaults to checkpoint.enabled)
+        resume (bool): Restore the job's last frontier checkpoint before crawling
+
+    Returns:
+        ToolTable: Merged results of all workers
+
+    Raises:
+        FileNotFoundError: If resume is set and the job has no checkpoint
+    """
+    start_urls = list(start_urls)
+    job = job or uuid.uuid4().hex[:8]
+    frontier = CrawlFrontier(client or InMemoryRedis(), job, max_pages)
+    checkpoint_path = frontier_checkpoint_path(job)
+
+    if resume:
+        state = read_json(checkpoint_path)
+        if state is None:
+            raise FileNotFoundError(f"No checkpoint found for job {job}")
+        frontier.restore(state)
+        logger.info("Resuming crawl %s with %d queued URLs | استئناف الزحف %s مع %d رابط في الانتظار",
+                    job, len(state['queue']), job, len(state['queue']))
+    frontier.enqueue_many(start_urls)
+    if discover:
+        seed_from_discovery(frontier, start_urls)
+
+    threads = [
+        threading.Thread(
+            target=CrawlWorker(frontier, WebScraper(language=language)).run,
+            kwargs={'use_proxy': use_proxy},
+            name=f'crawl-worker-{i}',
+            daemon=True
+        )
+        for i in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    if checkpoint is None:
+        checkpoint = config.get('checkpoint.enabled', True)
+    interval = config.get('checkpoint.interval_seconds', 60)
+    saved_at = time.monotonic()
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(interval)
+            if checkpoint and time.monotonic() - saved_at >= interval:
+                save_frontier_checkpoint(frontier, checkpoint_path)
+                saved_at = time.monotonic()
+
+    if checkpoint and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return frontier.merged_results()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Distributed crawl worker')
+    parser.add_argument('command', choices=['seed', 'discover', 'worker', 'merge', 'checkpoint', 'restore'])
+    parser.add_argument('--job', default='default', help='Crawl job name')
+    parser.add_argument('--redis-url', default=None, help='Redis URL')
+    parser.add_argument('--max-pages', type=int, default=10, help='Maximum listing depth')
+    parser.add_argument('--url', action='append', default=[], help='Seed URL (repeatable)')
+    parser.add_argument('--feed', action='append', default=[], help='Sitemap or RSS/Atom feed URL for discover (repeatable)')
+    parser.add_argument('--all', action='store_true', help='Discover: also enqueue pages unchanged since their lastmod')
+    parser.add_argument('--use-proxy', action='store_true')
+    parser.add_argument('--format', default='json', help='Export format for merge')
+    args = parser.parse_args(argv)
+
+    frontier = CrawlFrontier(connect(args.redis_url), args.job, args.max_pages)
+    if args.command == 'seed':
+        print(frontier.enqueue_many(args.url))
+    elif args.command == 'discover':
+        print(seed_from_discovery(frontier, args.url, args.feed, skip_unchanged=not args.all))
+    elif args.command == 'checkpoint':
+        save_frontier_checkpoint(frontier, frontier_checkpoint_path(args.job))
+    elif args.command == 'restore':
+        state = read_json(frontier_checkpoint_path(args.job))
+        if state is None:
+            parser.error(f'no checkpoint found for job {args.job}')
+        frontier.restore(state)
+    elif args.command == 'worker':
+        print(CrawlWorker(frontier).run(use_proxy=args.use_proxy))
+    else:
+        print(WebScraper().export_results(frontier.merged_results(), format=args.format))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+# Relative model paths are resolved against the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+EMBEDDING_BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+
+# Mixed Arabic/English sentences used by the accuracy check
+SAMPLE_TEXTS = (
+    'An AI writing assistant that drafts blog posts and marketing copy.',
+    'Generate photorealistic images from a text prompt in seconds.',
+    'Transcribe meetings and produce searchable notes with action items.',
+    'A code completion tool that suggests whole functions inside the editor.',
+    'أداة ذكاء اصطناعي لكتابة المقالات وتدقيقها لغوياً.',
+    'حوّل النص إلى كلام بأصوات طبيعية بعدة لغات.',
+    'منصة لتحليل البيانات وإنشاء لوحات المعلومات تلقائياً.',
+    'روبوت محادثة يجيب عن أسئلة العملاء على مدار الساعة.'
+)
+
+
+def cpu_limit() -> int:
+    """
+    Number of CPUs this process may use, honoring container (cgroup) quotas
+
+    Returns:
+        int: Usable CPU count (at least 1)
+    """
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        available = os.cpu_count() or 1
+
+    quota = None
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            value, period = f.read().split()[:2]
+            if value != 'max':
+                quota = int(value) / int(period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+                value = int(f.read())
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+                period = int(f.read())
+            if value > 0:
+                quota = value / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        available = min(available, max(1, int(quota)))
+    return max(1, available)
+
+
+def embedding_threads() -> int:
+    """
+    Intra-op thread count for embedding inference
+
+    Returns:
+        int: analyzer.embedding_threads, or the container CPU limit when 0
+    """
+    return config.analyzer.embedding_threads or cpu_limit()
+
+
+def _export_dir(model_name: str) -> str:
+    path = config.get('analyzer.embedding_cache_dir', 'models/embeddings')
+    path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+    return os.path.join(path, re.sub(r'[^\w.-]+', '__', model_name))
+
+
+def _load_torch(model_name: str, quantize: bool):
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    torch.set_num_threads(embedding_threads())
+    model = SentenceTransformer(model_name, device='cpu')
+    if quantize:
+        # Dynamic int8 quantization of all linear layers; activations stay fp32
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def export_onnx(model_name: str, quantize: bool = False) -> str:
+    """
+    Export a SentenceTransformer model to ONNX, optionally int8-quantized
+
+    The transformer, its tokenizer and the pooling settings are written to
+    analyzer.embedding_cache_dir once; later loads only need onnxruntime.
+
+    Args:
+        model_name (str): SentenceTransformer model name or path
+        quantize (bool): Also write a dynamically quantized int8 model
+
+    Returns:
+        str: Path of the (quantized) ONNX model
+    """
+    export_dir = _export_dir(model_name)
+    model_path = os.path.join(export_dir, 'model.onnx')
+    quantized_path = os.path.join(export_dir, 'model-int8.onnx')
+
+    if not os.path.exists(model_path):
+        import torch
+        from sentence_transformers import SentenceTransformer
+        from sentence_transformers.models import Normalize, Pooling
+
+        logger.info("Exporting %s to ONNX | تصدير نموذج التضمين إلى ONNX: %s", model_name, model_name)
+        os.makedirs(export_dir, exist_ok=True)
+        st_model = SentenceTransformer(model_name, device='cpu')
+        transformer = st_model[0].auto_model.eval()
+        tokenizer = st_model.tokenizer
+        pooling = next(module for module in st_model if isinstance(module, Pooling))
+
+        sample = tokenizer(['export sample'], return_tensors='pt')
+        input_names = [name for name in tokenizer.model_input_names if name in sample]
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+        dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                ({name: sample[name] for name in input_names},),
+                model_path,
+                input_names=input_names,
+                output_names=['last_hidden_state'],
+                dynamic_axes=dynamic_axes,
+                opset_version=14
+            )
+        tokenizer.save_pretrained(export_dir)
+        with open(os.path.join(export_dir, 'pooling.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'mode': 'cls' if pooling.pooling_mode_cls_token else 'mean',
+                'normalize': any(isinstance(module, Normalize) for module in st_model),
+                'max_seq_length': st_model.max_seq_length,
+                'input_names': input_names
+            }, f)
+
+    if quantize and not os.path.exists(quantized_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+
+    return quantized_path if quantize else model_path
+
+
+class OnnxEncoder:
+    """
+    SentenceTransformer-compatible encoder running an exported model on onnxruntime
+    """
+
+    def __init__(self, model_name: str, quantize: bool = False):
+        """
+        Load (exporting first if needed) the ONNX model
+
+        Args:
+            model_name (str): SentenceTransformer model name or path
+            quantize (bool): Use the int8 dynamically quantized model
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = export_onnx(model_name, quantize)
+        export_dir = os.path.dirname(model_path)
+        with open(os.path.join(export_dir, 'pooling.json'), encoding='utf-8') as f:
+            pooling = json.load(f)
+
+        self.pooling_mode = pooling['mode']
+        self.normalize = pooling['normalize']
+        self.max_seq_length = pooling['max_seq_length']
+        self.input_names = pooling['input_names']
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = embedding_threads()
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self._dimension = None
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if self._dimension is None:
+            self._dimension = int(self.encode(['dimension']).shape[1])
+        return self._dimension
+
+    def encode(self,
+               sentences: Union[str, Sequence[str]],
+               batch_size: int = 32,
+               **kwargs) -> np.ndarray:
+        """
+        Embed sentences
+
+        Args:
+            sentences (Union[str, Sequence[str]]): Sentence or sentences
+            batch_size (int): Sentences per inference call
+
+        Returns:
+            np.ndarray: Embeddings (1-D for a single sentence)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        batches = []
+
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+
+            if self.pooling_mode == 'cls':
+                pooled = hidden[:, 0]
+            else:
+                mask = feeds['attention_mask'][..., None].astype(hidden.dtype)
+                pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        embeddings = np.concatenate(batches) if batches else np.empty((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+
+def _load(model_name: str, backend: str):
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unsupported embedding backend: {backend}")
+    if backend.startswith('onnx'):
+        return OnnxEncoder(model_name, quantize=backend == 'onnx-int8')
+    return _load_torch(model_name, quantize=backend == 'torch-int8')
+
+
+_models: Dict[Tuple[str, str], Any] = {}
+_models_lock = threading.Lock()
+
+
+def load_embedding_model(model_name: Optional[str] = None, backend: Optional[str] = None):
+    """
+    Load a shared embedding model on the configured backend
+
+    ONNX backends fall back to PyTorch if onnxruntime is not installed.
+
+    Args:
+        model_name (Optional[str]): Model name (defaults to analyzer.embedding_model)
+        backend (Optional[str]): torch, torch-int8, onnx or onnx-int8
+                                 (defaults to analyzer.embedding_backend)
+
+    Returns:
+        Encoder with a SentenceTransformer-style encode()
+    """
+    model_name = model_name or config.analyzer.embedding_model
+    backend = backend or config.analyzer.embedding_backend
+
+    with _models_lock:
+        model = _models.get((model_name, backend))
+        if model is None:
+            try:
+                model = _load(model_name, backend)
+            except ImportError as e:
+                if not backend.startswith('onnx'):
+                    raise
+                logger.warning("ONNX backend unavailable (%s), using torch | الواجهة ONNX غير متاحة: %s", e, e)
+                model = _load(model_name, 'torch')
+            _models[(model_name, backend)] = model
+        return model
+
+
+def token_lengths(encoder: Any, texts: Sequence[str]) -> np.ndarray:
+    """
+    Token count of each text as the encoder will see it
+
+    Args:
+        encoder (Any): Encoder, using its tokenizer when it has one
+        texts (Sequence[str]): Texts
+
+    Returns:
+        np.ndarray: Token counts, capped at the encoder's max sequence length
+    """
+    max_length = getattr(encoder, 'max_seq_length', None) or 512
+    tokenizer = getattr(encoder, 'tokenizer', None)
+    if tokenizer is not None:
+        input_ids = tokenizer(list(texts), truncation=True, max_length=max_length)['input_ids']
+        return np.fromiter((len(ids) for ids in input_ids), dtype=np.int64, count=len(texts))
+    # Rough estimate (about 4 characters per token) plus special tokens
+    lengths = np.fromiter((len(text) // 4 + 2 for text in texts), dtype=np.int64, count=len(texts))
+    return np.minimum(lengths, max_length)
+
+
+def encode_batched(encoder: Any,
+                   texts: Sequence[str],
+                   token_budget: Optional[int] = None,
+                   max_batch_size: Optional[int] = None) -> np.ndarray:
+    """
+    Encode texts in length-sorted batches sized to a padded-token budget
+
+    Texts are sorted by token length so each batch pads to a similar length,
+    and each batch holds as many texts as fit ``batch size x longest text <=
+    token_budget``: short sentences go in large batches, long ones in small
+    batches. Embeddings are returned in the original order.
+
+    Args:
+        encoder (Any): Encoder with a SentenceTransformer-style encode()
+        texts (Sequence[str]): Texts to embed
+        token_budget (Optional[int]): Padded tokens per batch
+                                      (defaults to analyzer.encoding.token_budget)
+        max_batch_size (Optional[int]): Upper bound on texts per batch
+
+    Returns:
+        np.ndarray: Embeddings, one row per input text
+    """
+    token_budget = token_budget or config.get('analyzer.encoding.token_budget', 16384)
+    max_batch_size = max_batch_size or config.get('analyzer.encoding.max_batch_size', 128)
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    lengths = token_lengths(encoder, texts)
+    order = np.argsort(lengths, kind='stable')
+    result = None
+    start = 0
+
+    with metrics.timer('embed'):
+        while start < len(order):
+            # Sorted ascending, so the last text of a batch is its longest
+            end = start + 1
+            while (end < len(order) and end - start < max_batch_size
+                   and (end - start + 1) * lengths[order[end]] <= token_budget):
+                end += 1
+
+            indices = order[start:end]
+            embeddings = np.asarray(
+                encoder.encode([texts[i] for i in indices], batch_size=len(indices)),
+                dtype=np.float32
+            )
+            if result is None:
+                result = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+            result[indices] = embeddings
+            metrics.inc('embedding_padded_tokens', int(len(indices) * lengths[indices[-1]]))
+            start = end
+
+    return result
+
+
+def compare_backends(backend: str,
+                     model_name: Optional[str] = None,
+                     texts: Sequence[str] = SAMPLE_TEXTS,
+                     repeat: int = 3) -> Dict[str, Any]:
+    """
+    Measure a backend's accuracy and speed against the fp32 PyTorch baseline
+
+    Args:
+        backend (str): Candidate backend
+        model_name (Optional[str]): Model name (defaults to analyzer.embedding_model)
+        texts (Sequence[str]): Evaluation sentences
+        repeat (int): Timed encode passes per backend
+
+    Returns:
+        Dict[str, Any]: Cosine similarity to the baseline (mean/min) and
+                        per-sentence encode times with the speedup
+    """
+    model_name = model_name or config.analyzer.embedding_model
+    texts = list(texts)
+
+    def run(model) -> Tuple[np.ndarray, float]:
+        embeddings = np.asarray(model.encode(texts), dtype=np.float32)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            model.encode(texts)
+        return embeddings, (time.perf_counter() - started) / (repeat * len(texts))
+
+    baseline, baseline_time = run(load_embedding_model(model_name, 'torch'))
+    candidate, candidate_time = run(load_embedding_model(model_name, backend))
+
+    baseline = baseline / np.linalg.norm(baseline, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosine = (baseline * candidate).sum(axis=1)
+
+    return {
+        'model': model_name,
+        'backend': backend,
+        'threads': embedding_threads(),
+        'cosine_mean': float(cosine.mean()),
+        'cosine_min': float(cosine.min()),
+        'baseline_ms_per_text': baseline_time * 1000,
+        'backend_ms_per_text': candidate_time * 1000,
+        'speedup': baseline_time / candidate_time if candidate_time else float('inf')
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Compare an embedding backend with the fp32 baseline')
+    parser.add_argument('--backend', default=None, choices=EMBEDDING_BACKENDS)
+    parser.add_argument('--model', default=None)
+    args = parser.parse_args(argv)
+    report = compare_backends(args.backend or config.analyzer.embedding_backend, args.model)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from bs4 import BeautifulSoup, Comment
+
+from src.utils.config import config
+from src.utils.logging import logger
+
+# Relative store paths are resolved against the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+# Default location of the per-URL fingerprint store
+DEFAULT_STORE_PATH = os.path.join(PROJECT_ROOT, 'data', 'cache', 'fingerprints.json')
+
+# Elements whose text never counts towards the main-content fingerprint
+_SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+
+# Tool fields compared when deciding whether a tool changed
+_COMPARED_FIELDS = ('description', 'category', 'rating')
+
+
+def raw_fingerprint(body: bytes) -> str:
+    """
+    Hash the raw response body
+
+    Args:
+        body (bytes): Response body
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha256(body).hexdigest()
+
+
+def content_fingerprint(soup: BeautifulSoup) -> str:
+    """
+    Hash the normalized main content of a page
+
+    Scripts, styles and comments are ignored and whitespace is collapsed, so
+    rotating ads, nonces and markup-only changes do not count as changes.
+
+    Args:
+        soup (BeautifulSoup): Parsed page
+
+    Returns:
+        str: Hex digest
+    """
+    main = soup.find('main') or soup.find(attrs={'role': 'main'}) or soup.body or soup
+    digest = hashlib.sha256()
+    for text in main.find_all(string=True):
+        if isinstance(text, Comment) or text.parent.name in _SKIPPED_TAGS:
+            continue
+        normalized = ' '.join(text.split())
+        if normalized:
+            digest.update(normalized.encode('utf-8'))
+            digest.update(b'\n')
+    return digest.hexdigest()
+
+
+@dataclass
+class ScrapeDiff:
+    """
+    Tools added, changed and removed since the previous incremental run
+
+    Tools are keyed by name across the whole crawl, so a tool that moved to
+    another listing page is not reported as removed and added. Pages are
+    recorded as they are reached and the diff is computed by ``finish``
+    against everything the previous run of the same start URL stored,
+    including pages this run never reached. When the run stopped on an
+    error, the tools of unreached pages are carried over instead of being
+    reported as removed, since their pages may well still exist.
+    """
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged_pages: int = 0
+    changed_pages: int = 0
+    # Tools of this run by name (first occurrence wins) and the pages reached
+    tools: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
+    pages: Set[str] = field(default_factory=set, repr=False)
+
+    def record_page(self, url: str, tools: List[Dict[str, str]], changed: bool = True):
+        """
+        Record the tools of one reached page
+
+        Args:
+            url (str): Page URL
+            tools (List[Dict[str, str]]): Tools extracted (or reused) for the page
+            changed (bool): Whether the page content changed since the last run
+        """
+        if changed:
+            self.changed_pages += 1
+        else:
+            self.unchanged_pages += 1
+        self.pages.add(url)
+        for tool in tools:
+            self.tools.setdefault(tool['name'], dict(tool, url=url))
+
+    def finish(self, previous_tools: Iterable[Dict[str, Any]], complete: bool = True):
+        """
+        Compare this run's tools against the previous run's
+
+        Args:
+            previous_tools (Iterable[Dict[str, Any]]): Tools (with url) stored
+                                                       by the previous run
+            complete (bool): Whether the crawl ran to its end rather than
+                             stopping on a fetch error
+        """
+        old_by_name: Dict[str, Dict[str, Any]] = {}
+        for tool in previous_tools:
+            old_by_name.setdefault(tool['name'], tool)
+
+        for name, tool in self.tools.items():
+            previous = old_by_name.get(name)
+            if previous is None:
+                self.added.append(tool)
+            elif any(previous.get(key) != tool.get(key) for key in _COMPARED_FIELDS):
+                self.changed.append(tool)
+
+        for name, tool in old_by_name.items():
+            if name not in self.tools and (complete or tool.get('url') in self.pages):
+                self.removed.append(tool)
+
+    def changed_records(self) -> List[Dict[str, Any]]:
+        """
+        Tools that need downstream re-analysis
+
+        Returns:
+            List[Dict[str, Any]]: Added and changed tools
+        """
+        return self.added + self.changed
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'added': len(self.added),
+            'changed': len(self.changed),
+            'removed': len(self.removed),
+            'unchanged_pages': self.unchanged_pages,
+            'changed_pages': self.changed_pages
+        }
+
+
+class FingerprintStore:
+    """
+    Persistent per-URL content fingerprints and last extracted tools
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Load the store from disk
+
+        Args:
+            path (Optional[str]): JSON file path
+        """
+        self.path = path or config.get('scraper.incremental.store_path') or DEFAULT_STORE_PATH
+        if not os.path.isabs(self.path):
+            self.path = os.path.join(PROJECT_ROOT, self.path)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read fingerprint store %s: %s | تعذر قراءة مخزن البصمات: %s",
+                           self.path, e, e)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(url)
+
+    def crawl_pages(self, start_url: str) -> List[str]:
+        """
+        List the pages last reached by crawls starting at start_url
+
+        Args:
+            start_url (str): Crawl start URL
+
+        Returns:
+            List[str]: Page URLs
+        """
+        return [url for url, entry in self._entries.items() if entry.get('start_url') == start_url]
+
+    def crawl_tools(self, start_url: str) -> List[Dict[str, Any]]:
+        """
+        Collect the stored tools of every page of a crawl
+
+        Args:
+            start_url (str): Crawl start URL
+
+        Returns:
+            List[Dict[str, Any]]: Tools with their page url
+        """
+        return [dict(tool, url=url) for url in self.crawl_pages(start_url)
+                for tool in self._entries[url]['tools']]
+
+    def forget(self, url: str):
+        """
+        Drop a page that its crawl no longer reaches
+
+        Args:
+            url (str): Page URL
+        """
+        if self._entries.pop(url, None) is not None:
+            self._dirty = True
+
+    def is_fresh(self, url: str, lastmod: Optional[float]) -> bool:
+        """
+        Check whether a page was scraped after its advertised modification time
+
+        Args:
+            url (str): Page URL
+            lastmod (Optional[float]): Unix timestamp from a sitemap or feed
+
+        Returns:
+            bool: True if the stored extraction is still current
+        """
+        entry = self._entries.get(url)
+        return entry is not None and lastmod is not None and entry.get('scraped_at', 0) >= lastmod
+
+    def put(self,
+            url: str,
+            raw_hash: str,
+            content_hash: str,
+            next_url: Optional[str],
+            tools: List[Dict[str, str]],
+            rendered: bool = False,
+            start_url: Optional[str] = None):
+        """
+        Record the latest fingerprints and extraction of a page
+
+        Args:
+            url (str): Page URL
+            raw_hash (str): Raw body digest
+            content_hash (str): Normalized main-content digest
+            next_url (Optional[str]): Next listing page link
+            tools (List[Dict[str, str]]): Extracted tools
+            rendered (bool): Whether the tools came from a browser-rendered DOM,
+                             which the static fingerprints do not cover
+            start_url (Optional[str]): Start URL of the crawl that reached the page
+        """
+        self._entries[url] = {
+            'raw_hash': raw_hash,
+            'content_hash': content_hash,
+            'next_url': next_url,
+            'tools': tools,
+            'rendered': rendered,
+            'start_url': start_url,
+            'scraped_at': time.time()
+        }
+        self._dirty = True
+
+    def touch(self, url: str, raw_hash: str, start_url: Optional[str] = None):
+        """
+        Mark an unchanged page as seen with its latest raw digest
+
+        Args:
+            url (str): Page URL
+            raw_hash (str): Raw body digest
+            start_url (Optional[str]): Start URL of the crawl that reached the page
+        """
+        entry = self._entries[url]
+        entry['raw_hash'] = raw_hash
+        entry['start_url'] = start_url
+        entry['scraped_at'] = time.time()
+        self._dirty = True
+
+    def save(self):
+        """
+        Atomically write the store back to disk
+        """
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
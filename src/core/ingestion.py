@@ -0,0 +1,287 @@
+import io
+import os
+import json
+import hashlib
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from src.utils.config import config
+
+# File extensions mapped to ingestion readers
+FILE_KINDS = {
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.txt': 'tsv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.json': 'json',
+    '.xlsx': 'excel',
+    '.xlsm': 'excel'
+}
+
+# Bytes read per step when streaming a JSON array
+_JSON_READ_SIZE = 64 * 1024
+
+Source = Union[str, BinaryIO]
+
+
+def detect_file_kind(filename: str) -> str:
+    """
+    Map a file name to an ingestion reader
+
+    Args:
+        filename (str): Uploaded file name
+
+    Returns:
+        str: csv, tsv, jsonl, json or excel
+    """
+    return FILE_KINDS.get(os.path.splitext(filename)[1].lower(), 'csv')
+
+
+def _rewind(source: Source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _iter_json_array(source: Source) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects of a top-level JSON array without loading the whole file
+
+    Args:
+        source (Source): Path or binary file object
+
+    Yields:
+        Dict[str, Any]: One array element at a time
+
+    Raises:
+        ValueError: If the document is not a top-level array
+    """
+    handle = open(source, 'rb') if isinstance(source, str) else source
+    decoder = json.JSONDecoder()
+    reader = io.TextIOWrapper(handle, encoding='utf-8-sig')
+    buffer = ''
+    started = False
+    eof = False
+
+    try:
+        while True:
+            # Skip separators between elements
+            stripped = buffer.lstrip()
+            if not started and stripped.startswith('['):
+                stripped = stripped[1:]
+                started = True
+            stripped = stripped.lstrip().lstrip(',').lstrip()
+            buffer = stripped
+            if not started and buffer:
+                raise ValueError("JSON document is not a top-level array")
+
+            if started and buffer.startswith(']'):
+                return
+            if buffer:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    end = None
+                if end is not None and (eof or end < len(buffer) or isinstance(item, (dict, list))):
+                    buffer = buffer[end:]
+                    yield item
+                    continue
+                # Otherwise the element may continue in the next read (e.g. a split number)
+
+            if eof:
+                return
+            data = reader.read(_JSON_READ_SIZE)
+            if not data:
+                eof = True
+            buffer += data
+    finally:
+        reader.detach()
+        if isinstance(source, str):
+            handle.close()
+
+
+def _is_json_array(source: Source) -> bool:
+    # Only the first non-blank byte is read; file objects are rewound
+    handle = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        _rewind(handle)
+        while True:
+            block = handle.read(_JSON_READ_SIZE)
+            if not block:
+                return False
+            block = block.lstrip(b'\xef\xbb\xbf \t\r\n')
+            if block:
+                return block.startswith(b'[')
+    finally:
+        if isinstance(source, str):
+            handle.close()
+        else:
+            _rewind(source)
+
+
+def read_columns(source: Source, kind: str) -> List[str]:
+    """
+    Read only the column names of a tabular file
+
+    Args:
+        source (Source): Path or binary file object
+        kind (str): File kind from detect_file_kind
+
+    Returns:
+        List[str]: Column names
+    """
+    try:
+        batch = next(iter_row_batches(source, kind, batch_size=1), None)
+        return [] if batch is None else [str(column) for column in batch.columns]
+    finally:
+        _rewind(source)
+
+
+def file_digest(source: Source) -> str:
+    """
+    Hash the contents of a file without loading it whole
+
+    Args:
+        source (Source): Path or binary file object (rewound afterwards)
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    handle = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        _rewind(handle)
+        digest = hashlib.sha256()
+        for block in iter(lambda: handle.read(_JSON_READ_SIZE), b''):
+            digest.update(block)
+        return digest.hexdigest()
+    finally:
+        if isinstance(source, str):
+            handle.close()
+        else:
+            _rewind(source)
+
+
+def iter_row_batches(source: Source,
+                     kind: str,
+                     batch_size: Optional[int] = None,
+                     columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV, JSONL, JSON or Excel file as DataFrame row batches
+
+    Args:
+        source (Source): Path or binary file object
+        kind (str): File kind from detect_file_kind
+        batch_size (Optional[int]): Rows per batch
+        columns (Optional[List[str]]): Columns to keep (all when empty)
+
+    Yields:
+        pd.DataFrame: Row batches
+    """
+    batch_size = batch_size or config.get('analyzer.ingestion.batch_size', 5000)
+    columns = list(columns) if columns else None
+
+    if kind in ('csv', 'tsv'):
+        reader = pd.read_csv(
+            source,
+            sep='\t' if kind == 'tsv' else ',',
+            usecols=columns,
+            chunksize=batch_size
+        )
+        with reader:
+            yield from reader
+        return
+
+    if kind == 'jsonl':
+        with pd.read_json(source, lines=True, chunksize=batch_size) as reader:
+            for batch in reader:
+                yield batch[columns] if columns else batch
+        return
+
+    if kind == 'json':
+        if not _is_json_array(source):
+            # Objects (e.g. DataFrame.to_json() in its default column orientation)
+            # cannot be streamed by row, so they are read whole
+            frame = pd.read_json(source, encoding='utf-8-sig')
+            if columns:
+                frame = frame.reindex(columns=columns)
+            for start in range(0, len(frame), batch_size):
+                yield frame.iloc[start:start + batch_size]
+            return
+
+        rows = []
+        for item in _iter_json_array(source):
+            rows.append(item if isinstance(item, dict) else {'value': item})
+            if len(rows) >= batch_size:
+                batch = pd.DataFrame(rows)
+                yield batch.reindex(columns=columns) if columns else batch
+                rows = []
+        if rows:
+            batch = pd.DataFrame(rows)
+            yield batch.reindex(columns=columns) if columns else batch
+        return
+
+    if kind == 'excel':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            row_iter = workbook.active.iter_rows(values_only=True)
+            header = [str(value) if value is not None else f'column_{i}'
+                      for i, value in enumerate(next(row_iter, ()))]
+            rows = []
+            for values in row_iter:
+                rows.append(values)
+                if len(rows) >= batch_size:
+                    batch = pd.DataFrame(rows, columns=header)
+                    yield batch[columns] if columns else batch
+                    rows = []
+            if rows:
+                batch = pd.DataFrame(rows, columns=header)
+                yield batch[columns] if columns else batch
+        finally:
+            workbook.close()
+        return
+
+    raise ValueError(f"Unsupported file kind: {kind}")
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (pd.api.types.is_scalar(value) and pd.isna(value))
+
+
+class _RowMapping(dict):
+    """Row values for str.format_map; unknown placeholders render empty"""
+
+    def __missing__(self, key: str) -> str:
+        return ''
+
+
+def iter_row_texts(batches: Iterable[pd.DataFrame],
+                   template: Optional[str] = None) -> Iterator[str]:
+    """
+    Render each row of each batch as text for the chunker
+
+    Args:
+        batches (Iterable[pd.DataFrame]): Row batches
+        template (Optional[str]): ``str.format`` template using column names,
+                                  e.g. ``"{name}: {description}"``. Defaults to
+                                  ``"column: value | ..."`` over non-empty cells.
+
+    Yields:
+        str: One line of text per row
+    """
+    for batch in batches:
+        names = [str(column) for column in batch.columns]
+        for values in batch.itertuples(index=False, name=None):
+            if template:
+                yield template.format_map(_RowMapping(
+                    (name, '' if _is_empty(value) else value) for name, value in zip(names, values)
+                ))
+            else:
+                yield ' | '.join(
+                    f'{name}: {value}' for name, value in zip(names, values)
+                    if not _is_empty(value) and str(value).strip()
+                )
@@ -0,0 +1,176 @@
+import threading
+from typing import Any, Dict, Optional, Union
+
+import ollama
+
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+# Ollama reports durations in nanoseconds
+_NS = 1e9
+
+
+class OllamaSession:
+    """
+    Long-lived Ollama client for one model
+
+    Every request carries the same ``keep_alive`` and model options, so the
+    server keeps one loaded instance of the model instead of reloading it
+    when options change or the default idle timeout expires. A background
+    ping keeps the model resident between user actions.
+    """
+
+    def __init__(self,
+                 model: str,
+                 host: Optional[str] = None,
+                 keep_alive: Optional[Union[str, int]] = None,
+                 options: Optional[Dict[str, Any]] = None,
+                 warm_interval: Optional[float] = None):
+        """
+        Initialize the session
+
+        Args:
+            model (str): Ollama model name
+            host (Optional[str]): Ollama server URL (defaults to analyzer.ollama.host,
+                                  then to the client's OLLAMA_HOST handling)
+            keep_alive (Optional[Union[str, int]]): How long the server keeps
+                                                    the model loaded (e.g. 30m)
+            options (Optional[Dict[str, Any]]): Model options such as num_ctx
+                                                and num_predict
+            warm_interval (Optional[float]): Seconds between warm pings (0 disables)
+        """
+        self.model = model
+        # None lets the client read OLLAMA_HOST, as the module-level ollama API does
+        self.client = ollama.Client(host=host or config.get('analyzer.ollama.host') or None)
+        self.keep_alive = keep_alive if keep_alive is not None else config.get('analyzer.ollama.keep_alive', '30m')
+        self.options = dict(options if options is not None else {
+            'num_ctx': config.get('analyzer.ollama.num_ctx', 8192),
+            'num_predict': config.get('analyzer.ollama.num_predict', 1024)
+        })
+        self.warm_interval = (warm_interval if warm_interval is not None
+                              else config.get('analyzer.ollama.warm_interval', 240))
+
+        self._pulled = False
+        self._warm_stop = threading.Event()
+        self._warm_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def pull(self):
+        """
+        Ensure the model is available on the server (once per session)
+        """
+        if self._pulled:
+            return
+        try:
+            self.client.pull(self.model)
+            self._pulled = True
+        except Exception as e:
+            logger.warning("Could not pull Ollama model: %s", e)
+
+    def warm(self) -> bool:
+        """
+        Load the model (or extend its keep-alive) without generating tokens
+
+        Returns:
+            bool: True if the server answered
+        """
+        try:
+            response = self.client.generate(model=self.model, prompt='', keep_alive=self.keep_alive,
+                                            options=self.options)
+        except Exception as e:
+            logger.debug("Ollama warm ping failed: %s", e)
+            return False
+        self._observe_load(response)
+        return True
+
+    def _warm_loop(self):
+        while True:
+            self.warm()
+            if self._warm_stop.wait(self.warm_interval):
+                return
+
+    def start_warmer(self):
+        """
+        Start the periodic warm ping (the first ping is sent immediately)
+        """
+        with self._lock:
+            if self.warm_interval <= 0 or (self._warm_thread and self._warm_thread.is_alive()):
+                return
+            self._warm_stop.clear()
+            self._warm_thread = threading.Thread(target=self._warm_loop, name=f'ollama-warm-{self.model}',
+                                                 daemon=True)
+            self._warm_thread.start()
+
+    def stop_warmer(self):
+        self._warm_stop.set()
+
+    @staticmethod
+    def _observe_load(response: Dict[str, Any]):
+        load_duration = response.get('load_duration') or 0
+        if load_duration:
+            metrics.observe('llm_load', load_duration / _NS)
+
+    def chat(self, system_prompt: str, content: str) -> str:
+        """
+        Send one chunk to the model
+
+        The system message goes first and unchanged for every chunk of a job,
+        so only the chunk content has to be evaluated after the cached prefix.
+
+        Args:
+            system_prompt (str): System instruction shared by the job's chunks
+            content (str): Chunk content
+
+        Returns:
+            str: Model response text
+        """
+        messages = [
+            {'role': 'system', 'content': system_prompt},
+            {'role': 'user', 'content': content}
+        ]
+
+        with metrics.timer('llm_call'):
+            response = self.client.chat(
+                model=self.model,
+                messages=messages,
+                options=self.options,
+                keep_alive=self.keep_alive
+            )
+        metrics.inc('llm_calls')
+        metrics.inc('llm_tokens_in', response.get('prompt_eval_count', 0) or 0)
+        metrics.inc('llm_tokens_out', response.get('eval_count', 0) or 0)
+        self._observe_load(response)
+        return response['message']['content']
+
+
+_sessions: Dict[str, OllamaSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(model: str) -> OllamaSession:
+    """
+    Get the shared session for a model
+
+    Args:
+        model (str): Ollama model name
+
+    Returns:
+        OllamaSession: Session instance
+    """
+    with _sessions_lock:
+        session = _sessions.get(model)
+        if session is None:
+            session = _sessions[model] = OllamaSession(model)
+        return session
+
+
+def _reset_sessions(snapshot):
+    # Sessions pick up new keep_alive/options on next use
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.stop_warmer()
+        _sessions.clear()
+
+
+config.on_reload(_reset_sessions)
@@ -0,0 +1,289 @@
+import time
+import random
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from src.core.storage import domain_of
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+
+@dataclass
+class ProxyHealth:
+    """
+    Request outcomes of a proxy (overall or towards one domain)
+    """
+    successes: int = 0
+    failures: int = 0
+    bans: int = 0
+    latency: Optional[float] = None
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    ejections: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.successes + self.failures + self.bans
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing so new proxies start at 0.5 instead of 0 or 1
+        return (self.successes + 1) / (self.requests + 2)
+
+    @property
+    def ban_rate(self) -> float:
+        return self.bans / self.requests if self.requests else 0.0
+
+    def observe_latency(self, seconds: float, alpha: float):
+        self.latency = seconds if self.latency is None else alpha * seconds + (1 - alpha) * self.latency
+
+
+def display_proxy(proxy: str) -> str:
+    """
+    Hide the credentials of a proxy URL
+
+    Args:
+        proxy (str): Proxy URL, possibly with user:password
+
+    Returns:
+        str: URL safe to log or display
+    """
+    parts = urlsplit(proxy)
+    if not parts.password:
+        return proxy
+    netloc = f'{parts.username}:***@{parts.hostname}' + (f':{parts.port}' if parts.port else '')
+    return urlunsplit(parts._replace(netloc=netloc))
+
+
+class ProxyPool:
+    """
+    Health-scored proxy rotation
+
+    Each proxy has an EWMA of its response latency plus success, failure and
+    ban counts, both overall and per target domain. Proxies are picked at
+    random with weight ``success_rate * (1 - ban_rate) / latency``, using the
+    domain's statistics once it has any. A proxy whose connections fail
+    ``max_failures`` times in a row is ejected for a cooldown that doubles
+    with every ejection; a ban (e.g. 403/429) only cools the proxy down for
+    that domain. A domain keeps using its last healthy proxy (host affinity)
+    so cookies and rate-limit budgets stay with one exit address.
+    """
+
+    def __init__(self,
+                 proxies: Iterable[str],
+                 ewma_alpha: Optional[float] = None,
+                 max_failures: Optional[int] = None,
+                 cooldown_seconds: Optional[float] = None,
+                 max_cooldown_seconds: Optional[float] = None,
+                 ban_statuses: Optional[Iterable[int]] = None,
+                 affinity: Optional[bool] = None):
+        """
+        Initialize the pool
+
+        Args:
+            proxies (Iterable[str]): Proxy URLs
+            ewma_alpha (Optional[float]): Weight of the newest latency sample
+            max_failures (Optional[int]): Consecutive failures before ejection
+            cooldown_seconds (Optional[float]): First ejection cooldown
+            max_cooldown_seconds (Optional[float]): Longest ejection cooldown
+            ban_statuses (Optional[Iterable[int]]): HTTP statuses counted as bans
+            affinity (Optional[bool]): Keep each domain on one proxy while it stays healthy
+        """
+        self.proxies = list(dict.fromkeys(proxies))
+        self.ewma_alpha = ewma_alpha or config.get('scraper.proxy_pool.ewma_alpha', 0.3)
+        self.max_failures = max_failures or config.get('scraper.proxy_pool.max_failures', 3)
+        self.cooldown_seconds = cooldown_seconds or config.get('scraper.proxy_pool.cooldown_seconds', 60)
+        self.max_cooldown_seconds = max_cooldown_seconds or config.get('scraper.proxy_pool.max_cooldown_seconds', 900)
+        self.ban_statuses = frozenset(ban_statuses or config.get('scraper.proxy_pool.ban_statuses', (403, 407, 429)))
+        self.affinity = config.get('scraper.proxy_pool.affinity', True) if affinity is None else affinity
+
+        self._health: Dict[str, ProxyHealth] = {proxy: ProxyHealth() for proxy in self.proxies}
+        self._domain_health: Dict[Tuple[str, str], ProxyHealth] = {}
+        self._affinity: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _available(self, proxy: str, domain: str, now: float) -> bool:
+        domain_health = self._domain_health.get((proxy, domain))
+        return (self._health[proxy].cooldown_until <= now
+                and (domain_health is None or domain_health.cooldown_until <= now))
+
+    def _weight(self, proxy: str, domain: str, default_latency: float) -> float:
+        domain_health = self._domain_health.get((proxy, domain))
+        health = domain_health if domain_health is not None and domain_health.requests else self._health[proxy]
+        latency = health.latency if health.latency is not None else default_latency
+        return health.success_rate * (1 - health.ban_rate) / max(latency, 0.01)
+
+    def acquire(self, url: str) -> Optional[str]:
+        """
+        Choose a proxy for a request
+
+        Args:
+            url (str): Request URL
+
+        Returns:
+            Optional[str]: Proxy URL (used for both http and https), None if the pool is empty
+        """
+        if not self.proxies:
+            return None
+        domain = domain_of(url)
+        now = time.monotonic()
+        with self._lock:
+            sticky = self._affinity.get(domain)
+            if sticky is not None and self._available(sticky, domain, now):
+                return sticky
+
+            candidates = [proxy for proxy in self.proxies if self._available(proxy, domain, now)]
+            if not candidates:
+                # Everything is cooling down: use whichever comes back first
+                metrics.inc('proxy_pool_exhausted')
+                return min(self.proxies, key=lambda proxy: max(
+                    self._health[proxy].cooldown_until,
+                    self._domain_health.get((proxy, domain), self._health[proxy]).cooldown_until
+                ))
+
+            # Untried proxies are scored with the pool's mean latency
+            latencies = [health.latency for health in self._health.values() if health.latency is not None]
+            default_latency = sum(latencies) / len(latencies) if latencies else 1.0
+            weights = [self._weight(proxy, domain, default_latency) for proxy in candidates]
+            proxy = random.choices(candidates, weights)[0]
+            if self.affinity:
+                self._affinity[domain] = proxy
+            return proxy
+
+    def report(self,
+               proxy: str,
+               url: str,
+               latency: Optional[float] = None,
+               status: Optional[int] = None,
+               error: bool = False):
+        """
+        Record the outcome of a request made through a proxy
+
+        Args:
+            proxy (str): Proxy URL returned by acquire
+            url (str): Request URL
+            latency (Optional[float]): Seconds until the response headers arrived
+            status (Optional[int]): HTTP status code
+            error (bool): Whether the connection failed or timed out
+        """
+        domain = domain_of(url)
+        now = time.monotonic()
+        with self._lock:
+            health = self._health.get(proxy)
+            if health is None:
+                return
+            domain_health = self._domain_health.setdefault((proxy, domain), ProxyHealth())
+
+            if error:
+                for stats in (health, domain_health):
+                    stats.failures += 1
+                    stats.consecutive_failures += 1
+                if health.consecutive_failures >= self.max_failures:
+                    self._eject(proxy, health, now)
+                self._drop_affinity(proxy, domain)
+            elif status in self.ban_statuses:
+                health.bans += 1
+                domain_health.bans += 1
+                # Banned by this site only: other domains keep the proxy
+                self._eject(proxy, domain_health, now, domain)
+                self._drop_affinity(proxy, domain)
+            else:
+                for stats in (health, domain_health):
+                    stats.successes += 1
+                    stats.consecutive_failures = 0
+                    if latency is not None:
+                        stats.observe_latency(latency, self.ewma_alpha)
+
+    def _eject(self, proxy: str, health: ProxyHealth, now: float, domain: Optional[str] = None):
+        cooldown = min(self.cooldown_seconds * 2 ** health.ejections, self.max_cooldown_seconds)
+        health.cooldown_until = now + cooldown
+        health.ejections += 1
+        health.consecutive_failures = 0
+        metrics.inc('proxy_ejections')
+        target = display_proxy(proxy) + (f' ({domain})' if domain else '')
+        logger.warning("Proxy %s cooling down for %.0fs | الوكيل %s في فترة تهدئة لمدة %.0f ثانية",
+                       target, cooldown, target, cooldown)
+
+    def _drop_affinity(self, proxy: str, domain: str):
+        if self._affinity.get(domain) == proxy:
+            del self._affinity[domain]
+
+    def stats(self) -> List[Dict[str, object]]:
+        """
+        Summarize proxy health for monitoring
+
+        Returns:
+            List[Dict[str, object]]: One row per proxy
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'proxy': display_proxy(proxy),
+                    'state': 'cooldown' if health.cooldown_until > now else 'active',
+                    'cooldown_seconds': round(max(health.cooldown_until - now, 0.0), 1),
+                    'latency_ms': round(health.latency * 1000, 1) if health.latency is not None else None,
+                    'requests': health.requests,
+                    'success_rate': round(health.successes / health.requests, 3) if health.requests else None,
+                    'ban_rate': round(health.ban_rate, 3),
+                    'ejections': health.ejections,
+                    'banned_domains': sorted(domain for (owner, domain), stats in self._domain_health.items()
+                                      if owner == proxy and stats.cooldown_until > now),
+                    'sticky_domains': sum(1 for owner in self._affinity.values() if owner == proxy)
+                }
+                for proxy, health in self._health.items()
+            ]
+
+    def domain_stats(self) -> List[Dict[str, object]]:
+        """
+        Summarize proxy health per target domain
+
+        Returns:
+            List[Dict[str, object]]: One row per (proxy, domain) pair that was used
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'proxy': display_proxy(proxy),
+                    'domain': domain,
+                    'latency_ms': round(health.latency * 1000, 1) if health.latency is not None else None,
+                    'requests': health.requests,
+                    'success_rate': round(health.successes / health.requests, 3) if health.requests else None,
+                    'ban_rate': round(health.ban_rate, 3),
+                    'banned': health.cooldown_until > now
+                }
+                for (proxy, domain), health in sorted(self._domain_health.items())
+            ]
+
+
+_pool: Optional[ProxyPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_proxy_pool() -> Optional[ProxyPool]:
+    """
+    Get the proxy pool shared by all scrapers and crawl workers
+
+    Returns:
+        Optional[ProxyPool]: Pool over scraper.proxies, None if none are configured
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None and config.scraper.proxies:
+            _pool = ProxyPool(config.scraper.proxies)
+        return _pool
+
+
+def _reset_pool(snapshot):
+    global _pool
+    with _pool_lock:
+        # Keep collected health unless the proxy list itself changed
+        if _pool is not None and _pool.proxies != list(dict.fromkeys(snapshot.scraper.proxies)):
+            _pool = None
+
+
+config.on_reload(_reset_pool)
@@ -0,0 +1,212 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Tool fields stored per record, in export column order
+TOOL_FIELDS = ('name', 'description', 'category', 'rating')
+
+
+class _Dictionary:
+    """
+    Dictionary encoder mapping repeated strings to small integer codes
+    """
+    __slots__ = ('values', 'codes')
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+class ToolTable(Sequence):
+    """
+    Columnar accumulator for scraped tool records
+
+    Low-cardinality columns (category, url, language) are dictionary-encoded
+    into compact ``array('i')`` code buffers, which are copied into a single
+    int32 array per column on export so the table can keep growing after a
+    frame has been handed out. For backward compatibility the table also behaves as the list
+    of per-page dicts returned by earlier versions of ``WebScraper.scrape``.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.descriptions: List[str] = []
+        self.ratings: List[str] = []
+        self.category_codes = array('i')
+        self.url_codes = array('i')
+        self.language_codes = array('i')
+        self.pages = array('i')
+
+        self._categories = _Dictionary()
+        self._urls = _Dictionary()
+        self._languages = _Dictionary()
+
+        # One (url code, page, language code, first row, end row) entry per page
+        self._page_spans: List[tuple] = []
+
+        # Set by incremental scrapes to the ScrapeDiff of the run
+        self.diff = None
+
+        # Result store run id once the table has been persisted
+        self.run_id = None
+
+    @classmethod
+    def from_results(cls, results: Iterable[Dict[str, Any]]) -> 'ToolTable':
+        """
+        Build a table from legacy per-page result dicts
+
+        Args:
+            results (Iterable[Dict[str, Any]]): Per-page results with a 'tools' list
+
+        Returns:
+            ToolTable: Columnar table
+        """
+        if isinstance(results, cls):
+            return results
+        table = cls()
+        for result in results:
+            table.add_page(result['url'], result['page'], result['language'], result.get('tools', []))
+        return table
+
+    def add_page(self,
+                 url: str,
+                 page: int,
+                 language: str,
+                 tools: Iterable[Dict[str, str]]):
+        """
+        Append the tools extracted from one listing page
+
+        Args:
+            url (str): Page URL
+            page (int): Page number
+            language (str): Scraping language
+            tools (Iterable[Dict[str, str]]): Extracted tool dicts
+        """
+        url_code = self._urls.encode(url)
+        language_code = self._languages.encode(language)
+        start = len(self.names)
+
+        for tool in tools:
+            self.names.append(tool['name'])
+            self.descriptions.append(tool['description'])
+            self.ratings.append(tool.get('rating') or 'N/A')
+            self.category_codes.append(self._categories.encode(tool.get('category') or 'Uncategorized'))
+            self.url_codes.append(url_code)
+            self.language_codes.append(language_code)
+            self.pages.append(page)
+
+        self._page_spans.append((url_code, page, language_code, start, len(self.names)))
+
+    @property
+    def num_tools(self) -> int:
+        return len(self.names)
+
+    def _tool(self, row: int) -> Dict[str, str]:
+        return {
+            'name': self.names[row],
+            'description': self.descriptions[row],
+            'category': self._categories.values[self.category_codes[row]],
+            'rating': self.ratings[row]
+        }
+
+    def _page(self, index: int) -> Dict[str, Any]:
+        url_code, page, language_code, start, end = self._page_spans[index]
+        return {
+            'url': self._urls.values[url_code],
+            'page': page,
+            'language': self._languages.values[language_code],
+            'tools': [self._tool(row) for row in range(start, end)]
+        }
+
+    def __len__(self) -> int:
+        return len(self._page_spans)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self._page(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('page index out of range')
+        return self._page(index)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over flat tool records (tool fields plus url, page, language)
+
+        Yields:
+            Dict[str, Any]: One flat record per tool
+        """
+        for row in range(self.num_tools):
+            record = self._tool(row)
+            record['url'] = self._urls.values[self.url_codes[row]]
+            record['page'] = self.pages[row]
+            record['language'] = self._languages.values[self.language_codes[row]]
+            yield record
+
+    @staticmethod
+    def _codes(buffer: array) -> np.ndarray:
+        # Copy the code buffer: a view would pin it and make add_page raise BufferError
+        return np.array(buffer, dtype=np.intc)
+
+    def _categorical(self, buffer: array, dictionary: _Dictionary) -> pd.Categorical:
+        return pd.Categorical.from_codes(self._codes(buffer), categories=dictionary.values)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        Hand the columns off to a DataFrame
+
+        Dictionary-encoded columns become categoricals over copies of the
+        code buffers; string columns reuse the accumulated string objects.
+        The frame is independent of the table, which may keep growing.
+
+        Returns:
+            pd.DataFrame: One row per tool
+        """
+        return pd.DataFrame({
+            'name': self.names,
+            'description': self.descriptions,
+            'category': self._categorical(self.category_codes, self._categories),
+            'rating': self.ratings,
+            'url': self._categorical(self.url_codes, self._urls),
+            'page': self._codes(self.pages),
+            'language': self._categorical(self.language_codes, self._languages)
+        }, copy=False)
+
+    def to_arrow(self):
+        """
+        Hand the columns off to an Arrow table with dictionary-encoded columns
+
+        Returns:
+            pyarrow.Table: One row per tool
+        """
+        import pyarrow as pa
+
+        def dictionary(buffer: array, values: _Dictionary):
+            return pa.DictionaryArray.from_arrays(
+                pa.array(self._codes(buffer), type=pa.int32()),
+                pa.array(values.values, type=pa.string())
+            )
+
+        return pa.table({
+            'name': pa.array(self.names, type=pa.string()),
+            'description': pa.array(self.descriptions, type=pa.string()),
+            'category': dictionary(self.category_codes, self._categories),
+            'rating': pa.array(self.ratings, type=pa.string()),
+            'url': dictionary(self.url_codes, self._urls),
+            'page': pa.array(self._codes(self.pages), type=pa.int32()),
+            'language': dictionary(self.language_codes, self._languages)
+        })
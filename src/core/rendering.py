@@ -0,0 +1,209 @@
+import atexit
+import asyncio
+import itertools
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+
+class RenderError(RuntimeError):
+    """Raised when a page could not be rendered by the browser pool"""
+
+
+class BrowserPool:
+    """
+    Pool of reusable headless-browser contexts for JavaScript-rendered pages
+
+    Playwright runs on a private event loop thread, so ``render`` can be
+    called from any thread (including distributed crawl workers). One browser
+    hosts ``pool_size`` long-lived contexts that are handed out round-robin;
+    a semaphore caps the number of pages rendering at once. Images, fonts and
+    media are aborted at the network layer since extraction only needs the DOM.
+    """
+
+    def __init__(self,
+                 pool_size: Optional[int] = None,
+                 max_concurrency: Optional[int] = None,
+                 wait_timeout: Optional[float] = None,
+                 navigation_timeout: Optional[float] = None,
+                 blocked_resources: Optional[Tuple[str, ...]] = None,
+                 browser: Optional[str] = None):
+        """
+        Initialize pool settings; the browser starts on first use
+
+        Args:
+            pool_size (Optional[int]): Number of reusable browser contexts
+            max_concurrency (Optional[int]): Maximum pages rendered at once
+            wait_timeout (Optional[float]): Seconds to wait for the wait selector
+            navigation_timeout (Optional[float]): Seconds allowed for navigation
+            blocked_resources (Optional[Tuple[str, ...]]): Resource types to abort
+            browser (Optional[str]): chromium, firefox or webkit
+        """
+        self.pool_size = max(1, pool_size or config.get('scraper.rendering.pool_size', 2))
+        self.max_concurrency = max(1, max_concurrency or config.get('scraper.rendering.max_concurrency', 4))
+        self.wait_timeout = wait_timeout or config.get('scraper.rendering.wait_timeout', 10)
+        self.navigation_timeout = navigation_timeout or config.scraper.default_timeout
+        self.blocked_resources = frozenset(
+            blocked_resources or config.get('scraper.rendering.blocked_resources', ('image', 'font', 'media'))
+        )
+        self.browser_name = browser or config.get('scraper.rendering.browser', 'chromium')
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._contexts = []
+        self._next_context = None
+        self._semaphore = None
+
+    def start(self):
+        """
+        Launch the browser and its contexts on the pool thread
+
+        Raises:
+            RenderError: If the browser could not be launched
+        """
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='browser-pool', daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._launch(), loop).result(self.navigation_timeout + 30)
+            except Exception as e:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise RenderError(f"Could not launch {self.browser_name}: {e}") from e
+            self._loop, self._thread = loop, thread
+
+    async def _launch(self):
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await getattr(self._playwright, self.browser_name).launch(headless=True)
+        for _ in range(self.pool_size):
+            context = await self._browser.new_context(java_script_enabled=True)
+            context.set_default_navigation_timeout(self.navigation_timeout * 1000)
+            await context.route('**/*', self._route)
+            self._contexts.append(context)
+        self._next_context = itertools.cycle(self._contexts)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _route(self, route):
+        if route.request.resource_type in self.blocked_resources:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _render(self,
+                      url: str,
+                      wait_selector: Optional[str],
+                      headers: Optional[Dict[str, str]]) -> Tuple[str, str]:
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        async with self._semaphore:
+            page = await next(self._next_context).new_page()
+            try:
+                if headers:
+                    await page.set_extra_http_headers(headers)
+                await page.goto(url, wait_until='domcontentloaded')
+                if wait_selector:
+                    try:
+                        await page.wait_for_selector(wait_selector, state='attached',
+                                                     timeout=self.wait_timeout * 1000)
+                    except PlaywrightTimeoutError:
+                        # Return whatever rendered; extraction decides if it is usable
+                        pass
+                return await page.content(), page.url
+            finally:
+                await page.close()
+
+    def render(self,
+               url: str,
+               wait_selector: Optional[str] = None,
+               headers: Optional[Dict[str, str]] = None) -> Tuple[str, str]:
+        """
+        Render a page and return its DOM once the wait selector is attached
+
+        Args:
+            url (str): Page URL
+            wait_selector (Optional[str]): CSS selector signalling that content rendered
+            headers (Optional[Dict[str, str]]): Extra request headers
+
+        Returns:
+            Tuple[str, str]: Rendered HTML and final URL
+
+        Raises:
+            RenderError: If navigation or rendering failed
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(self._render(url, wait_selector, headers), self._loop)
+        try:
+            with metrics.timer('render'):
+                return future.result(self.navigation_timeout + self.wait_timeout + 5)
+        except Exception as e:
+            future.cancel()
+            metrics.inc('render_errors')
+            raise RenderError(f"Could not render {url}: {e}") from e
+
+    async def _shutdown(self):
+        for context in self._contexts:
+            await context.close()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+    def close(self):
+        """
+        Close all contexts, the browser and the pool thread
+        """
+        with self._start_lock:
+            if self._loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(30)
+            except Exception as e:
+                logger.warning("Error closing browser pool: %s | خطأ في إغلاق المتصفح: %s", e, e)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = self._thread = None
+            self._contexts = []
+
+
+_pool: Optional[BrowserPool] = None
+_pool_failed = False
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """
+    Get the shared browser pool
+
+    Returns:
+        Optional[BrowserPool]: Started pool, or None if scraper.headless_mode
+                               is off or the browser cannot be launched
+    """
+    global _pool, _pool_failed
+    if not config.scraper.headless_mode or _pool_failed:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            pool = BrowserPool()
+            try:
+                pool.start()
+            except RenderError as e:
+                # Do not retry the launch on every page
+                _pool_failed = True
+                logger.error("Headless rendering unavailable: %s | العرض عبر المتصفح غير متاح: %s", e, e)
+                return None
+            _pool = pool
+            atexit.register(pool.close)
+        return _pool
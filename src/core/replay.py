@@ -0,0 +1,111 @@
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+
+from src.core.archive import ArchiveEntry, PageArchive
+from src.core.records import ToolTable
+from src.core.scraper import WebScraper
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+# (url, page, fetch date, tools) of one replayed page
+ReplayedPage = Tuple[str, int, str, List[Dict[str, str]]]
+
+_worker_scraper: Optional[WebScraper] = None
+
+
+def _init_worker(language: Optional[str]):
+    global _worker_scraper
+    _worker_scraper = WebScraper(language=language)
+
+
+def _replay_batch(directory: str, segment: str, entries: List[ArchiveEntry]) -> List[ReplayedPage]:
+    archive = PageArchive(directory)
+    return [
+        (page.url, page.page, page.fetched_at, _worker_scraper.extract_archived(page))
+        for page in archive.read_many(segment, entries)
+    ]
+
+
+def replay(directory: Optional[str] = None,
+           workers: Optional[int] = None,
+           latest_only: bool = True,
+           since: Optional[str] = None,
+           language: Optional[str] = None,
+           batch_size: Optional[int] = None) -> ToolTable:
+    """
+    Re-run parsing and extraction over archived pages, without network access
+
+    Index entries are split into batches of one segment each, and batches are
+    extracted in parallel worker processes that read their segment sequentially.
+
+    Args:
+        directory (Optional[str]): Archive directory (defaults to scraper.archive.directory)
+        workers (Optional[int]): Worker processes (defaults to replay.workers, 0 = all CPUs)
+        latest_only (bool): Replay only the most recent capture of each URL
+        since (Optional[str]): Only replay pages fetched at or after this ISO 8601 UTC date
+        language (Optional[str]): Scraping language recorded with the results
+        batch_size (Optional[int]): Pages per worker task
+
+    Returns:
+        ToolTable: Tools of every replayed page that yielded any, in fetch order
+    """
+    archive = PageArchive(directory)
+    workers = workers if workers is not None else config.get('scraper.archive.replay_workers', 0)
+    workers = workers or os.cpu_count() or 1
+    batch_size = batch_size or config.get('scraper.archive.replay_batch_size', 256)
+    scraper = WebScraper(language=language)
+
+    entries = [entry for entry in archive.iter_entries(latest_only)
+               if since is None or entry.fetched_at >= since]
+    entries.sort(key=lambda entry: (entry.segment, entry.offset))
+    batches = []
+    for segment, group in groupby(entries, key=lambda entry: entry.segment):
+        group = list(group)
+        batches.extend((segment, group[i:i + batch_size]) for i in range(0, len(group), batch_size))
+
+    logger.info("Replaying %d archived pages with %d workers | إعادة استخراج %d صفحة مؤرشفة باستخدام %d عمليات",
+                len(entries), workers, len(entries), workers)
+
+    pages: List[ReplayedPage] = []
+    with metrics.timer('replay'):
+        if workers == 1 or len(batches) <= 1:
+            _init_worker(scraper.language)
+            for segment, batch in batches:
+                pages.extend(_replay_batch(archive.directory, segment, batch))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(scraper.language,)) as pool:
+                futures = [pool.submit(_replay_batch, archive.directory, segment, batch)
+                           for segment, batch in batches]
+                for future in futures:
+                    pages.extend(future.result())
+
+    results = ToolTable()
+    pages.sort(key=lambda page: (page[2], page[1]))
+    for url, page, _, tools in pages:
+        if tools:
+            results.add_page(url, page, scraper.language, tools)
+            metrics.inc('tools_extracted', len(tools))
+    metrics.inc('pages_replayed', len(pages))
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Re-extract tools from the page archive')
+    parser.add_argument('--directory', default=None, help='Archive directory')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (0 = all CPUs)')
+    parser.add_argument('--all-captures', action='store_true', help='Replay every capture, not only the latest per URL')
+    parser.add_argument('--since', default=None, help='Only pages fetched at or after this date (e.g. 2024-01-01)')
+    parser.add_argument('--language', default=None)
+    parser.add_argument('--format', default='json', help='Export format')
+    args = parser.parse_args(argv)
+
+    results = replay(args.directory, args.workers, not args.all_captures, args.since, args.language)
+    print(WebScraper(language=args.language).export_results(results, format=args.format))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import math
+import heapq
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.embeddings import encode_batched
+from src.utils.config import config
+from src.utils.metrics import metrics
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count used for context budgeting (about 4 characters per token)
+
+    Args:
+        text (str): Text
+
+    Returns:
+        int: Estimated tokens
+    """
+    return math.ceil(len(text) / 4)
+
+
+class EmbeddingCache:
+    """
+    Normalized embeddings keyed by content hash
+
+    Re-running a question over the same document (or overlapping documents)
+    only encodes chunks that were never seen before.
+    """
+
+    def __init__(self,
+                 encoder: Any,
+                 max_entries: Optional[int] = None,
+                 batch_size: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            encoder (Any): Object with a SentenceTransformer-style encode(texts)
+            max_entries (Optional[int]): Maximum cached embeddings (least recently used evicted)
+            batch_size (Optional[int]): Texts encoded per call
+        """
+        self.encoder = encoder
+        self.max_entries = max_entries or config.get('analyzer.retrieval.cache_size', 50000)
+        self.batch_size = batch_size or config.get('analyzer.retrieval.batch_size', 64)
+        self._entries: 'OrderedDict[bytes, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.sha256(text.encode('utf-8')).digest()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, encoding only cache misses
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            np.ndarray: L2-normalized embeddings, one row per text
+        """
+        keys = [self._key(text) for text in texts]
+        vectors: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    vectors[key] = vector
+
+        missing = list({key: text for key, text in zip(keys, texts) if key not in vectors}.items())
+        metrics.inc('embedding_cache_hits', len(texts) - len(missing))
+        if missing:
+            encoded = encode_batched(self.encoder, [text for _, text in missing],
+                                     max_batch_size=self.batch_size)
+            norms = np.linalg.norm(encoded, axis=1, keepdims=True)
+            encoded /= np.where(norms == 0, 1, norms)
+
+            with self._lock:
+                for (key, _), vector in zip(missing, encoded):
+                    vectors[key] = vector
+                    self._entries[key] = vector
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return np.stack([vectors[key] for key in keys]) if keys else np.empty((0, 0), dtype=np.float32)
+
+
+def retrieve(chunks: Iterable[str],
+             query: str,
+             cache: EmbeddingCache,
+             top_k: Optional[int] = None,
+             token_budget: Optional[int] = None) -> Tuple[List[str], int]:
+    """
+    Select the chunks most relevant to a query
+
+    Chunks are embedded in batches while streaming, keeping only the current
+    top-k in a heap, so memory stays O(k) however long the document is.
+
+    Args:
+        chunks (Iterable[str]): Document chunks
+        query (str): Question or custom prompt
+        cache (EmbeddingCache): Embedding cache for chunks and query
+        top_k (Optional[int]): Maximum chunks returned
+        token_budget (Optional[int]): Maximum estimated tokens across returned chunks
+
+    Returns:
+        Tuple[List[str], int]: Selected chunks in document order and the
+                               total number of chunks scanned
+    """
+    top_k = top_k or config.get('analyzer.retrieval.top_k', 5)
+    token_budget = token_budget or config.get('analyzer.retrieval.token_budget', 6000)
+    query_vector = cache.encode([query])[0]
+
+    heap: List[Tuple[float, int, str]] = []
+    total = 0
+    batch: List[str] = []
+
+    def score(batch: List[str], offset: int):
+        similarities = cache.encode(batch) @ query_vector
+        for index, (similarity, chunk) in enumerate(zip(similarities.tolist(), batch)):
+            item = (similarity, offset + index, chunk)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= cache.batch_size:
+            score(batch, total)
+            total += len(batch)
+            batch = []
+    if batch:
+        score(batch, total)
+        total += len(batch)
+
+    # Most relevant first until the budget is spent, then back to document order
+    selected, used = [], 0
+    for similarity, position, chunk in sorted(heap, reverse=True):
+        tokens = estimate_tokens(chunk)
+        if selected and used + tokens > token_budget:
+            continue
+        selected.append((position, chunk))
+        used += tokens
+
+    return [chunk for _, chunk in sorted(selected)], total
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str, encoder: Any) -> EmbeddingCache:
+    """
+    Get the shared embedding cache of an embedding model
+
+    Args:
+        model_name (str): Embedding model name (cache namespace)
+        encoder (Any): Encoder used on cache misses
+
+    Returns:
+        EmbeddingCache: Cache instance
+    """
+    with _caches_lock:
+        cache = _caches.get(model_name)
+        if cache is None:
+            cache = _caches[model_name] = EmbeddingCache(encoder)
+        else:
+            cache.encoder = encoder
+        return cache
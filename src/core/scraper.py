@@ -3,13 +3,56 @@ import re
 import time
 import random
 import requests
-from typing import Dict, List, Optional, Union
+from urllib.parse import urljoin
+from typing import Dict, List, Optional, Tuple, Union
 from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
 
+from src.core.archive import ArchivedPage, get_archive
+from src.core.blocks import block_detector
+from src.core.charset import charset_decoder
+from src.core.checkpoint import CrawlCheckpoint
+from src.core.classifier import get_classifier
+from src.core.datasets import typed_tools_frame, write_dataset
+from src.core.incremental import FingerprintStore, ScrapeDiff, content_fingerprint, raw_fingerprint
+from src.core.records import ToolTable
+from src.core.proxies import get_proxy_pool
+from src.core.rendering import RenderError, get_browser_pool
+from src.core.storage import get_store
+from src.core.streaming import ListingWatcher, check_content_type, read_body
 from src.utils.config import config
 from src.utils.logging import logger
+from src.utils.metrics import metrics
+from src.utils.profiling import profile_run
+
+# Columns written by export_results
+EXPORT_COLUMNS = ('name', 'description', 'category', 'rating', 'url', 'page', 'language')
+
+# Advanced selectors for tool extraction, also awaited when rendering pages
+TOOL_SELECTORS = (
+    # Specific class-based selectors
+    '.ai-tool-card', '.tool-listing', '.ai-tool-item', 
+    '.tool-grid-item', '.ai-product-card',
+    
+    # More generic selectors
+    'div[class*="tool"]', 'article[class*="tool"]',
+    'div[class*="product"]', 'article[class*="product"]',
+    
+    # Fallback generic selectors
+    'div.card', 'div.item', 'section.tool',
+    'div.product', 'article.product'
+)
+
+# Class names of specific tool cards; generic selectors never end a stream early
+CARD_CLASSES = tuple(selector[1:] for selector in TOOL_SELECTORS if re.fullmatch(r'\.[\w-]+', selector))
+
+# WARC-Truncated reasons of bodies not read to the end
+TRUNCATION_REASONS = {'size_limit': 'length', 'early_stop': 'unspecified'}
+
+# Link texts of the next listing page
+NEXT_LINK_TEXTS = ('Next', 'التالي', 'Next Page', 'الصفحة التالية')
+
 
 class WebScraper:
     def __init__(self, 
@@ -23,12 +66,13 @@ class WebScraper:
             language (Optional[str]): Language context for scraping
         """
         # Get configuration values with fallback
-        self.timeout = timeout or config.get('scraper.default_timeout', 45)
+        settings = config.scraper
+        self.timeout = timeout or settings.default_timeout
         self.language = language or config.get('app.languages.default', 'ar')
         
         # Scraper configuration
-        self.max_retries = config.get('scraper.max_retries', 3)
-        self.wait_time = config.get('scraper.wait_time', 5)
+        self.max_retries = settings.max_retries
+        self.wait_time = settings.wait_time
         
         # User agent rotation
         self.user_agents = [
@@ -37,8 +81,14 @@ class WebScraper:
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         ]
         
-        # Proxy configuration
-        self.proxies = config.get('scraper.proxies', [])
+        # Streaming fetch limits
+        self.max_body_bytes = config.get('scraper.streaming.max_body_bytes', 5 * 1024 * 1024)
+        self.stream_chunk_size = config.get('scraper.streaming.chunk_size', 64 * 1024)
+        self.stream_tail_bytes = config.get('scraper.streaming.tail_bytes', 32 * 1024)
+        self.allowed_content_types = tuple(config.get('scraper.streaming.allowed_content_types', 
+                                                      ('text/html', 'application/xhtml+xml')))
+        self.early_stop = config.get('scraper.streaming.early_stop', True)
+        self.max_cards = config.get('scraper.streaming.max_cards', 0)
 
     def _get_headers(self) -> Dict[str, str]:
         """
@@ -54,18 +104,6 @@ class WebScraper:
         }
         return headers
 
-    def _select_proxy(self) -> Optional[Dict[str, str]]:
-        """
-        Select a proxy for the request
-        
-        Returns:
-            Optional[Dict[str, str]]: Proxy configuration or None
-        """
-        if not self.proxies:
-            return None
-        return {'http': random.choice(self.proxies), 
-                'https': random.choice(self.proxies)}
-
     def _extract_tool_details(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
         """
         Extract detailed tool information from the page with advanced strategies
@@ -78,29 +116,10 @@ class WebScraper:
         """
         tools = []
         
-        # Advanced selectors for tool extraction
-        tool_selectors = [
-            # Specific class-based selectors
-            '.ai-tool-card', '.tool-listing', '.ai-tool-item', 
-            '.tool-grid-item', '.ai-product-card',
-            
-            # More generic selectors
-            'div[class*="tool"]', 'article[class*="tool"]',
-            'div[class*="product"]', 'article[class*="product"]',
-            
-            # Fallback generic selectors
-            'div.card', 'div.item', 'section.tool',
-            'div.product', 'article.product'
-        ]
-        
-        # Specific text patterns for tool identification
-        tool_keywords = [
-            'ai tool', 'web tool', 'productivity tool', 
-            'marketing tool', 'ai product', 'web service'
-        ]
+        classifier = get_classifier()
         
         # Try different selectors
-        for selector in tool_selectors:
+        for selector in TOOL_SELECTORS:
             tool_elements = soup.select(selector)
             
             if tool_elements:
@@ -167,11 +186,8 @@ class WebScraper:
                     if name and description:
                         # Attempt to categorize if not found
                         if not category:
-                            # Use keywords to infer category
-                            for keyword in tool_keywords:
-                                if keyword in name.lower() or keyword in description.lower():
-                                    category = keyword.replace('tool', '').replace('ai', '').strip().title()
-                                    break
+                            # Use the keyword taxonomy to infer category
+                            category = classifier.classify(f'{name} {description}')
                         
                         # Normalize rating
                         if rating:
@@ -181,7 +197,7 @@ class WebScraper:
                         tools.append({
                             'name': name,
                             'description': description,
-                            'category': category or 'Uncategorized',
+                            'category': category or classifier.default_category,
                             'rating': rating or 'N/A'
                         })
                 
@@ -190,10 +206,257 @@ class WebScraper:
         
         return tools
 
+    def _extract_text_blocks(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+        """
+        Fallback extraction from the repeated content blocks of unknown layouts
+        
+        Args:
+            soup (BeautifulSoup): Parsed HTML content
+        
+        Returns:
+            List[Dict[str, str]]: List of tool details
+        """
+        blocks = block_detector.detect(soup)
+        categories = get_classifier().classify_many(f'{block.name} {block.description}' for block in blocks)
+        
+        return [
+            {
+                'name': block.name,
+                'description': block.description,
+                'category': category,
+                # Normalize rating like the selector path
+                'rating': (re.sub(r'[^\d.]', '', block.rating) if block.rating else '') or 'N/A'
+            }
+            for block, category in zip(blocks, categories)
+        ]
+
+    def _render(self, url: str) -> Optional[BeautifulSoup]:
+        """
+        Render a page in the headless browser pool
+        
+        Args:
+            url (str): Page URL
+        
+        Returns:
+            Optional[BeautifulSoup]: Rendered DOM, or None if rendering is
+                                     disabled or failed
+        """
+        pool = get_browser_pool()
+        if pool is None:
+            return None
+        
+        try:
+            html, _ = pool.render(url, wait_selector=', '.join(TOOL_SELECTORS), headers=self._get_headers())
+        except RenderError as e:
+            logger.warning("Rendering failed: %s | فشل عرض الصفحة: %s", e, e)
+            return None
+        
+        metrics.inc('pages_rendered')
+        with metrics.timer('parse'):
+            return BeautifulSoup(html, 'html.parser')
+
+    def _extract_page(self, 
+                      soup: BeautifulSoup, 
+                      url: Optional[str] = None) -> Tuple[List[Dict[str, str]], BeautifulSoup, bool]:
+        """
+        Extract tools from a parsed listing page
+        
+        Static extraction runs first. Only when it finds nothing is the page
+        rendered in a headless browser (if scraper.headless_mode is on), and
+        only then are plain text blocks tried.
+        
+        Args:
+            soup (BeautifulSoup): Parsed HTML content
+            url (Optional[str]): Page URL, required for rendering
+        
+        Returns:
+            Tuple[List[Dict[str, str]], BeautifulSoup, bool]: Tools, the DOM they
+            were extracted from and whether it was rendered
+        """
+        # Extract tools
+        with metrics.timer('extract'):
+            tools = self._extract_tool_details(soup)
+        if tools:
+            return tools, soup, False
+        
+        # Client-side rendered listings only have cards after JavaScript runs
+        rendered = self._render(url) if url else None
+        if rendered is not None:
+            with metrics.timer('extract'):
+                tools = self._extract_tool_details(rendered)
+            if tools:
+                return tools, rendered, True
+        
+        # If no tools found, try more aggressive extraction
+        metrics.inc('fallback_extractions')
+        if rendered is not None:
+            return self._extract_text_blocks(rendered), rendered, True
+        return self._extract_text_blocks(soup), soup, False
+
+    def _find_next_url(self, soup: BeautifulSoup, base_url: str) -> Optional[str]:
+        """
+        Find the link to the next listing page
+        
+        Args:
+            soup (BeautifulSoup): Parsed HTML content
+            base_url (str): URL of the current page for resolving relative links
+        
+        Returns:
+            Optional[str]: Absolute next page URL or None
+        """
+        next_page_link = soup.find('a', text=list(NEXT_LINK_TEXTS))
+        if not next_page_link or not next_page_link.get('href'):
+            return None
+        return urljoin(base_url, next_page_link.get('href'))
+
+    def _fetch(self, url: str, use_proxy: bool = False, page: int = 1) -> requests.Response:
+        """
+        Fetch a single page
+        
+        Args:
+            url (str): Page URL
+            use_proxy (bool): Whether to use proxy servers
+            page (int): Listing page number (recorded in the page archive)
+        
+        Returns:
+            requests.Response: Successful response
+        
+        Raises:
+            requests.exceptions.RequestException: On network or HTTP errors
+        """
+        # Prepare request parameters
+        headers = self._get_headers()
+        
+        # One health-scored proxy for both schemes, shared with other scrapers
+        pool = get_proxy_pool() if use_proxy else None
+        proxy = pool.acquire(url) if pool is not None else None
+        proxies = {'http': proxy, 'https': proxy} if proxy else None
+        
+        # Stream the body: headers are checked first and reading is capped
+        with metrics.timer('fetch'):
+            started = time.monotonic()
+            try:
+                response = requests.get(
+                    url, 
+                    headers=headers, 
+                    proxies=proxies, 
+                    timeout=self.timeout, 
+                    stream=True
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if proxy:
+                    pool.report(proxy, url, error=True)
+                raise
+            if proxy:
+                # Time to headers is the proxy's latency; the body size is the page's
+                pool.report(proxy, url, latency=time.monotonic() - started, status=response.status_code)
+            try:
+                # Check response before downloading the body
+                response.raise_for_status()
+                check_content_type(response, self.allowed_content_types)
+                
+                watcher = None
+                if self.early_stop:
+                    watcher = ListingWatcher(CARD_CLASSES, NEXT_LINK_TEXTS, self.max_cards)
+                body, stop_reason = read_body(
+                    response, 
+                    self.max_body_bytes, 
+                    chunk_size=self.stream_chunk_size, 
+                    watcher=watcher, 
+                    tail_bytes=self.stream_tail_bytes, 
+                    encoding=charset_decoder.guess(response.headers.get('Content-Type'), url)
+                )
+            finally:
+                response.close()
+        
+        # Later stages read the capped body through response.content
+        response._content = body
+        
+        metrics.inc('pages_fetched')
+        metrics.inc('bytes_downloaded', len(body))
+        if stop_reason == 'size_limit':
+            metrics.inc('pages_truncated')
+            logger.warning("Page body truncated at %d bytes: %s | تم اقتطاع الصفحة عند %d بايت: %s", 
+                           self.max_body_bytes, url, self.max_body_bytes, url)
+        elif stop_reason == 'early_stop':
+            metrics.inc('pages_stopped_early')
+        
+        # Keep the raw page for offline re-extraction
+        archive = get_archive()
+        if archive is not None:
+            archive.append(
+                response.url or url, 
+                response.status_code, 
+                response.headers, 
+                body, 
+                reason=response.reason or '', 
+                page=page, 
+                truncated=TRUNCATION_REASONS.get(stop_reason)
+            )
+        return response
+
+    def _parse(self, response: requests.Response) -> BeautifulSoup:
+        """
+        Parse a fetched page
+        
+        Args:
+            response (requests.Response): Fetched page
+        
+        Returns:
+            BeautifulSoup: Parsed HTML content
+        """
+        # Decode from header, BOM or <meta> instead of detecting over the whole body
+        text, response.encoding = charset_decoder.decode(
+            response.content, 
+            response.headers.get('Content-Type'), 
+            response.url
+        )
+        with metrics.timer('parse'):
+            return BeautifulSoup(text, 'html.parser')
+
+    def scrape_page(self, 
+                    url: str, 
+                    use_proxy: bool = False, 
+                    page: int = 1) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """
+        Fetch one listing page and extract its tools
+        
+        Args:
+            url (str): Page URL
+            use_proxy (bool): Whether to use proxy servers
+            page (int): Listing page number
+        
+        Returns:
+            Tuple[List[Dict[str, str]], Optional[str]]: Tools and next page URL
+        """
+        response = self._fetch(url, use_proxy, page)
+        tools, soup, _ = self._extract_page(self._parse(response), response.url or url)
+        return tools, self._find_next_url(soup, response.url or url)
+
+    def extract_archived(self, page: ArchivedPage) -> List[Dict[str, str]]:
+        """
+        Extract tools from an archived page without any network access
+
+        Args:
+            page (ArchivedPage): Page read from the page archive
+
+        Returns:
+            List[Dict[str, str]]: Extracted tools (never rendered)
+        """
+        text, _ = charset_decoder.decode(page.body, page.headers.get('Content-Type'), page.url)
+        with metrics.timer('parse'):
+            soup = BeautifulSoup(text, 'html.parser')
+        # Without a URL the page is never sent to the browser pool
+        tools, _, _ = self._extract_page(soup)
+        return tools
+
     def scrape(self, 
                url: str, 
                max_pages: int = 10, 
-               use_proxy: bool = False) -> List[Dict[str, Union[str, List[Dict[str, str]]]]]:
+               use_proxy: bool = False, 
+               profile: Optional[bool] = None, 
+               incremental: bool = False, 
+               checkpoint: Optional[bool] = None) -> ToolTable:
         """
         Scrape web content with multilingual and configurable support
         
@@ -201,95 +464,251 @@ class WebScraper:
             url (str): Target URL to scrape
             max_pages (int): Maximum number of pages to scrape
             use_proxy (bool): Whether to use proxy servers
+            profile (Optional[bool]): Profile this run (defaults to profiling.enabled)
+            incremental (bool): Skip extraction for pages unchanged since the
+                                last incremental run and record a diff in
+                                ``results.diff``
+            checkpoint (Optional[bool]): Periodically checkpoint the crawl so an
+                                         interrupted run can be continued with
+                                         ``resume`` (defaults to checkpoint.enabled)
+        
+        Returns:
+            ToolTable: Scraped tools, also iterable as per-page result dicts
+        """
+        run_metadata = {
+            'url': url,
+            'max_pages': max_pages,
+            'use_proxy': use_proxy,
+            'incremental': incremental,
+            'language': self.language,
+            'timeout': self.timeout
+        }
+        if checkpoint is None:
+            checkpoint = config.get('checkpoint.enabled', True)
+        crawl_checkpoint = CrawlCheckpoint(CrawlCheckpoint.new_job_id(url)) if checkpoint else None
+        
+        with profile_run('scrape', profile, run_metadata):
+            try:
+                return self._scrape_pages(url, max_pages, use_proxy, incremental, crawl_checkpoint)
+            finally:
+                if crawl_checkpoint is not None:
+                    crawl_checkpoint.close()
+
+    def resume(self, job: str, profile: Optional[bool] = None) -> ToolTable:
+        """
+        Continue an interrupted scrape from its last checkpoint
+        
+        Args:
+            job (str): Checkpoint job id (see list_crawl_checkpoints)
+            profile (Optional[bool]): Profile this run (defaults to profiling.enabled)
         
         Returns:
-            List[Dict[str, Union[str, List[Dict[str, str]]]]]: Scraped content
+            ToolTable: Tools of the whole crawl, including pages scraped before
+                       the interruption
+        
+        Raises:
+            FileNotFoundError: If the job has no checkpoint
+        """
+        crawl_checkpoint = CrawlCheckpoint(job)
+        state = crawl_checkpoint.load()
+        if state is None:
+            raise FileNotFoundError(f"No checkpoint found for job {job}")
+        
+        # Keep the language the crawl was started with
+        self.language = state['language']
+        run_metadata = {key: value for key, value in state.items() if key != 'results'}
+        
+        with profile_run('scrape', profile, dict(run_metadata, resumed=True)):
+            try:
+                return self._scrape_pages(state['url'], state['max_pages'], state['use_proxy'], 
+                                          state['incremental'], crawl_checkpoint, state)
+            finally:
+                crawl_checkpoint.close()
+
+    def _scrape_pages(self, 
+                      url: Optional[str], 
+                      max_pages: int, 
+                      use_proxy: bool, 
+                      incremental: bool = False, 
+                      checkpoint: Optional[CrawlCheckpoint] = None, 
+                      resume_state: Optional[Dict] = None) -> ToolTable:
+        """
+        Follow listing pages starting at url and extract tools from each
+        
+        Args:
+            url (Optional[str]): Target URL to scrape
+            max_pages (int): Maximum number of pages to scrape
+            use_proxy (bool): Whether to use proxy servers
+            incremental (bool): Reuse stored extractions for unchanged pages
+            checkpoint (Optional[CrawlCheckpoint]): Checkpoint to write progress to
+            resume_state (Optional[Dict]): Loaded checkpoint state to continue from
+        
+        Returns:
+            ToolTable: Scraped tools
         """
         # Logging in multilingual context
-        logger.info(f"Starting scraping for {url} | اِبدأ استخراج المحتوى من {url}")
+        logger.info("Starting scraping for %s | اِبدأ استخراج المحتوى من %s", url, url)
         
-        results = []
+        results = ToolTable()
         current_page = 1
+        start_url = url
+        
+        if resume_state is not None:
+            # Continue exactly where the last checkpoint left off
+            for page in resume_state['results']:
+                results.add_page(page['url'], page['page'], page['language'], page['tools'])
+            start_url = resume_state['start_url']
+            current_page = resume_state['page']
+            results.run_id = resume_state.get('run_id')
+            logger.info("Resuming job %s at page %d | استئناف المهمة %s من الصفحة %d", 
+                        checkpoint.job, current_page, checkpoint.job, current_page)
+        
+        fingerprints = FingerprintStore() if incremental else None
+        if incremental:
+            # What the previous run of this crawl stored, before this run updates it
+            previous_tools = fingerprints.crawl_tools(start_url)
+            results.diff = ScrapeDiff()
+            if resume_state is not None:
+                for page in resume_state['results']:
+                    results.diff.record_page(page['url'], page['tools'], changed=False)
+        
+        # Persist pages to the result store in batched transactions
+        store = get_store()
+        pending_pages = []
+        batch_size = config.get('storage.batch_size', 20)
+        if store is not None and results.run_id is None:
+            results.run_id = store.start_run(start_url, self.language)
+        
+        def crawl_state(next_url: Optional[str], next_page: int) -> Dict:
+            return {
+                'start_url': start_url, 
+                'url': next_url, 
+                'page': next_page, 
+                'max_pages': max_pages, 
+                'use_proxy': use_proxy, 
+                'incremental': incremental, 
+                'language': self.language, 
+                'run_id': results.run_id
+            }
         
-        while current_page <= max_pages:
+        if checkpoint is not None and resume_state is None:
+            checkpoint.start()
+            checkpoint.save(crawl_state(url, current_page))
+            logger.info("Checkpointing scrape as job %s | حفظ نقاط استئناف الاستخراج باسم %s", 
+                        checkpoint.job, checkpoint.job)
+        
+        failed = False
+        while url and current_page <= max_pages:
             try:
-                # Prepare request parameters
-                headers = self._get_headers()
-                proxies = self._select_proxy() if use_proxy else None
-                
-                # Send request
-                response = requests.get(
-                    url, 
-                    headers=headers, 
-                    proxies=proxies, 
-                    timeout=self.timeout
-                )
+                response = self._fetch(url, use_proxy, current_page)
                 
-                # Check response
-                response.raise_for_status()
+                previous = fingerprints.get(url) if incremental else None
+                raw_hash = raw_fingerprint(response.content) if incremental else None
                 
-                # Parse content
-                soup = BeautifulSoup(response.text, 'html.parser')
+                # Rendered pages can change without their static shell changing
+                reusable = previous is not None and not previous.get('rendered')
                 
-                # Extract tools
-                tools = self._extract_tool_details(soup)
-                
-                # If no tools found, try more aggressive extraction
-                if not tools:
-                    # Attempt to find text blocks that might represent tools
-                    text_blocks = soup.find_all(['div', 'article', 'section'], 
-                                                text=re.compile(r'\b(AI|tool|app|service)\b', re.IGNORECASE))
+                if reusable and previous['raw_hash'] == raw_hash:
+                    # Byte-identical page: skip parsing and extraction entirely
+                    metrics.inc('pages_unchanged')
+                    fingerprints.touch(url, raw_hash, start_url)
+                    tools = previous['tools']
+                    results.diff.record_page(url, tools, changed=False)
+                    next_url = previous['next_url']
+                else:
+                    # Parse content
+                    soup = self._parse(response)
+                    rendered = False
                     
-                    for block in text_blocks:
-                        name = block.find(['h2', 'h3', 'strong'])
-                        desc = block.find('p')
-                        
-                        if name and desc:
-                            tools.append({
-                                'name': name.get_text(strip=True),
-                                'description': desc.get_text(strip=True),
-                                'category': 'Discovered',
-                                'rating': 'N/A'
-                            })
+                    content_hash = content_fingerprint(soup) if incremental else None
+                    if reusable and previous['content_hash'] == content_hash:
+                        # Only markup or boilerplate changed: reuse the stored extraction
+                        metrics.inc('pages_unchanged')
+                        tools = previous['tools']
+                        results.diff.record_page(url, tools, changed=False)
+                    else:
+                        tools, soup, rendered = self._extract_page(soup, response.url or url)
+                        if incremental:
+                            results.diff.record_page(url, tools)
+                    
+                    next_url = self._find_next_url(soup, response.url or url)
+                    if incremental:
+                        fingerprints.put(url, raw_hash, content_hash, next_url, tools, rendered, start_url)
                 
                 # Log if still no tools found
                 if not tools:
-                    logger.warning(f"No tools found on page {current_page} | لم يتم العثور على أدوات في الصفحة {current_page}")
+                    logger.warning("No tools found on page %d | لم يتم العثور على أدوات في الصفحة %d", current_page, current_page)
                     break
                 
-                results.append({
-                    'url': url,
-                    'page': current_page,
-                    'language': self.language,
-                    'tools': tools
-                })
+                metrics.inc('tools_extracted', len(tools))
+                results.add_page(url, current_page, self.language, tools)
+                
+                if store is not None:
+                    pending_pages.append((url, current_page, self.language, tools))
+                if checkpoint is not None:
+                    checkpoint.record_page(url, current_page, self.language, tools)
                 
-                # Find next page link
-                next_page_link = soup.find('a', text=['Next', 'التالي', 'Next Page', 'الصفحة التالية'])
-                if not next_page_link:
+                # Store batches and checkpoints are written together, so a resumed
+                # crawl never stores a page twice
+                if ((store is not None and len(pending_pages) >= batch_size) 
+                        or (checkpoint is not None and checkpoint.due())):
+                    if pending_pages:
+                        store.add_pages(results.run_id, pending_pages)
+                        pending_pages = []
+                    if checkpoint is not None:
+                        checkpoint.save(crawl_state(next_url, current_page + 1))
+                
+                # Follow next page link
+                if not next_url:
                     break
                 
-                url = next_page_link.get('href')
+                url = next_url
                 current_page += 1
                 
                 # Wait between requests
                 time.sleep(self.wait_time)
                 
             except requests.exceptions.RequestException as e:
-                logger.error(f"Scraping error: {e} | خطأ في استخراج المحتوى: {e}")
+                metrics.inc('fetch_errors')
+                logger.error("Scraping error: %s | خطأ في استخراج المحتوى: %s", e, e)
+                failed = True
                 break
         
+        if pending_pages:
+            store.add_pages(results.run_id, pending_pages)
+        
+        if checkpoint is not None:
+            if failed:
+                # Keep the checkpoint so the failed page is retried on resume
+                checkpoint.save(crawl_state(url, current_page))
+                logger.info("Scrape can be resumed with job %s | يمكن استئناف الاستخراج بالمهمة %s", 
+                            checkpoint.job, checkpoint.job)
+            else:
+                checkpoint.finish()
+        
+        if incremental:
+            # Tools on pages a completed run no longer reached count as removed;
+            # after a fetch error they are carried over with their pages
+            results.diff.finish(previous_tools, complete=not failed)
+            if not failed:
+                for page_url in fingerprints.crawl_pages(start_url):
+                    if page_url not in results.diff.pages:
+                        fingerprints.forget(page_url)
+            fingerprints.save()
+            logger.info("Incremental scrape diff: %s | فروقات الاستخراج التزايدي: %s",
+                        results.diff.summary(), results.diff.summary())
+        
         return results
 
     def export_results(self, 
-                       results: List[Dict[str, Union[str, List[Dict[str, str]]]]], 
+                       results: Union[ToolTable, List[Dict[str, Union[str, List[Dict[str, str]]]]]], 
                        format: str = 'json') -> str:
         """
         Export scraping results in various formats
         
         Args:
-            results (List[Dict]): Scraped content
-            format (str): Export format (json, csv, excel, parquet)
+            results (Union[ToolTable, List[Dict]]): Scraped content
+            format (str): Export format (json, csv, excel, parquet, arrow)
         
         Returns:
             str: Path to exported file
@@ -298,37 +717,78 @@ class WebScraper:
         export_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'exports')
         os.makedirs(export_dir, exist_ok=True)
         
-        # Flatten tools for DataFrame
-        flat_results = []
-        for result in results:
-            for tool in result.get('tools', []):
-                flat_tool = tool.copy()
-                flat_tool['url'] = result['url']
-                flat_tool['page'] = result['page']
-                flat_tool['language'] = result['language']
-                flat_results.append(flat_tool)
+        table = ToolTable.from_results(results)
+        store = get_store()
         
-        # Convert to DataFrame
-        df = pd.DataFrame(flat_results)
+        if store is not None:
+            # Export as a view over the stored run
+            if table.run_id is None:
+                table.run_id = store.save_results(table)
+            df = store.query_tools(run_id=table.run_id)[list(EXPORT_COLUMNS)]
+        else:
+            # Hand the accumulated columns to pandas
+            df = table.to_pandas()
         
         # Generate filename
         timestamp = time.strftime("%Y%m%d-%H%M%S")
         base_filename = f'scrape_results_{timestamp}'
         
         # Export based on format
-        if format == 'json':
-            filepath = os.path.join(export_dir, f'{base_filename}.json')
-            df.to_json(filepath, orient='records', force_ascii=False)
-        elif format == 'csv':
-            filepath = os.path.join(export_dir, f'{base_filename}.csv')
-            df.to_csv(filepath, index=False, encoding='utf-8')
-        elif format == 'excel':
-            filepath = os.path.join(export_dir, f'{base_filename}.xlsx')
-            df.to_excel(filepath, index=False)
-        elif format == 'parquet':
-            filepath = os.path.join(export_dir, f'{base_filename}.parquet')
-            df.to_parquet(filepath)
-        else:
-            raise ValueError(f"Unsupported export format: {format}")
+        with metrics.timer('export'):
+            if format == 'json':
+                filepath = os.path.join(export_dir, f'{base_filename}.json')
+                df.to_json(filepath, orient='records', force_ascii=False)
+            elif format == 'csv':
+                filepath = os.path.join(export_dir, f'{base_filename}.csv')
+                df.to_csv(filepath, index=False, encoding='utf-8')
+            elif format == 'excel':
+                filepath = os.path.join(export_dir, f'{base_filename}.xlsx')
+                df.to_excel(filepath, index=False)
+            elif format == 'parquet':
+                filepath = os.path.join(export_dir, f'{base_filename}.parquet')
+                typed_tools_frame(df).to_parquet(
+                    filepath, 
+                    index=False, 
+                    compression=config.get('export.dataset.compression.parquet', 'zstd')
+                )
+            elif format == 'arrow':
+                filepath = os.path.join(export_dir, f'{base_filename}.arrow')
+                # Uncompressed so the file can be memory-mapped
+                typed_tools_frame(df).reset_index(drop=True).to_feather(filepath, compression='uncompressed')
+            else:
+                raise ValueError(f"Unsupported export format: {format}")
         
+        metrics.inc('rows_exported', len(df))
         return filepath
+
+    def export_dataset(self, 
+                       results: Union[ToolTable, List[Dict[str, Union[str, List[Dict[str, str]]]]]], 
+                       format: str = 'parquet', 
+                       partition_by: Optional[List[str]] = None, 
+                       compression: Optional[str] = None) -> str:
+        """
+        Export scraping results as a partitioned Parquet or Arrow IPC dataset
+        
+        Args:
+            results (Union[ToolTable, List[Dict]]): Scraped content
+            format (str): Dataset format (parquet, arrow)
+            partition_by (Optional[List[str]]): Partition columns
+                                                (defaults to export.dataset.partition_by)
+            compression (Optional[str]): Parquet codec (defaults to
+                                         export.dataset.compression.parquet;
+                                         Arrow is written uncompressed)
+        
+        Returns:
+            str: Path to the dataset root directory
+        """
+        table = ToolTable.from_results(results)
+        store = get_store()
+        
+        if store is not None:
+            if table.run_id is None:
+                table.run_id = store.save_results(table)
+            df = store.query_tools(run_id=table.run_id)
+        else:
+            df = table.to_pandas()
+        
+        return write_dataset(df, format=format, partition_by=partition_by, compression=compression)
@@ -0,0 +1,79 @@
+import re
+from typing import Iterable, Iterator, List, Optional
+
+from src.utils.config import config
+
+# Sentence-final punctuation in English and Arabic (including Urdu/Persian full stop)
+_SENTENCE_END = re.compile(r'(?<=[.!?؟۔؛…])\s+|(?<=[.!?؟۔؛…]["\'»”)\]])\s+|\n+')
+
+# Clause separators used to break up overlong sentences
+_CLAUSE_BREAK = re.compile(r'(?<=[,،;:])\s+')
+
+# Lowercased tokens that end with a period without ending the sentence
+_ABBREVIATIONS = frozenset({
+    'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'sr.', 'jr.', 'st.', 'vs.', 'etc.',
+    'e.g.', 'i.e.', 'inc.', 'ltd.', 'co.', 'no.', 'fig.', 'approx.', 'u.s.'
+})
+
+# A fragment must contain at least one letter (Latin, Arabic or other script)
+_HAS_LETTER = re.compile(r'[^\W\d_]')
+
+
+def _merge_abbreviations(pieces: Iterable[str]) -> Iterator[str]:
+    pending = ''
+    for piece in pieces:
+        pending = f'{pending} {piece}' if pending else piece
+        last_token = pending.rsplit(None, 1)[-1].lower() if pending.strip() else ''
+        # "Dr." or a single initial such as "J." does not end a sentence
+        if last_token in _ABBREVIATIONS or re.fullmatch(r'[a-z]\.', last_token):
+            continue
+        yield pending
+        pending = ''
+    if pending:
+        yield pending
+
+
+def _split_long(sentence: str, max_chars: int) -> Iterator[str]:
+    if len(sentence) <= max_chars:
+        yield sentence
+        return
+    current = ''
+    for clause in _CLAUSE_BREAK.split(sentence):
+        if current and len(current) + len(clause) + 1 > max_chars:
+            yield current
+            current = clause
+        else:
+            current = f'{current} {clause}' if current else clause
+    if current:
+        yield current
+
+
+def split_sentences(text: str,
+                    min_chars: Optional[int] = None,
+                    max_chars: Optional[int] = None) -> List[str]:
+    """
+    Split Arabic/English text into sentences
+
+    Sentences end at . ! ? ؟ ۔ ؛ … followed by whitespace, or at line breaks.
+    Decimal numbers and common abbreviations do not split; sentences longer
+    than max_chars are broken at commas (, ،) and semicolons; fragments
+    without any letters or shorter than min_chars are dropped.
+
+    Args:
+        text (str): Input text
+        min_chars (Optional[int]): Shortest sentence kept
+        max_chars (Optional[int]): Longest sentence before clause splitting
+
+    Returns:
+        List[str]: Sentences in text order
+    """
+    min_chars = min_chars if min_chars is not None else config.get('analyzer.segmentation.min_chars', 3)
+    max_chars = max_chars or config.get('analyzer.segmentation.max_chars', 1000)
+
+    sentences = []
+    for sentence in _merge_abbreviations(_SENTENCE_END.split(text)):
+        sentence = ' '.join(sentence.split())
+        for part in _split_long(sentence, max_chars):
+            if len(part) >= min_chars and _HAS_LETTER.search(part):
+                sentences.append(part)
+    return sentences
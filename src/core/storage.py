@@ -0,0 +1,340 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from src.utils.config import config
+from src.utils.logging import logger
+from src.utils.metrics import metrics
+
+# Relative database paths are resolved against the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    start_url TEXT,
+    language TEXT,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    url TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    page INTEGER,
+    language TEXT,
+    scraped_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tools (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    page_id INTEGER NOT NULL REFERENCES pages(id),
+    name TEXT NOT NULL,
+    description TEXT,
+    category TEXT,
+    rating TEXT,
+    url TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    page INTEGER,
+    language TEXT,
+    scraped_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    kind TEXT,
+    language TEXT,
+    model TEXT,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages(url);
+CREATE INDEX IF NOT EXISTS idx_pages_domain ON pages(domain, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_tools_run ON tools(run_id);
+CREATE INDEX IF NOT EXISTS idx_tools_url ON tools(url);
+CREATE INDEX IF NOT EXISTS idx_tools_domain ON tools(domain, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_tools_category ON tools(category);
+CREATE INDEX IF NOT EXISTS idx_tools_language ON tools(language);
+CREATE INDEX IF NOT EXISTS idx_tools_scraped_at ON tools(scraped_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses(kind, created_at);
+"""
+
+# Columns returned by tool queries, in export column order
+_TOOL_COLUMNS = ('name', 'description', 'category', 'rating', 'url', 'page', 'language', 'domain', 'scraped_at', 'run_id')
+
+# Low-cardinality columns loaded as pandas categoricals
+_CATEGORICAL_COLUMNS = ('category', 'url', 'language', 'domain')
+
+# A page ready to be stored: (url, page number, language, tools)
+PageRecord = Tuple[str, int, str, List[Dict[str, str]]]
+
+
+def domain_of(url: str) -> str:
+    """
+    Extract the lowercase host of a URL
+
+    Args:
+        url (str): Page URL
+
+    Returns:
+        str: Domain without port
+    """
+    return (urlparse(url).hostname or '').lower()
+
+
+class ResultStore:
+    """
+    Embedded SQLite store for scraped pages, tools and analysis results
+
+    The database runs in WAL mode so the app can query it while a crawl is
+    writing. Writes are serialized through a single connection.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and create if needed) the result database
+
+        Args:
+            path (Optional[str]): Database file path
+        """
+        path = path or config.get('storage.path', 'data/results.db')
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def start_run(self, start_url: Optional[str], language: Optional[str]) -> int:
+        """
+        Register a new crawl run
+
+        Args:
+            start_url (Optional[str]): First URL of the crawl
+            language (Optional[str]): Scraping language
+
+        Returns:
+            int: Run id
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO runs (start_url, language, started_at) VALUES (?, ?, ?)',
+                (start_url, language, time.time())
+            )
+            return cursor.lastrowid
+
+    def add_pages(self, run_id: int, pages: Iterable[PageRecord]) -> int:
+        """
+        Insert a batch of pages and their tools in one transaction
+
+        Args:
+            run_id (int): Run id from start_run
+            pages (Iterable[PageRecord]): (url, page, language, tools) tuples
+
+        Returns:
+            int: Number of tools inserted
+        """
+        inserted = 0
+        with metrics.timer('store_write'), self._lock, self._conn:
+            for url, page, language, tools in pages:
+                scraped_at = time.time()
+                domain = domain_of(url)
+                page_id = self._conn.execute(
+                    'INSERT INTO pages (run_id, url, domain, page, language, scraped_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (run_id, url, domain, page, language, scraped_at)
+                ).lastrowid
+                self._conn.executemany(
+                    'INSERT INTO tools (run_id, page_id, name, description, category, rating, '
+                    'url, domain, page, language, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    [
+                        (run_id, page_id, tool['name'], tool.get('description'),
+                         tool.get('category'), tool.get('rating'),
+                         url, domain, page, language, scraped_at)
+                        for tool in tools
+                    ]
+                )
+                inserted += len(tools)
+        return inserted
+
+    def save_results(self, results: Iterable[Dict[str, Any]], start_url: Optional[str] = None) -> int:
+        """
+        Store a complete set of per-page results as a new run
+
+        Args:
+            results (Iterable[Dict[str, Any]]): Per-page results (e.g. a ToolTable)
+            start_url (Optional[str]): First URL of the crawl
+
+        Returns:
+            int: Run id
+        """
+        pages = [(r['url'], r['page'], r['language'], r.get('tools', [])) for r in results]
+        run_id = self.start_run(start_url or (pages[0][0] if pages else None),
+                                pages[0][2] if pages else None)
+        self.add_pages(run_id, pages)
+        return run_id
+
+    def query_tools(self,
+                    url: Optional[str] = None,
+                    domain: Optional[str] = None,
+                    category: Optional[str] = None,
+                    language: Optional[str] = None,
+                    run_id: Optional[int] = None,
+                    since: Optional[float] = None,
+                    until: Optional[float] = None,
+                    limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Query stored tools using the indexed columns
+
+        Args:
+            url (Optional[str]): Exact page URL
+            domain (Optional[str]): Site domain
+            category (Optional[str]): Tool category
+            language (Optional[str]): Scraping language
+            run_id (Optional[int]): Crawl run id
+            since (Optional[float]): Minimum scrape time (epoch seconds)
+            until (Optional[float]): Maximum scrape time (epoch seconds)
+            limit (Optional[int]): Maximum rows returned (newest first)
+
+        Returns:
+            pd.DataFrame: Matching tools
+        """
+        clauses, params = [], []
+        for column, value in (('url', url), ('domain', domain and domain.lower()),
+                              ('category', category), ('language', language), ('run_id', run_id)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if since is not None:
+            clauses.append('scraped_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('scraped_at <= ?')
+            params.append(until)
+
+        sql = f"SELECT {', '.join(_TOOL_COLUMNS)} FROM tools"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY scraped_at DESC, id' if limit else ' ORDER BY id'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        with metrics.timer('store_query'), self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+
+        for column in _CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype('category')
+        return df
+
+    def domains(self) -> pd.DataFrame:
+        """
+        Summarize stored sites
+
+        Returns:
+            pd.DataFrame: Tool count and last scrape time per domain
+        """
+        with self._lock:
+            return pd.read_sql_query(
+                'SELECT domain, COUNT(*) AS tools, MAX(scraped_at) AS last_scraped_at '
+                'FROM tools GROUP BY domain ORDER BY tools DESC',
+                self._conn
+            )
+
+    def save_analysis(self,
+                      results: Dict[str, Any],
+                      kind: Optional[str] = None,
+                      model: Optional[str] = None) -> int:
+        """
+        Store an analysis result
+
+        Args:
+            results (Dict[str, Any]): Analysis result dict
+            kind (Optional[str]): Analysis type (summary, technical, custom)
+            model (Optional[str]): Model used for the analysis
+
+        Returns:
+            int: Analysis id
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO analyses (kind, language, model, result, created_at) VALUES (?, ?, ?, ?, ?)',
+                (kind, results.get('language'), model,
+                 json.dumps(results, ensure_ascii=False, default=str), time.time())
+            )
+            return cursor.lastrowid
+
+    def get_analysis(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute('SELECT result FROM analyses WHERE id = ?', (analysis_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query_analyses(self,
+                       kind: Optional[str] = None,
+                       since: Optional[float] = None,
+                       limit: Optional[int] = 100) -> pd.DataFrame:
+        """
+        Query stored analysis results, newest first
+
+        Args:
+            kind (Optional[str]): Analysis type
+            since (Optional[float]): Minimum creation time (epoch seconds)
+            limit (Optional[int]): Maximum rows returned
+
+        Returns:
+            pd.DataFrame: Matching analyses
+        """
+        clauses, params = [], []
+        if kind is not None:
+            clauses.append('kind = ?')
+            params.append(kind)
+        if since is not None:
+            clauses.append('created_at >= ?')
+            params.append(since)
+
+        sql = 'SELECT id, kind, language, model, result, created_at FROM analyses'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY created_at DESC'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> Optional[ResultStore]:
+    """
+    Get the shared result store
+
+    Returns:
+        Optional[ResultStore]: Store instance, or None if storage is disabled
+    """
+    global _store
+    if not config.get('storage.enabled', True):
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = ResultStore()
+            except sqlite3.Error as e:
+                logger.error("Could not open result store: %s | تعذر فتح قاعدة النتائج: %s", e, e)
+                return None
+        return _store
@@ -0,0 +1,196 @@
+import codecs
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+# Elements that never have an end tag
+_VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+})
+
+
+class UnsupportedContentTypeError(requests.exceptions.RequestException):
+    """Raised when a response is not an HTML document"""
+
+
+def check_content_type(response: requests.Response, allowed: Sequence[str]):
+    """
+    Reject non-HTML responses before their body is downloaded
+
+    Args:
+        response (requests.Response): Streaming response (headers only read)
+        allowed (Sequence[str]): Accepted media types
+
+    Raises:
+        UnsupportedContentTypeError: If the declared media type is not allowed
+    """
+    content_type = response.headers.get('Content-Type')
+    if not content_type:
+        return
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    if media_type not in allowed:
+        raise UnsupportedContentTypeError(
+            f"Unsupported content type {media_type} for {response.url}", response=response
+        )
+
+
+class ListingWatcher(HTMLParser):
+    """
+    Feed-based scan of a listing page that knows when the tool cards are over
+
+    Only the tag structure is tracked (no tree is built): the number of tool
+    cards seen, whether the lowest common ancestor of all cards seen so far
+    has closed, and whether a next-page link appeared after it closed.
+    Cards in grid columns or rows therefore keep the listing open until the
+    grid itself closes, and a card seen after a closing (e.g. the next row)
+    reopens it. A page with a single card never counts as done, since its
+    container is unknown.
+    """
+
+    def __init__(self,
+                 card_classes: Iterable[str],
+                 next_link_texts: Iterable[str],
+                 max_cards: int = 0):
+        """
+        Initialize the watcher
+
+        Args:
+            card_classes (Iterable[str]): Class names that mark a tool card
+            next_link_texts (Iterable[str]): Link texts of the next-page link
+            max_cards (int): Stop after this many cards (0 = no limit)
+        """
+        super().__init__(convert_charrefs=True)
+        self.card_classes = frozenset(card_classes)
+        self.next_link_texts = frozenset(text.casefold() for text in next_link_texts)
+        self.max_cards = max_cards
+
+        self.cards = 0
+        self.container_closed = False
+        self.next_link_seen = False
+        self._stack: List[str] = []
+        # Serial numbers of the open elements, identifying each card's ancestors
+        self._open_ids: List[int] = []
+        self._serial = 0
+        self._first_card_path: Optional[List[int]] = None
+        self._card_depth: Optional[int] = None
+        self._container_depth: Optional[int] = None
+        self._link_text: Optional[List[str]] = None
+
+    def _card_opened(self, tag: str):
+        self.cards += 1
+        if self._card_depth is not None:
+            # Nested inside another card (e.g. a card-classed badge)
+            return
+        if self._first_card_path is None:
+            self._first_card_path = list(self._open_ids)
+        else:
+            # Depth of the lowest common ancestor of this card and the first one
+            common = 0
+            for first, current in zip(self._first_card_path, self._open_ids):
+                if first != current:
+                    break
+                common += 1
+            if self._container_depth is None or common < self._container_depth:
+                self._container_depth = common
+            self.container_closed = False
+        if tag not in _VOID_ELEMENTS:
+            self._card_depth = len(self._stack)
+
+    def _open(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        for name, value in attrs:
+            if name == 'class' and value and not self.card_classes.isdisjoint(value.split()):
+                self._card_opened(tag)
+                break
+        if tag == 'a':
+            self._link_text = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self._open(tag, attrs)
+        if tag not in _VOID_ELEMENTS:
+            self._serial += 1
+            self._stack.append(tag)
+            self._open_ids.append(self._serial)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self._open(tag, attrs)
+
+    def handle_endtag(self, tag: str):
+        if tag in self._stack:
+            # Implicitly close unclosed children (e.g. <li>, <p>)
+            while self._stack.pop() != tag:
+                self._open_ids.pop()
+            self._open_ids.pop()
+        if self._card_depth is not None and len(self._stack) <= self._card_depth:
+            self._card_depth = None
+        if self._container_depth is not None and len(self._stack) < self._container_depth:
+            self.container_closed = True
+        if tag == 'a' and self._link_text is not None:
+            # Only pagination below the cards ends the listing; top links do not
+            if (self.container_closed
+                    and ' '.join(''.join(self._link_text).split()).casefold() in self.next_link_texts):
+                self.next_link_seen = True
+            self._link_text = None
+
+    def handle_data(self, data: str):
+        if self._link_text is not None:
+            self._link_text.append(data)
+
+    @property
+    def listing_done(self) -> bool:
+        """True once enough cards were seen or their container has closed"""
+        return self.container_closed or bool(self.max_cards and self.cards >= self.max_cards)
+
+
+def read_body(response: requests.Response,
+              max_bytes: int,
+              chunk_size: int = 65536,
+              watcher: Optional[ListingWatcher] = None,
+              tail_bytes: int = 0,
+              encoding: str = 'utf-8') -> Tuple[bytes, Optional[str]]:
+    """
+    Read a streaming response body with a size cap and optional early stop
+
+    With a watcher, reading stops once the listing is done and the next-page
+    link was seen, or ``tail_bytes`` after the listing is done (pagination
+    normally follows the cards closely).
+
+    Args:
+        response (requests.Response): Response opened with stream=True
+        max_bytes (int): Maximum body bytes read
+        chunk_size (int): Bytes per read
+        watcher (Optional[ListingWatcher]): Listing watcher fed as bytes arrive
+        tail_bytes (int): Bytes read after the listing is done
+        encoding (str): Encoding used to feed the watcher
+
+    Returns:
+        Tuple[bytes, Optional[str]]: Body and why reading stopped early
+                                     (size_limit, early_stop or None)
+    """
+    chunks = []
+    size = 0
+    stop_at = None
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace') if watcher is not None else None
+
+    for chunk in response.iter_content(chunk_size):
+        if size + len(chunk) > max_bytes:
+            chunks.append(chunk[:max_bytes - size])
+            return b''.join(chunks), 'size_limit'
+        chunks.append(chunk)
+        size += len(chunk)
+
+        if watcher is not None:
+            watcher.feed(decoder.decode(chunk))
+            if watcher.listing_done:
+                if watcher.next_link_seen:
+                    return b''.join(chunks), 'early_stop'
+                if stop_at is None:
+                    stop_at = size + tail_bytes
+                if size >= stop_at:
+                    return b''.join(chunks), 'early_stop'
+            else:
+                # More cards followed (e.g. the next grid row)
+                stop_at = None
+
+    return b''.join(chunks), None
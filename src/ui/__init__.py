@@ -1,4 +1,5 @@
 # UI package initialization
 from .styles import apply_custom_theme, sidebar_menu
+from .results import render_results_table
 
-__all__ = ['apply_custom_theme', 'sidebar_menu']
+__all__ = ['apply_custom_theme', 'sidebar_menu', 'render_results_table']
@@ -0,0 +1,220 @@
+import streamlit as st
+import pandas as pd
+from typing import Literal, Optional, Sequence, Tuple
+
+from src.utils.config import config
+from src.core.records import ToolTable
+
+# Columns shown in the results grid, in display order
+GRID_COLUMNS = ['name', 'category', 'rating', 'page', 'url']
+
+# Columns the free-text search looks at
+SEARCH_COLUMNS = ('name', 'description', 'category', 'url')
+
+# Sortable columns; rating sorts by its numeric value
+SORT_COLUMNS = ('page', 'name', 'category', 'rating')
+
+texts = {
+    'ar': {
+        'search': 'بحث',
+        'search_placeholder': 'الاسم أو الوصف أو الفئة أو الرابط',
+        'categories': 'الفئات',
+        'sort_by': 'ترتيب حسب',
+        'descending': 'تنازلي',
+        'page': 'الصفحة',
+        'showing': 'عرض {start:,}-{end:,} من {total:,} أداة',
+        'no_match': 'لا توجد أدوات مطابقة',
+        'details': 'تفاصيل الأداة',
+        'description': 'الوصف',
+        'category': 'الفئة',
+        'rating': 'التقييم',
+        'source': 'المصدر',
+        'columns': {'page': 'الصفحة', 'name': 'الاسم', 'category': 'الفئة', 'rating': 'التقييم', 'url': 'الرابط'}
+    },
+    'en': {
+        'search': 'Search',
+        'search_placeholder': 'Name, description, category or URL',
+        'categories': 'Categories',
+        'sort_by': 'Sort by',
+        'descending': 'Descending',
+        'page': 'Page',
+        'showing': 'Showing {start:,}-{end:,} of {total:,} tools',
+        'no_match': 'No matching tools',
+        'details': 'Tool details',
+        'description': 'Description',
+        'category': 'Category',
+        'rating': 'Rating',
+        'source': 'Source',
+        'columns': {'page': 'Page', 'name': 'Name', 'category': 'Category', 'rating': 'Rating', 'url': 'URL'}
+    }
+}
+
+
+def rating_values(ratings: pd.Series) -> pd.Series:
+    """
+    Extract the numeric part of rating strings such as '4.5 stars'
+
+    Args:
+        ratings (pd.Series): Rating strings ('N/A' when missing)
+
+    Returns:
+        pd.Series: Float ratings, NaN where none was found
+    """
+    return pd.to_numeric(ratings.str.extract(r'(\d+(?:[.,]\d+)?)', expand=False).str.replace(',', '.'),
+                         errors='coerce')
+
+
+def filter_results(frame: pd.DataFrame,
+                   search: str = '',
+                   categories: Sequence[str] = (),
+                   sort_by: str = 'page',
+                   descending: bool = False) -> pd.Index:
+    """
+    Apply search, category filter and sort to the results
+
+    Only row labels are returned, so paging through the same query never
+    copies the frame.
+
+    Args:
+        frame (pd.DataFrame): Results from ToolTable.to_pandas
+        search (str): Case-insensitive text matched against SEARCH_COLUMNS
+        categories (Sequence[str]): Categories to keep (all if empty)
+        sort_by (str): Column from SORT_COLUMNS
+        descending (bool): Sort order
+
+    Returns:
+        pd.Index: Labels of the matching rows in display order
+    """
+    mask = pd.Series(True, index=frame.index)
+    if categories:
+        mask &= frame['category'].isin(categories)
+    search = search.strip().lower()
+    if search:
+        matches = pd.Series(False, index=frame.index)
+        for column in SEARCH_COLUMNS:
+            matches |= frame[column].astype(str).str.lower().str.contains(search, regex=False)
+        mask &= matches
+
+    filtered = frame.loc[mask]
+    if sort_by == 'rating':
+        keys = rating_values(filtered['rating'])
+    elif sort_by in ('name', 'category'):
+        keys = filtered[sort_by].astype(str).str.lower()
+    else:
+        keys = filtered['page']
+    # Stable sort keeps scrape order within equal keys; unrated tools go last
+    return keys.sort_values(ascending=not descending, kind='stable', na_position='last').index
+
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int, int]:
+    """
+    Clamp a page number and compute its row range
+
+    Args:
+        total (int): Number of matching rows
+        page (int): Requested page (1-based)
+        page_size (int): Rows per page
+
+    Returns:
+        Tuple[int, int, int]: (page count, start row, end row)
+    """
+    pages = max((total + page_size - 1) // page_size, 1)
+    page = min(max(page, 1), pages)
+    start = (page - 1) * page_size
+    return pages, start, min(start + page_size, total)
+
+
+def _results_frame(results: ToolTable, key: str) -> pd.DataFrame:
+    # Convert once per result set, not on every rerun
+    cached = st.session_state.get(f'{key}_frame')
+    if cached is None or cached[0] is not results:
+        cached = (results, results.to_pandas())
+        st.session_state[f'{key}_frame'] = cached
+        # Filters of the previous result set may name categories that no longer exist
+        for widget in ('search', 'categories', 'page', 'selected'):
+            st.session_state.pop(f'{key}_{widget}', None)
+    return cached[1]
+
+
+def _query_rows(frame: pd.DataFrame, key: str, query: Tuple) -> pd.Index:
+    # Re-filter only when the query changes; page flips reuse the labels
+    cached = st.session_state.get(f'{key}_query')
+    if cached is None or cached[0] is not frame or cached[1] != query:
+        cached = (frame, query, filter_results(frame, *query))
+        st.session_state[f'{key}_query'] = cached
+        # A new query starts on its first page
+        st.session_state[f'{key}_page'] = 1
+    return cached[2]
+
+
+def render_tool_details(record: pd.Series, language: Literal['ar', 'en'] = 'ar'):
+    """
+    Render the full record of one tool
+
+    Args:
+        record (pd.Series): Row of the results frame
+        language (str): Current language
+    """
+    labels = texts[language]
+    st.markdown(f"#### 🛠️ {record['name']}")
+    st.markdown(f"**{labels['description']}:** {record['description'] or '-'}")
+    st.markdown(f"**{labels['category']}:** {record['category']}")
+    st.markdown(f"**{labels['rating']}:** {record['rating']}")
+    st.markdown(f"**{labels['source']}:** {record['url']} (#{record['page']})")
+
+
+def render_results_table(results: ToolTable,
+                         language: Literal['ar', 'en'] = 'ar',
+                         key: str = 'results',
+                         page_size: Optional[int] = None):
+    """
+    Render scraped tools as one paginated, searchable grid with a detail pane
+
+    Searching, filtering and sorting run as vectorized pandas operations on
+    the server, and only the current page (at most ui.max_results_display
+    rows) is sent to the browser, so rendering cost does not grow with the
+    size of the result set. Widget state lives in st.session_state under
+    ``key``, so several tables can coexist on one page.
+
+    Args:
+        results (ToolTable): Scraped tools
+        language (str): Current language
+        key (str): Session state prefix of this table
+        page_size (Optional[int]): Rows per page (defaults to ui.max_results_display)
+    """
+    labels = texts[language]
+    page_size = page_size or config.get('ui.max_results_display', 100)
+    frame = _results_frame(results, key)
+
+    search_column, category_column, sort_column, order_column = st.columns([3, 3, 2, 1])
+    search = search_column.text_input(labels['search'], key=f'{key}_search',
+                                      placeholder=labels['search_placeholder'])
+    categories = category_column.multiselect(labels['categories'], list(frame['category'].cat.categories),
+                                             key=f'{key}_categories')
+    sort_by = sort_column.selectbox(labels['sort_by'], SORT_COLUMNS, key=f'{key}_sort',
+                                    format_func=lambda column: labels['columns'][column])
+    descending = order_column.checkbox(labels['descending'], key=f'{key}_descending')
+
+    rows = _query_rows(frame, key, (search, tuple(categories), sort_by, descending))
+    if not len(rows):
+        st.info(labels['no_match'])
+        return
+
+    pages, _, _ = page_bounds(len(rows), 1, page_size)
+    page = st.number_input(labels['page'], min_value=1, max_value=pages, step=1, key=f'{key}_page')
+    _, start, end = page_bounds(len(rows), int(page), page_size)
+    st.caption(labels['showing'].format(start=start + 1, end=end, total=len(rows)))
+
+    page_frame = frame.loc[rows[start:end], GRID_COLUMNS]
+    st.dataframe(
+        page_frame,
+        use_container_width=True,
+        hide_index=True,
+        column_config={column: labels['columns'][column] for column in GRID_COLUMNS}
+    )
+
+    # Details are rendered for the selected row only
+    selected = st.selectbox(labels['details'], page_frame.index, key=f'{key}_selected',
+                            format_func=lambda label: frame.at[label, 'name'])
+    if selected is not None:
+        render_tool_details(frame.loc[selected], language)
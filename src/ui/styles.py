@@ -66,7 +66,7 @@ def set_language(language: str):
     """
     # Validate language input
     if language not in ['ar', 'en']:
-        logger.warning(f"Invalid language: {language}. Defaulting to Arabic.")
+        logger.warning("Invalid language: %s. Defaulting to Arabic.", language)
         language = 'ar'
     
     # Set language in session state
@@ -91,12 +91,14 @@ def sidebar_menu():
             'home': '🏠 الرئيسية',
             'scraper': '🔍 تحليل المواقع',
             'analysis': '📊 تحليل البيانات',
+            'diagnostics': '🩺 التشخيص',
             'settings': '⚙️ الإعدادات'
         },
         'en': {
             'home': '🏠 Home',
             'scraper': '🔍 Web Scraper',
             'analysis': '📊 Data Analysis',
+            'diagnostics': '🩺 Diagnostics',
             'settings': '⚙️ Settings'
         }
     }
@@ -1,5 +1,6 @@
 # Utilities package initialization
 from .config import config
 from .logging import logger
+from .metrics import metrics
 
-__all__ = ['config', 'logger']
+__all__ = ['config', 'logger', 'metrics']
@@ -1,10 +1,233 @@
 import os
+import time
+import logging
+import threading
 import yaml
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Sentinel distinguishing missing keys from legitimately empty values
+_MISSING = object()
+
+# Directory holding the environment config files
+CONFIG_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'config'
+)
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration section fails validation"""
+
+
+@dataclass(frozen=True)
+class ScraperSettings:
+    default_timeout: float = 45
+    headless_mode: bool = False
+    user_agent_rotation: bool = True
+    proxy_support: bool = False
+    encoding: str = 'utf-8'
+    max_retries: int = 3
+    wait_time: float = 5
+    proxies: Tuple[str, ...] = ()
+
+    def validate(self):
+        if self.default_timeout <= 0:
+            raise ConfigError("scraper.default_timeout must be positive")
+        if self.max_retries < 0:
+            raise ConfigError("scraper.max_retries must not be negative")
+        if self.wait_time < 0:
+            raise ConfigError("scraper.wait_time must not be negative")
+
+
+@dataclass(frozen=True)
+class AnalyzerSettings:
+    model: str = 'llama3.2'
+    embedding_model: str = 'sentence-transformers/all-mpnet-base-v2'
+    embedding_backend: str = 'torch'
+    embedding_threads: int = 0
+    chunk_size: int = 2000
+    chunk_overlap: int = 400
+
+    def validate(self):
+        if self.chunk_size <= 0:
+            raise ConfigError("analyzer.chunk_size must be positive")
+        if not 0 <= self.chunk_overlap < self.chunk_size:
+            raise ConfigError("analyzer.chunk_overlap must be between 0 and chunk_size")
+        if self.embedding_backend not in ('torch', 'torch-int8', 'onnx', 'onnx-int8'):
+            raise ConfigError("analyzer.embedding_backend must be torch, torch-int8, onnx or onnx-int8")
+        if self.embedding_threads < 0:
+            raise ConfigError("analyzer.embedding_threads must not be negative")
+
+
+@dataclass(frozen=True)
+class LoggingSettings:
+    console_level: str = 'INFO'
+    file_level: str = 'DEBUG'
+    file_name: str = 'app.log'
+    max_file_size: int = 10 * 1024 * 1024
+    backup_count: int = 5
+    asynchronous: bool = field(default=True, metadata={'key': 'async'})
+    structured: bool = False
+
+    def validate(self):
+        for name in ('console_level', 'file_level'):
+            level = getattr(self, name)
+            if not level.isdigit() and not isinstance(logging.getLevelName(level.upper()), int):
+                raise ConfigError(f"logging.{name} is not a valid level: {getattr(self, name)}")
+        if self.max_file_size <= 0:
+            raise ConfigError("logging.max_file_size must be positive")
+
+
+def _coerce(section: str, name: str, kind: Any, value: Any) -> Any:
+    """
+    Convert a raw YAML value to the declared field type
+
+    Args:
+        section (str): Section name used in error messages
+        name (str): Field name
+        kind (Any): Declared field type
+        value (Any): Raw value
+
+    Returns:
+        Any: Converted value
+    """
+    try:
+        if kind is bool:
+            if isinstance(value, str):
+                return value.strip().lower() in ('1', 'true', 'yes', 'on')
+            return bool(value)
+        if kind in (int, float):
+            if isinstance(value, bool):
+                raise TypeError("boolean given")
+            return kind(value)
+        if kind is str:
+            return str(value)
+        if isinstance(value, (list, tuple)):
+            return tuple(value)
+        return value
+    except (TypeError, ValueError) as e:
+        raise ConfigError(f"Invalid value for {section}.{name}: {value!r} ({e})") from e
+
+
+def _build_section(cls, section: str, raw: Any, errors: Optional[List[str]] = None):
+    """
+    Build and validate a typed settings section
+
+    Args:
+        cls: Settings dataclass
+        section (str): Section name in the YAML file
+        raw (Any): Raw section mapping
+        errors (Optional[List[str]]): Collects validation errors instead of
+                                      raising; the section then gets its defaults
+
+    Returns:
+        Validated settings instance
+
+    Raises:
+        ConfigError: If the section is invalid and errors is None
+    """
+    raw = raw if isinstance(raw, dict) else {}
+    try:
+        values = {}
+        for f in fields(cls):
+            key = f.metadata.get('key', f.name)
+            if key in raw and raw[key] is not None:
+                values[f.name] = _coerce(section, key, f.type, raw[key])
+        settings = cls(**values)
+        settings.validate()
+        return settings
+    except ConfigError as e:
+        if errors is None:
+            raise
+        errors.append(str(e))
+        return cls()
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Recursively convert mappings and lists to read-only equivalents
+
+    Args:
+        value (Any): Parsed YAML value
+
+    Returns:
+        Any: Read-only value
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _flatten(tree: Any, prefix: str = '', flat: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Index every node of the config tree by its dotted key
+
+    Args:
+        tree (Any): Frozen config tree
+        prefix (str): Dotted key of the current node
+        flat (Optional[Dict[str, Any]]): Accumulator
+
+    Returns:
+        Dict[str, Any]: Dotted key to value mapping
+    """
+    if flat is None:
+        flat = {}
+    if isinstance(tree, MappingProxyType):
+        for k, v in tree.items():
+            key = f'{prefix}.{k}' if prefix else str(k)
+            flat[key] = v
+            _flatten(v, key, flat)
+    return flat
+
+
+class ConfigSnapshot:
+    """
+    Immutable, precompiled view of one configuration file
+    """
+    __slots__ = ('path', 'mtime', 'tree', 'scraper', 'analyzer', 'logging', 'errors', '_flat')
+
+    def __init__(self,
+                 raw: Optional[Dict[str, Any]],
+                 path: Optional[str] = None,
+                 mtime: float = 0.0,
+                 strict: bool = True):
+        """
+        Build the snapshot and validate typed sections
+
+        Args:
+            raw (Optional[Dict[str, Any]]): Parsed YAML document
+            path (Optional[str]): Source file path
+            mtime (float): Source file modification time
+            strict (bool): Raise on an invalid typed section; otherwise that
+                           section alone falls back to its defaults and the
+                           error is kept in ``errors``
+
+        Raises:
+            ConfigError: If strict and a typed section fails validation
+        """
+        raw = raw if isinstance(raw, dict) else {}
+        errors = None if strict else []
+        self.path = path
+        self.mtime = mtime
+        self.tree = _freeze(raw)
+        self._flat = _flatten(self.tree)
+        self.scraper = _build_section(ScraperSettings, 'scraper', raw.get('scraper'), errors)
+        self.analyzer = _build_section(AnalyzerSettings, 'analyzer', raw.get('analyzer'), errors)
+        self.logging = _build_section(LoggingSettings, 'logging', raw.get('logging'), errors)
+        self.errors: Tuple[str, ...] = tuple(errors or ())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._flat.get(key, _MISSING)
+        return default if value is _MISSING else value
+
 
 class ConfigManager:
     _instance = None
-    _config: Dict[str, Any] = {}
+    _snapshot: Optional[ConfigSnapshot] = None
 
     def __new__(cls):
         if not cls._instance:
@@ -12,109 +235,199 @@ class ConfigManager:
         return cls._instance
 
     def __init__(self, config_path: Optional[str] = None):
-        if not self._config:
+        if self._snapshot is None:
+            self._config_path = None
+            self._callbacks: List[Callable[[ConfigSnapshot], None]] = []
+            self._watcher: Optional[threading.Thread] = None
             self.load_config(config_path)
 
+    @staticmethod
+    def _default_path() -> str:
+        # Determine environment and select appropriate config
+        env = os.environ.get('ENV', 'production').lower()
+        return os.path.join(CONFIG_DIR, f'{env}.yml')
+
+    @staticmethod
+    def _read_snapshot(config_path: str, strict: bool = True) -> ConfigSnapshot:
+        mtime = os.path.getmtime(config_path)
+        with open(config_path, 'r', encoding='utf-8') as file:
+            return ConfigSnapshot(yaml.safe_load(file), config_path, mtime, strict)
+
     def load_config(self, config_path: Optional[str] = None):
         """
         Load configuration from YAML file
-        
+
+        An invalid typed section (e.g. a negative wait_time) falls back to
+        its own defaults; the rest of the file is still used.
+
         Args:
-            config_path (Optional[str]): Path to config file. 
+            config_path (Optional[str]): Path to config file.
                                          Defaults to production config if not specified.
         """
-        if not config_path:
-            # Determine environment and select appropriate config
-            env = os.environ.get('ENV', 'production').lower()
-            config_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                'config', 
-                f'{env}.yml'
-            )
+        config_path = config_path or self._default_path()
+        self._config_path = config_path
+        # The application logger is configured from this config, so log through the stdlib
+        log = logging.getLogger('ai_web_scraper')
 
         try:
-            with open(config_path, 'r', encoding='utf-8') as file:
-                self._config = yaml.safe_load(file)
+            self._snapshot = self._read_snapshot(config_path, strict=False)
         except FileNotFoundError:
-            print(f"Warning: Config file not found at {config_path}. Using default settings.")
-            self._config = {}
+            log.warning("Config file not found at %s, using default settings | ملف الإعدادات غير موجود: %s",
+                        config_path, config_path)
+            self._snapshot = ConfigSnapshot({}, config_path)
         except yaml.YAMLError as e:
-            print(f"Error parsing config file: {e}")
-            self._config = {}
+            log.error("Could not parse config file %s, using default settings: %s | تعذر تحليل ملف الإعدادات: %s",
+                      config_path, e, e)
+            self._snapshot = ConfigSnapshot({}, config_path)
+
+        for error in self._snapshot.errors:
+            log.error("Invalid configuration, using section defaults: %s | إعدادات غير صالحة، تُستخدم القيم الافتراضية للقسم: %s",
+                      error, error)
+
+        if self.get('app.config_reload.enabled', False):
+            self.watch(self.get('app.config_reload.interval', 2))
+
+    def reload(self) -> bool:
+        """
+        Rebuild the snapshot from disk and swap it in atomically
+
+        The previous snapshot stays active if the file is invalid.
+
+        Returns:
+            bool: True if a new snapshot was installed
+        """
+        try:
+            snapshot = self._read_snapshot(self._config_path)
+        except (OSError, yaml.YAMLError, ConfigError) as e:
+            logging.getLogger('ai_web_scraper').warning(
+                "Config reload failed, keeping previous settings: %s | فشل إعادة تحميل الإعدادات: %s", e, e
+            )
+            return False
+
+        # Readers never lock: they see either the old or the new snapshot
+        self._snapshot = snapshot
+        for callback in list(self._callbacks):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logging.getLogger('ai_web_scraper').error("Config reload callback failed: %s", e)
+        return True
+
+    def on_reload(self, callback: Callable[[ConfigSnapshot], None]):
+        """
+        Register a callback invoked with each newly installed snapshot
+
+        Args:
+            callback (Callable[[ConfigSnapshot], None]): Reload listener
+        """
+        self._callbacks.append(callback)
+
+    def watch(self, interval: float = 2.0):
+        """
+        Start a background thread reloading the config file when it changes
+
+        Args:
+            interval (float): Polling interval in seconds
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+
+        def _poll():
+            last_seen = self._snapshot.mtime
+            while True:
+                time.sleep(interval)
+                try:
+                    mtime = os.path.getmtime(self._config_path)
+                except OSError:
+                    continue
+                if mtime != last_seen:
+                    # Remember the attempt so an invalid file is not retried every tick
+                    last_seen = mtime
+                    self.reload()
+
+        self._watcher = threading.Thread(target=_poll, name='config-watcher', daemon=True)
+        self._watcher.start()
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        return self._snapshot
+
+    @property
+    def scraper(self) -> ScraperSettings:
+        return self._snapshot.scraper
+
+    @property
+    def analyzer(self) -> AnalyzerSettings:
+        return self._snapshot.analyzer
+
+    @property
+    def logging(self) -> LoggingSettings:
+        return self._snapshot.logging
 
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get a configuration value by dot-separated key
-        
+
         Args:
             key (str): Dot-separated configuration key
             default (Any, optional): Default value if key not found
-        
+
         Returns:
             Configuration value or default
         """
-        keys = key.split('.')
-        value = self._config
-        
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k, {})
-            else:
-                return default
-        
-        return value if value != {} else default
+        return self._snapshot.get(key, default)
 
     def get_language_text(self, section: str, key: str, lang: Optional[str] = None) -> str:
         """
         Get localized text for a specific section and key
-        
+
         Args:
             section (str): Section in translations (e.g., 'ui')
             key (str): Specific text key
             lang (Optional[str]): Language code. Defaults to system language.
-        
+
         Returns:
             Localized text string
         """
         # Default to Arabic if not specified
         if not lang:
             lang = self.get('app.languages.default', 'ar')
-        
+
         # Ensure language is supported
         if lang not in self.get('app.languages.available', ['ar', 'en']):
             lang = 'ar'
-        
+
         translations = self.get(f'{section}.translations.{lang}', {})
         return translations.get(key, key)
 
     def is_rtl(self, lang: Optional[str] = None) -> bool:
         """
         Check if the language is Right-to-Left
-        
+
         Args:
             lang (Optional[str]): Language code
-        
+
         Returns:
             bool: True if language is RTL, False otherwise
         """
         if not lang:
             lang = self.get('app.languages.default', 'ar')
-        
+
         return self.get(f'ui.directions.{lang}', 'rtl') == 'rtl'
 
     def get_font(self, lang: Optional[str] = None) -> str:
         """
         Get the appropriate font for a language
-        
+
         Args:
             lang (Optional[str]): Language code
-        
+
         Returns:
             str: Font name
         """
         if not lang:
             lang = self.get('app.languages.default', 'ar')
-        
+
         return self.get(f'ui.fonts.{lang}', 'Cairo' if lang == 'ar' else 'Inter')
 
 # Global configuration instance
@@ -1,58 +1,204 @@
 import logging
 import sys
-from logging.handlers import RotatingFileHandler
+import json
+import time
+import queue
+import atexit
+import threading
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from src.utils.config import config
 import os
 
+# Background listener draining the log queue (None when logging is synchronous)
+_listener = None
+
+
+def _to_level(value, default: int) -> int:
+    """
+    Convert a configured level name or number to a logging level
+
+    Args:
+        value: Level name (e.g. 'INFO') or number
+        default (int): Level used when value is missing or unknown
+
+    Returns:
+        int: Logging level
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        if value.isdigit():
+            return int(value)
+        level = logging.getLevelName(value.upper())
+        if isinstance(level, int):
+            return level
+    return default
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'time': self.formatTime(record, self.datefmt),
+            'logger': record.name,
+            'level': record.levelname,
+            'file': f'{record.filename}:{record.lineno}',
+            'message': record.getMessage()
+        }
+        if getattr(record, 'suppressed', 0):
+            payload['suppressed'] = record.suppressed
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limit repetitive warnings sharing the same message template
+
+    The first ``burst`` records per template are let through in every
+    ``window`` seconds; the rest are dropped and their count is reported on
+    the next record that passes.
+    """
+
+    def __init__(self, window: float = 60.0, burst: int = 5, level: int = logging.WARNING):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.level = level
+        self._lock = threading.Lock()
+        self._seen = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != self.level:
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            window_start, count, suppressed = self._seen.get(key, (now, 0, 0))
+            if now - window_start >= self.window:
+                window_start, count = now, 0
+
+            if count < self.burst:
+                self._seen[key] = (window_start, count + 1, 0)
+                if suppressed:
+                    record.suppressed = suppressed
+                    record.msg = f"{record.msg} (+{suppressed} similar suppressed)"
+                return True
+
+            self._seen[key] = (window_start, count, suppressed + 1)
+            return False
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves message formatting to the background listener
+
+    The stock QueueHandler merges args into the message on the calling
+    thread; records here stay in-process, so formatting can be deferred.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging():
     """
     Configure logging with multiple handlers and advanced formatting
+
+    When ``logging.async`` is enabled, records are queued and written by a
+    background listener so disk writes and rotation stay off the caller's
+    thread. Messages should use lazy %-style arguments.
     """
     # Create logger
     logger = logging.getLogger('ai_web_scraper')
-    logger.setLevel(logging.DEBUG)
-    
+
     # Clear any existing handlers
+    _stop_listener()
     logger.handlers.clear()
-    
+    logger.filters.clear()
+
     # Ensure logs directory exists
     log_dir = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
         'logs'
     )
     os.makedirs(log_dir, exist_ok=True)
-    
+
     # Console Handler
+    settings = config.logging
+    console_level = _to_level(settings.console_level, logging.INFO)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(config.get('logging.console_level', logging.INFO))
-    
+    console_handler.setLevel(console_level)
+
     # File Handler with rotation
-    log_file_path = os.path.join(log_dir, config.get('logging.file_name', 'app.log'))
+    file_level = _to_level(settings.file_level, logging.DEBUG)
+    log_file_path = os.path.join(log_dir, settings.file_name)
     file_handler = RotatingFileHandler(
         filename=log_file_path,
-        maxBytes=config.get('logging.max_file_size', 10*1024*1024),  # 10MB
-        backupCount=config.get('logging.backup_count', 5)
+        maxBytes=settings.max_file_size,
+        backupCount=settings.backup_count,
+        encoding='utf-8'
     )
-    file_handler.setLevel(config.get('logging.file_level', logging.DEBUG))
-    
+    file_handler.setLevel(file_level)
+
     # Formatters
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
+    if settings.structured:
+        console_formatter = JsonFormatter(datefmt='%Y-%m-%d %H:%M:%S')
+        file_formatter = JsonFormatter(datefmt='%Y-%m-%d %H:%M:%S')
+    else:
+        console_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
     console_handler.setFormatter(console_formatter)
     file_handler.setFormatter(file_formatter)
-    
+
+    # Only build records that at least one handler will emit
+    logger.setLevel(min(console_level, file_level))
+
+    # Sample repetitive warnings before they are queued
+    if config.get('logging.sampling.enabled', True):
+        logger.addFilter(SamplingFilter(
+            window=config.get('logging.sampling.window', 60),
+            burst=config.get('logging.sampling.burst', 5)
+        ))
+
     # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
+    if settings.asynchronous:
+        global _listener
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(
+            log_queue, console_handler, file_handler,
+            respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_stop_listener)
+        logger.addHandler(DeferredQueueHandler(log_queue))
+    else:
+        logger.addHandler(console_handler)
+        logger.addHandler(file_handler)
+
     return logger
 
 # Create a module-level logger
 logger = setup_logging()
+
+# Rebuild handlers when the config file is hot-reloaded
+config.on_reload(lambda snapshot: setup_logging())
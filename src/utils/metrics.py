@@ -0,0 +1,201 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils.config import config
+
+# Default latency buckets in seconds (Prometheus style upper bounds)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+# Shared no-op context returned by timers while metrics are disabled
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram
+    """
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty histogram
+
+        Args:
+            buckets (Tuple[float, ...]): Sorted bucket upper bounds
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """
+        Record a single observation
+
+        Args:
+            value (float): Observed value
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile from the bucket counts
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            Optional[float]: Upper bound of the bucket holding the quantile
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            if running >= target:
+                return bound
+        return float('inf')
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of per-stage counters and latency histograms
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, prefix: str = 'ai_web_scraper'):
+        """
+        Initialize the registry
+
+        Args:
+            enabled (Optional[bool]): Whether metrics are recorded
+            prefix (str): Prefix for exported metric names
+        """
+        self.enabled = config.get('metrics.enabled', True) if enabled is None else enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def inc(self, name: str, value: float = 1):
+        """
+        Increment a counter
+
+        Args:
+            name (str): Counter name
+            value (float): Amount to add
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, stage: str, seconds: float):
+        """
+        Record a stage latency
+
+        Args:
+            stage (str): Pipeline stage name
+            seconds (float): Elapsed time in seconds
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, stage: str):
+        """
+        Context manager timing a pipeline stage
+
+        Args:
+            stage (str): Pipeline stage name
+
+        Returns:
+            Context manager recording the elapsed time on exit
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timed(stage)
+
+    @contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def reset(self):
+        """
+        Clear all recorded metrics
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, List[Dict[str, object]]]:
+        """
+        Summarize recorded metrics for display
+
+        Returns:
+            Dict[str, List[Dict[str, object]]]: Stage latencies and counters
+        """
+        with self._lock:
+            stages = [
+                {
+                    'stage': stage,
+                    'count': histogram.count,
+                    'total_seconds': round(histogram.total, 4),
+                    'mean_seconds': round(histogram.total / histogram.count, 4) if histogram.count else None,
+                    'p50_seconds': histogram.quantile(0.5),
+                    'p95_seconds': histogram.quantile(0.95),
+                }
+                for stage, histogram in sorted(self._histograms.items())
+            ]
+            counters = [
+                {'counter': name, 'value': value}
+                for name, value in sorted(self._counters.items())
+            ]
+        return {'stages': stages, 'counters': counters}
+
+    def to_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Prometheus text format payload
+        """
+        lines = []
+        with self._lock:
+            for name, value in sorted(self._counters.items()):
+                metric = f'{self.prefix}_{name}_total'
+                lines.append(f'# TYPE {metric} counter')
+                lines.append(f'{metric} {value}')
+
+            if self._histograms:
+                metric = f'{self.prefix}_stage_duration_seconds'
+                lines.append(f'# TYPE {metric} histogram')
+                for stage, histogram in sorted(self._histograms.items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram.total}')
+                    lines.append(f'{metric}_count{{stage="{stage}"}} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+# Global metrics registry
+metrics = MetricsRegistry()
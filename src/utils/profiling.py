@@ -0,0 +1,136 @@
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.utils.config import config
+from src.utils.logging import logger
+
+# Profiles are written next to the application logs
+PROFILE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'profiles'
+)
+
+# Only one run can be profiled at a time (cProfile and tracemalloc are process-wide)
+_active_lock = threading.Lock()
+
+# Recent profile summaries shown in the diagnostics page
+profile_history: deque = deque(maxlen=20)
+
+
+def profiling_enabled(flag: Optional[bool] = None) -> bool:
+    """
+    Resolve whether a run should be profiled
+
+    Args:
+        flag (Optional[bool]): Per-run override, None falls back to config
+
+    Returns:
+        bool: True if the run should be profiled
+    """
+    if flag is None:
+        return bool(config.get('profiling.enabled', False))
+    return flag
+
+
+def _top_functions(profiler: cProfile.Profile, limit: int) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, lineno, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            'function': f'{os.path.basename(filename)}:{lineno}({func})',
+            'calls': nc,
+            'self_seconds': round(tt, 4),
+            'cumulative_seconds': round(ct, 4)
+        })
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:limit]
+
+
+def _top_allocators(snapshot: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    rows = []
+    for stat in snapshot.statistics('lineno')[:limit]:
+        frame = stat.traceback[0]
+        rows.append({
+            'location': f'{os.path.basename(frame.filename)}:{frame.lineno}',
+            'size_kb': round(stat.size / 1024, 1),
+            'blocks': stat.count
+        })
+    return rows
+
+
+@contextmanager
+def profile_run(run_name: str,
+                enabled: Optional[bool] = None,
+                metadata: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Profile CPU time and allocations of a single scrape or analysis run
+
+    Writes ``cpu.prof`` (pstats format), ``allocations.txt`` and
+    ``summary.json`` to ``logs/profiles/<run_name>_<timestamp>/``.
+
+    Args:
+        run_name (str): Name of the profiled run (e.g. scrape, summarize)
+        enabled (Optional[bool]): Per-run flag, None falls back to config
+        metadata (Optional[Dict[str, Any]]): Run metadata saved with the profile
+
+    Yields:
+        Optional[Dict[str, Any]]: Summary filled in when the run finishes,
+                                  None when profiling is off
+    """
+    if not profiling_enabled(enabled) or not _active_lock.acquire(blocking=False):
+        # Disabled, or nested inside a run that is already being profiled
+        yield None
+        return
+
+    top_n = config.get('profiling.top_n', 25)
+    summary: Dict[str, Any] = {
+        'run': run_name,
+        'started_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'metadata': metadata or {}
+    }
+    profiler = cProfile.Profile()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(config.get('profiling.trace_frames', 1))
+
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield summary
+    finally:
+        profiler.disable()
+        summary['wall_seconds'] = round(time.perf_counter() - start, 4)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        _active_lock.release()
+
+        summary['peak_memory_kb'] = round(peak / 1024, 1)
+        summary['top_functions'] = _top_functions(profiler, top_n)
+        summary['top_allocators'] = _top_allocators(snapshot, top_n)
+
+        try:
+            run_dir = os.path.join(PROFILE_DIR, f"{run_name}_{time.strftime('%Y%m%d-%H%M%S')}")
+            os.makedirs(run_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(run_dir, 'cpu.prof'))
+            with open(os.path.join(run_dir, 'allocations.txt'), 'w', encoding='utf-8') as f:
+                for stat in snapshot.statistics('lineno')[:top_n * 4]:
+                    f.write(f"{stat}\n")
+            summary['path'] = run_dir
+            with open(os.path.join(run_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=4, default=str)
+        except OSError as e:
+            logger.warning("Could not write profile: %s | تعذر حفظ ملف التحليل: %s", e, e)
+
+        profile_history.appendleft(summary)
@@ -0,0 +1,58 @@
+import pytest
+
+from src.core.archive import _decode_record, _encode_record
+
+
+@pytest.mark.parametrize('truncated', [None, 'length', 'unspecified'])
+def test_record_round_trip(truncated):
+    body = '<html><body>أداة ذكاء</body></html>'.encode('utf-8')
+    record = _encode_record('https://example.com/tools?page=2', 200, 'OK',
+                            {'Content-Type': 'text/html; charset=utf-8'}, body,
+                            '2024-05-01T10:00:00Z', 2, truncated)
+    page = _decode_record(record)
+    assert page.url == 'https://example.com/tools?page=2'
+    assert page.status == 200
+    assert page.headers['content-type'] == 'text/html; charset=utf-8'
+    assert page.body == body
+    assert page.fetched_at == '2024-05-01T10:00:00Z'
+    assert page.page == 2
+    assert page.truncated == truncated
+
+
+@pytest.fixture
+def archive(tmp_path):
+    pytest.importorskip('zstandard')
+    from src.core.archive import PageArchive
+    archive = PageArchive(str(tmp_path), segment_bytes=200, level=1)
+    yield archive
+    archive.close()
+
+
+def test_archive_append_and_read(archive):
+    headers = {'Content-Type': 'text/html'}
+    first = archive.append('http://a/1', 200, headers, b'<html>one</html>', 'OK', page=1)
+    archive.append('http://a/2', 200, headers, b'<html>two</html>' * 50, 'OK', page=2, truncated='length')
+    archive.append('http://a/1', 304, headers, b'', 'Not Modified', page=1)
+
+    entries = list(archive.iter_entries())
+    assert [(entry.url, entry.status) for entry in entries] == [('http://a/1', 200), ('http://a/2', 200),
+                                                                ('http://a/1', 304)]
+    # Segments roll over once they pass segment_bytes and sort chronologically
+    assert len(archive.segments()) >= 2
+    assert entries[0] == first
+
+    page = archive.read(entries[1])
+    assert page.body == b'<html>two</html>' * 50
+    assert page.truncated == 'length'
+    assert archive.read(first).body == b'<html>one</html>'
+
+    latest = list(archive.iter_entries(latest_only=True))
+    assert [(entry.url, entry.status) for entry in latest] == [('http://a/2', 200), ('http://a/1', 304)]
+
+
+def test_archive_ignores_partial_index_line(archive, tmp_path):
+    entry = archive.append('http://a/1', 200, {}, b'body')
+    archive.close()
+    with open(tmp_path / f'{entry.segment}.idx', 'a', encoding='utf-8') as index:
+        index.write('123\t45\t200')
+    assert list(archive.iter_entries()) == [entry]
@@ -0,0 +1,57 @@
+from bs4 import BeautifulSoup
+
+from src.core.blocks import BlockDetector
+
+DESCRIPTION = 'Generates marketing copy and blog posts from a short brief.'
+
+
+def card(i: int, tag: str = 'article', rating: bool = True) -> str:
+    stars = f'<span class="rating-stars">4.{i}</span>' if rating else ''
+    return f'<{tag} class="tool"><h3>Tool {i}</h3><p>{DESCRIPTION}</p>{stars}<a href="/t/{i}">More</a></{tag}>'
+
+
+def detect(html: str):
+    return BlockDetector(min_repeats=3, min_text=40, max_link_density=0.5).detect(
+        BeautifulSoup(html, 'html.parser')
+    )
+
+
+def test_detects_repeated_cards_and_skips_navigation():
+    nav = '<nav><ul>' + ''.join(f'<li><a href="/c/{i}">Category number {i} with a long label</a></li>'
+                                for i in range(10)) + '</ul></nav>'
+    html = f'<html><body>{nav}<main>{"".join(card(i) for i in range(4))}</main></body></html>'
+    blocks = detect(html)
+    assert [block.name for block in blocks] == ['Tool 0', 'Tool 1', 'Tool 2', 'Tool 3']
+    assert blocks[0].description == DESCRIPTION
+    assert blocks[0].rating == '4.0'
+    assert blocks[0].link_density < 0.5
+
+
+def test_single_article_is_not_a_card_list():
+    article = '<article><h1>About us</h1>' + f'<p>{DESCRIPTION}</p>' * 10 + '</article>'
+    assert detect(f'<html><body>{article}</body></html>') == []
+
+
+def test_lists_split_across_sections_are_merged():
+    sections = ''.join(f'<section><h2>Group {s}</h2>{"".join(card(s * 3 + i) for i in range(3))}</section>'
+                       for s in range(2))
+    blocks = detect(f'<html><body>{sections}</body></html>')
+    assert [block.name for block in blocks] == [f'Tool {i}' for i in range(6)]
+
+
+def test_too_few_repeats():
+    assert detect(f'<html><body>{card(0)}{card(1)}</body></html>') == []
+
+
+def test_card_without_paragraph_uses_remaining_text():
+    cards = ''.join(f'<div class="tool"><h4>Tool {i}</h4><span>{DESCRIPTION}</span></div>' for i in range(3))
+    blocks = detect(f'<html><body><script>var x = "{"y" * 500}";</script>{cards}</body></html>')
+    assert [(block.name, block.description, block.rating) for block in blocks] == \
+        [(f'Tool {i}', DESCRIPTION, None) for i in range(3)]
+
+
+def test_whole_card_link_is_not_link_dense():
+    cards = ''.join(f'<a class="tool" href="/t/{i}"><h3>Tool {i}</h3><p>{DESCRIPTION}</p></a>' for i in range(3))
+    blocks = detect(f'<html><body><div>{cards}</div></body></html>')
+    assert len(blocks) == 3
+    assert blocks[0].link_density == 0.0
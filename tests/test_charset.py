@@ -0,0 +1,72 @@
+import codecs
+
+import pytest
+
+from src.core.charset import CharsetDecoder, normalize_encoding
+
+ARABIC = '<html><body><p>أدوات الذكاء الاصطناعي لكتابة المحتوى وتحليل البيانات</p></body></html>' * 20
+
+
+@pytest.fixture
+def decoder():
+    return CharsetDecoder(sniff_bytes=1024, default_encoding='utf-8')
+
+
+@pytest.mark.parametrize('label, expected', [
+    ('UTF-8', 'utf_8'),
+    ('"windows-1256"', 'cp1256'),
+    ('iso-8859-1', 'cp1252'),
+    ('us-ascii', 'cp1252'),
+    ('no-such-charset', None),
+    (None, None)
+])
+def test_normalize_encoding(label, expected):
+    assert normalize_encoding(label) == expected
+
+
+def test_header_wins_over_bom_and_meta(decoder):
+    body = codecs.BOM_UTF8 + b'<meta charset="windows-1256">'
+    assert decoder.detect(body, 'text/html; charset=ISO-8859-6') == ('iso8859_6', 'header')
+
+
+def test_bom_wins_over_meta(decoder):
+    assert decoder.detect(codecs.BOM_UTF16_LE + '<meta charset="utf-8">'.encode('utf-16-le')) == ('utf-16', 'bom')
+    assert decoder.detect(codecs.BOM_UTF8 + b'<meta charset="windows-1256">', 'text/html') == ('utf-8-sig', 'bom')
+
+
+def test_meta_within_sniff_window(decoder):
+    assert decoder.detect(b'<head><meta http-equiv="Content-Type" content="text/html; charset=windows-1256">') == \
+        ('cp1256', 'meta')
+    # A meta tag past the sniffed prefix is not seen
+    late = b' ' * 2048 + b'<meta charset="windows-1256">'
+    assert decoder.detect(late, 'text/html; charset=bogus') == ('utf_8', 'default')
+
+
+def test_statistical_detection_is_remembered_per_domain(decoder):
+    pytest.importorskip('charset_normalizer')
+    body = ARABIC.encode('cp1256')
+    encoding, source = decoder.detect(body, url='https://arabic.example/tools')
+    assert source == 'detected'
+    assert body.decode(encoding) == ARABIC
+
+    assert decoder.detect(body, url='https://arabic.example/tools?page=2') == (encoding, 'domain')
+    assert decoder.detect(body, url='https://other.example/tools')[1] == 'detected'
+
+    decoder.clear()
+    assert decoder.detect(body, url='https://arabic.example/tools')[1] == 'detected'
+
+
+def test_decode(decoder):
+    text, encoding = decoder.decode(ARABIC.encode('utf-8'), 'text/html; charset=utf-8')
+    assert (text, encoding) == (ARABIC, 'utf_8')
+
+
+def test_guess_before_body(decoder):
+    assert decoder.guess('text/html; charset=windows-1256') == 'cp1256'
+    assert decoder.guess(None, 'https://unknown.example/') == 'utf_8'
+
+
+def test_domain_encoding_is_skipped_when_body_does_not_decode(decoder):
+    decoder._domains['strict.example'] = 'ascii'
+    assert decoder.detect(b'plain', url='https://strict.example/') == ('ascii', 'domain')
+    assert decoder.detect('نص'.encode('utf-8'), url='https://strict.example/') == ('utf_8', 'default')
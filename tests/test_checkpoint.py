@@ -0,0 +1,80 @@
+import os
+
+from src.core.checkpoint import ChunkJournal, CrawlCheckpoint
+
+
+def journal(directory, source, prompt='Summarize'):
+    return ChunkJournal('summary', 'llama3', prompt, source, str(directory))
+
+
+def test_journal_resumes_same_input(tmp_path):
+    first = journal(tmp_path, 'upload-digest')
+    first.put(ChunkJournal.key('first chunk'), 'summary one')
+    # An interrupted run closes the journal without removing it
+    first.close()
+    first.close()
+    assert os.path.exists(first.path)
+
+    resumed = journal(tmp_path, 'upload-digest')
+    assert resumed.get(ChunkJournal.key('first chunk')) == 'summary one'
+    assert resumed.get(ChunkJournal.key('second chunk')) is None
+
+
+def test_journals_of_different_inputs_are_isolated(tmp_path):
+    first = journal(tmp_path, 'input A')
+    second = journal(tmp_path, 'input B')
+    assert first.path != second.path
+    other_prompt = journal(tmp_path, 'input A', prompt='Other prompt')
+    assert other_prompt.path != first.path
+    other_prompt.finish()
+
+    second.put(ChunkJournal.key('input B'), 'summary B')
+    first.finish()
+    assert not os.path.exists(first.path)
+    assert os.path.exists(second.path)
+    second.finish()
+
+
+def test_journal_ignores_torn_last_line(tmp_path):
+    first = journal(tmp_path, 'input')
+    first.put(ChunkJournal.key('chunk'), 'done')
+    first._file.write('{"chunk": "abc", "outp')
+    first.close()
+    resumed = journal(tmp_path, 'input')
+    assert resumed.get(ChunkJournal.key('chunk')) == 'done'
+    resumed.finish()
+
+
+def tools(page):
+    return [{'name': f'Tool {page}', 'description': 'AI tool', 'category': 'Other', 'rating': 'N/A'}]
+
+
+def test_crawl_resume_drops_pages_after_last_save(tmp_path):
+    checkpoint = CrawlCheckpoint('job', str(tmp_path), interval_pages=2)
+    checkpoint.start()
+    for page in (1, 2):
+        checkpoint.record_page(f'http://a/{page}', page, 'en', tools(page))
+    assert checkpoint.due()
+    checkpoint.save({'url': 'http://a/3', 'page': 3})
+    # Logged but never covered by a saved state
+    checkpoint.record_page('http://a/3', 3, 'en', tools(3))
+    checkpoint.close()
+
+    resumed = CrawlCheckpoint('job', str(tmp_path))
+    state = resumed.load()
+    assert (state['url'], state['page']) == ('http://a/3', 3)
+    assert [result['page'] for result in state['results']] == [1, 2]
+
+    resumed.record_page('http://a/3', 3, 'en', tools(3))
+    resumed.save({'url': None, 'page': 4})
+    resumed.close()
+    assert [result['page'] for result in CrawlCheckpoint('job', str(tmp_path)).load()['results']] == [1, 2, 3]
+
+
+def test_finished_crawl_has_no_checkpoint(tmp_path):
+    checkpoint = CrawlCheckpoint('job', str(tmp_path))
+    checkpoint.start()
+    checkpoint.record_page('http://a/1', 1, 'en', tools(1))
+    checkpoint.save({'url': None, 'page': 2})
+    checkpoint.finish()
+    assert CrawlCheckpoint('job', str(tmp_path)).load() is None
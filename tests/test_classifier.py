@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from src.core.classifier import CategoryClassifier, KeywordMatcher, normalize_text
+
+TAXONOMY = {
+    'Writing': {'en': ['writing', 'copywriting', 'text generation'], 'ar': ['كتابة']},
+    'Image': {'en': ['image', 'image generation'], 'ar': ['صور']},
+    'Code': ['code', 'programming']
+}
+
+
+@pytest.fixture
+def classifier():
+    return CategoryClassifier(TAXONOMY, default_category='Other')
+
+
+def test_normalize_text():
+    assert normalize_text('  Hello   WORLD ') == 'hello world'
+    assert normalize_text('أَدَاةُ الكِتَابَة') == 'اداه الكتابه'
+    assert normalize_text('كـــتابة') == 'كتابه'
+
+
+def test_matcher_finds_overlapping_keywords():
+    matcher = KeywordMatcher([('ذكاء', 1), ('ذكاء اصطناعي', 2), ('اصطناعي', 3), ('learning', 4),
+                              ('machine learning', 5), ('', 6)])
+    assert sorted(matcher.iter_matches('ذكاء اصطناعي')) == [(0, 4, 1), (0, 12, 2), (5, 12, 3)]
+    assert sorted(matcher.iter_matches('deep machine learning')) == [(5, 21, 5), (13, 21, 4)]
+
+
+def test_matcher_respects_english_word_boundaries():
+    matcher = KeywordMatcher([('code', 'Code'), ('كتابه', 'Writing')])
+    assert list(matcher.iter_matches('barcode decoder')) == []
+    assert list(matcher.iter_matches('write code.')) == [(6, 10, 'Code')]
+    # Arabic keywords match behind attached prefixes
+    assert list(matcher.iter_matches('بالكتابه')) == [(3, 8, 'Writing')]
+
+
+def test_classify(classifier):
+    assert classifier.classify('AI copywriting assistant') == 'Writing'
+    assert classifier.classify('أداة لكتابة المقالات') == 'Writing'
+    assert classifier.classify('Programming helper') == 'Code'
+    assert classifier.classify('A calendar app') is None
+    assert classifier.classify(None) is None
+
+
+def test_longer_keywords_weigh_more(classifier):
+    # 'image generation' outweighs 'writing'
+    assert classifier.scores('image generation and writing') == {'Image': 21, 'Writing': 7}
+    assert classifier.classify('image generation and writing') == 'Image'
+
+
+def test_ties_go_to_first_category(classifier):
+    assert classifier.classify('code image') == 'Image'
+    assert classifier.classify('image code') == 'Image'
+
+
+def test_classify_many_uses_default(classifier):
+    assert classifier.classify_many(['write code', None, 'صور']) == ['Code', 'Other', 'Image']
+
+
+def test_classify_column_and_fill_missing(classifier):
+    frame = pd.DataFrame({
+        'name': ['Coder', 'Coder', 'Painter', 'Calendar'],
+        'description': ['Writes code', 'Writes code', 'Image generation', None],
+        'category': [None, 'Code', 'Other', 'Productivity']
+    })
+    assert classifier.classify_column(frame).tolist() == ['Code', 'Code', 'Image', 'Other']
+    assert classifier.fill_missing(frame)['category'].tolist() == ['Code', 'Code', 'Image', 'Productivity']
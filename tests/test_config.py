@@ -0,0 +1,113 @@
+import os
+
+import pytest
+import yaml
+
+from src.utils.config import (
+    ConfigError, ConfigManager, ConfigSnapshot, ScraperSettings, _build_section, _coerce
+)
+
+VALID = {
+    'scraper': {'wait_time': 2, 'max_retries': '4', 'headless_mode': 'yes', 'proxies': ['http://p:1']},
+    'logging': {'console_level': 'warning', 'async': False},
+    'ui': {'max_results_display': 100, 'translations': {'en': {'title': 'Tools'}}}
+}
+
+
+def make_manager(path) -> ConfigManager:
+    # Bypass the process-wide singleton so each test owns its manager
+    manager = object.__new__(ConfigManager)
+    manager._snapshot = None
+    ConfigManager.__init__(manager, str(path))
+    return manager
+
+
+def write(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f)
+
+
+@pytest.mark.parametrize('kind, value, expected', [
+    (bool, 'yes', True),
+    (bool, 'off', False),
+    (bool, 1, True),
+    (int, '3', 3),
+    (float, '2.5', 2.5),
+    (str, 10, '10'),
+    (tuple, ['a', 'b'], ('a', 'b'))
+])
+def test_coerce(kind, value, expected):
+    assert _coerce('section', 'name', kind, value) == expected
+
+
+@pytest.mark.parametrize('kind, value', [(int, 'many'), (int, True), (float, None)])
+def test_coerce_rejects_invalid_values(kind, value):
+    with pytest.raises(ConfigError):
+        _coerce('section', 'name', kind, value)
+
+
+def test_typed_section():
+    snapshot = ConfigSnapshot(VALID)
+    assert snapshot.scraper.wait_time == 2
+    assert snapshot.scraper.max_retries == 4
+    assert snapshot.scraper.headless_mode is True
+    assert snapshot.scraper.proxies == ('http://p:1',)
+    assert snapshot.logging.asynchronous is False
+    assert snapshot.get('ui.translations.en')['title'] == 'Tools'
+    assert snapshot.get('ui.missing', 'default') == 'default'
+
+
+@pytest.mark.parametrize('raw', [{'wait_time': -1}, {'default_timeout': 0}, {'max_retries': 'x'}])
+def test_validation_errors(raw):
+    with pytest.raises(ConfigError):
+        _build_section(ScraperSettings, 'scraper', raw)
+
+
+def test_invalid_section_falls_back_alone():
+    raw = dict(VALID, scraper={'wait_time': -1}, logging={'console_level': 'LOUD'})
+    with pytest.raises(ConfigError):
+        ConfigSnapshot(raw)
+
+    snapshot = ConfigSnapshot(raw, strict=False)
+    assert snapshot.scraper == ScraperSettings()
+    assert snapshot.logging.console_level == 'INFO'
+    assert len(snapshot.errors) == 2
+    # Untyped sections are untouched
+    assert snapshot.get('ui.max_results_display') == 100
+
+
+def test_load_keeps_valid_sections(tmp_path):
+    path = tmp_path / 'config.yml'
+    write(path, dict(VALID, scraper={'wait_time': -1}))
+    manager = make_manager(path)
+    assert manager.scraper == ScraperSettings()
+    assert manager.get('ui.translations.en.title') == 'Tools'
+    assert manager.logging.console_level == 'warning'
+
+
+def test_reload_keeps_previous_snapshot_on_invalid_file(tmp_path):
+    path = tmp_path / 'config.yml'
+    write(path, VALID)
+    manager = make_manager(path)
+    reloaded = []
+    manager.on_reload(reloaded.append)
+
+    write(path, dict(VALID, scraper={'wait_time': -1}))
+    assert not manager.reload()
+    assert manager.scraper.wait_time == 2
+
+    path.write_text('scraper: [unclosed', encoding='utf-8')
+    assert not manager.reload()
+    assert manager.scraper.wait_time == 2
+    assert reloaded == []
+
+    write(path, dict(VALID, scraper={'wait_time': 7}))
+    assert manager.reload()
+    assert manager.scraper.wait_time == 7
+    assert reloaded == [manager.snapshot]
+
+
+def test_missing_file_uses_defaults(tmp_path):
+    manager = make_manager(os.path.join(tmp_path, 'missing.yml'))
+    assert manager.scraper == ScraperSettings()
+    assert manager.get('ui.max_results_display', 50) == 50
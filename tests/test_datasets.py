@@ -0,0 +1,51 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+
+from src.core.datasets import load_dataset, write_dataset
+
+TOOLS = pd.DataFrame({
+    'name': ['Writer', 'Painter', 'Coder'],
+    'description': ['Writes posts', 'Draws images', 'Writes code'],
+    'category': ['Writing', 'Image', 'Code'],
+    'rating': ['4.5', 'N/A', '3'],
+    'url': ['http://a/1', 'http://a/1', 'http://b/2'],
+    'page': [1, 1, 2],
+    'language': ['en', 'en', 'ar']
+})
+
+
+def files(base_dir, extension):
+    return glob.glob(os.path.join(base_dir, '**', f'*.{extension}'), recursive=True)
+
+
+def test_arrow_dataset_is_uncompressed_and_memory_mappable(tmp_path):
+    base_dir = write_dataset(TOOLS, str(tmp_path / 'arrow'), format='arrow', compression='zstd')
+    paths = files(base_dir, 'arrow')
+    assert paths
+
+    for path in paths:
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            allocated = pa.total_allocated_bytes()
+            table = reader.read_all()
+            # Zero-copy: buffers point into the mapping, nothing is decompressed
+            assert pa.total_allocated_bytes() == allocated
+            assert table.num_rows > 0
+
+    loaded = load_dataset(base_dir, format='arrow', columns=['name', 'rating'], filters=[('language', 'ar')])
+    assert loaded.to_pydict() == {'name': ['Coder'], 'rating': [3.0]}
+
+
+def test_parquet_dataset_keeps_compression(tmp_path):
+    import pyarrow.parquet as pq
+
+    base_dir = write_dataset(TOOLS, str(tmp_path / 'parquet'), format='parquet', compression='zstd')
+    for path in files(base_dir, 'parquet'):
+        assert pq.ParquetFile(path).metadata.row_group(0).column(0).compression == 'ZSTD'
+    assert sorted(load_dataset(base_dir, columns=['name']).column('name').to_pylist()) == \
+        ['Coder', 'Painter', 'Writer']
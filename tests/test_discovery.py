@@ -0,0 +1,66 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core.discovery import iter_feed_entries, parse_lastmod
+
+MAY_FIRST = datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc).timestamp()
+
+
+def entries(xml: str):
+    return list(iter_feed_entries(io.BytesIO(xml.encode('utf-8'))))
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-05-01T10:00:00Z', MAY_FIRST),
+    ('2024-05-01T12:00:00+02:00', MAY_FIRST),
+    ('2024-05-01T10:00:00', MAY_FIRST),
+    ('Wed, 01 May 2024 10:00:00 GMT', MAY_FIRST),
+    ('2024-05-01', datetime(2024, 5, 1, tzinfo=timezone.utc).timestamp()),
+    ('yesterday', None),
+    ('  ', None),
+    (None, None)
+])
+def test_parse_lastmod(value, expected):
+    assert parse_lastmod(value) == expected
+
+
+def test_sitemap():
+    xml = '''<?xml version="1.0" encoding="UTF-8"?>
+    <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <url><loc> https://example.com/tools </loc><lastmod>2024-05-01T10:00:00Z</lastmod></url>
+      <url><loc>https://example.com/about</loc></url>
+      <url><lastmod>2024-05-01</lastmod></url>
+    </urlset>'''
+    assert entries(xml) == [('page', 'https://example.com/tools', MAY_FIRST),
+                            ('page', 'https://example.com/about', None)]
+
+
+def test_sitemap_index():
+    xml = '''<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <sitemap><loc>https://example.com/sitemap-tools.xml</loc><lastmod>2024-05-01T10:00:00Z</lastmod></sitemap>
+    </sitemapindex>'''
+    assert entries(xml) == [('sitemap', 'https://example.com/sitemap-tools.xml', MAY_FIRST)]
+
+
+def test_rss():
+    xml = '''<rss version="2.0"><channel>
+      <title>Tools</title><link>https://example.com/</link>
+      <item><title>New tool</title><link>https://example.com/tools/new</link>
+        <pubDate>Wed, 01 May 2024 10:00:00 GMT</pubDate></item>
+    </channel></rss>'''
+    # The channel link is not an entry
+    assert entries(xml) == [('page', 'https://example.com/tools/new', MAY_FIRST)]
+
+
+def test_atom_prefers_alternate_link_and_updated_date():
+    xml = '''<feed xmlns="http://www.w3.org/2005/Atom">
+      <entry>
+        <link rel="self" href="https://example.com/feed/1"/>
+        <link href="https://example.com/tools/1"/>
+        <published>2020-01-01T00:00:00Z</published>
+        <updated>2024-05-01T10:00:00Z</updated>
+      </entry>
+    </feed>'''
+    assert entries(xml) == [('page', 'https://example.com/tools/1', MAY_FIRST)]
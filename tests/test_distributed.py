@@ -0,0 +1,197 @@
+import json
+import threading
+import time
+
+import requests
+
+from src.core.distributed import CrawlFrontier, CrawlWorker, InMemoryRedis
+
+
+class SlowScraper:
+    """Scraper double that takes a fixed time per page and counts fetches"""
+
+    def __init__(self, seconds: float = 0.0):
+        self.seconds = seconds
+        self.wait_time = 0
+        self.language = 'en'
+        self.fetches = []
+        self._lock = threading.Lock()
+
+    def scrape_page(self, url, use_proxy=False, page=1):
+        with self._lock:
+            self.fetches.append(url)
+        time.sleep(self.seconds)
+        return [{'name': f'Tool {url}', 'description': 'AI tool', 'category': 'Other', 'rating': 'N/A'}], None
+
+
+class FlakyScraper:
+    """Scraper double failing the first fetches of each URL, linking page n to page n+1"""
+
+    def __init__(self, failures: int, last_page: int = 2):
+        self.failures = failures
+        self.last_page = last_page
+        self.wait_time = 0
+        self.language = 'en'
+        self.fetches = []
+
+    def scrape_page(self, url, use_proxy=False, page=1):
+        self.fetches.append(url)
+        if self.fetches.count(url) <= self.failures:
+            raise requests.exceptions.ConnectionError(f'{url} timed out')
+        next_url = f'http://a/{page + 1}' if page < self.last_page else None
+        return [{'name': f'Tool {page}', 'description': 'AI tool', 'category': 'Other', 'rating': 'N/A'}], next_url
+
+
+def make_frontier(max_pages=10):
+    return CrawlFrontier(InMemoryRedis(), 'test', max_pages, max_attempts=3)
+
+
+def task(url, page=1):
+    return json.dumps({'url': url, 'page': page})
+
+
+def result(url, page=1, worker='w'):
+    return {'url': url, 'page': page, 'language': 'en', 'worker': worker,
+            'tools': [{'name': 'A', 'description': 'd', 'category': 'Other', 'rating': 'N/A'}]}
+
+
+def test_enqueue_skips_seen_urls_and_depth():
+    frontier = make_frontier(max_pages=2)
+    assert frontier.enqueue('http://a/1')
+    assert not frontier.enqueue('http://a/1')
+    assert not frontier.enqueue('http://a/deep', page=3)
+    assert frontier.enqueue_many(['http://a/1', 'http://a/2', 'http://a/3', 'http://a/2'], batch_size=2) == 2
+    assert frontier.client.llen(frontier.queue_key) == 3
+
+
+def test_claim_moves_task_to_processing_list():
+    frontier = make_frontier()
+    frontier.enqueue('http://a/1')
+    claimed = frontier.claim('w1')
+    assert json.loads(claimed)['url'] == 'http://a/1'
+    assert frontier.in_flight() == 0  # w1 has not heart-beaten, so it is not a known worker
+    frontier.heartbeat('w1', 10)
+    assert frontier.in_flight() == 1
+    assert frontier.claim('w1') is None
+
+
+def test_complete_records_once_and_drops_duplicates():
+    frontier = make_frontier()
+    frontier.heartbeat('w1', 10)
+    frontier.heartbeat('w2', 10)
+    frontier.client.rpush(frontier.queue_key, task('http://a/1'), task('http://a/1'))
+
+    first, second = frontier.claim('w1'), frontier.claim('w2')
+    assert frontier.complete('w1', first, result('http://a/1', worker='w1'))
+    assert not frontier.complete('w2', second, result('http://a/1', worker='w2'))
+
+    assert frontier.is_drained()
+    pages = list(frontier.merged_results())
+    assert [(page['url'], page['page']) for page in pages] == [('http://a/1', 1)]
+
+
+def test_claim_skips_visited_urls():
+    frontier = make_frontier()
+    frontier.client.sadd(frontier.visited_key, 'http://a/1')
+    frontier.client.rpush(frontier.queue_key, task('http://a/2'), task('http://a/1'))
+    assert json.loads(frontier.claim('w1'))['url'] == 'http://a/2'
+    assert frontier.client.llen(frontier._processing_key('w1')) == 1
+
+
+def test_reclaim_expired_returns_claims_of_dead_workers():
+    frontier = make_frontier()
+    frontier.enqueue_many(['http://a/1', 'http://a/2'])
+    frontier.heartbeat('dead', 0.05)
+    frontier.claim('dead')
+    frontier.heartbeat('alive', 10)
+
+    assert frontier.reclaim_expired('alive') == 0
+    time.sleep(0.1)
+    assert frontier.reclaim_expired('alive') == 1
+    assert frontier.client.llen(frontier.queue_key) == 2
+    assert 'dead' not in frontier.client.smembers(frontier.workers_key)
+
+
+def test_slow_pages_keep_their_lease():
+    frontier = make_frontier()
+    urls = [f'http://host{i}/list' for i in range(3)]
+    frontier.enqueue_many(urls)
+    scraper = SlowScraper(seconds=0.6)
+
+    workers = [CrawlWorker(frontier, scraper, worker_id=f'w{i}', lease_seconds=0.3, host_delay=0)
+               for i in range(3)]
+    for worker in workers:
+        worker.poll_interval = 0.01
+    threads = [threading.Thread(target=worker.run, kwargs={'idle_timeout': 5}) for worker in workers]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert time.monotonic() - started < 5
+    assert sorted(scraper.fetches) == sorted(urls)
+    assert sorted(page['url'] for page in frontier.merged_results()) == sorted(urls)
+
+
+def test_snapshot_restore_round_trip():
+    frontier = make_frontier()
+    frontier.enqueue_many(['http://a/1', 'http://a/2', 'http://a/3'])
+    frontier.heartbeat('w1', 10)
+    done = frontier.claim('w1')
+    frontier.complete('w1', done, result(json.loads(done)['url']))
+    frontier.claim('w1')
+    state = frontier.snapshot()
+
+    # The claimed but unfinished URL is queued again
+    assert len(state['queue']) == 2
+    assert len(state['results']) == 1
+
+    restored = CrawlFrontier(InMemoryRedis(), 'test', 10)
+    restored.restore(state)
+    assert restored.snapshot() == state
+    assert len(restored.merged_results()) == 1
+
+
+def test_retry_requeues_until_max_attempts():
+    frontier = make_frontier()
+    frontier.enqueue('http://a/1')
+    for attempt in (1, 2):
+        task = frontier.claim('w1')
+        assert json.loads(task).get('attempts', 0) == attempt - 1
+        assert frontier.retry('w1', task)
+        assert not frontier.client.sismember(frontier.visited_key, 'http://a/1')
+        assert frontier.client.llen(frontier._processing_key('w1')) == 0
+
+    assert not frontier.retry('w1', frontier.claim('w1'))
+    assert frontier.client.sismember(frontier.visited_key, 'http://a/1')
+    assert frontier.claim('w1') is None
+
+
+def run_worker(frontier, scraper):
+    worker = CrawlWorker(frontier, scraper, worker_id='w1', lease_seconds=5, host_delay=0)
+    worker.poll_interval = 0.01
+    worker.run(idle_timeout=2)
+
+
+def test_transient_errors_are_retried_and_the_crawl_continues():
+    frontier = make_frontier()
+    frontier.enqueue('http://a/1')
+    scraper = FlakyScraper(failures=2)
+    run_worker(frontier, scraper)
+
+    assert scraper.fetches == ['http://a/1'] * 3 + ['http://a/2'] * 3
+    assert [page['url'] for page in frontier.merged_results()] == ['http://a/1', 'http://a/2']
+
+
+def test_persistent_errors_are_given_up():
+    frontier = make_frontier()
+    frontier.enqueue('http://a/1')
+    scraper = FlakyScraper(failures=10)
+    run_worker(frontier, scraper)
+
+    assert scraper.fetches == ['http://a/1'] * 3
+    assert frontier.is_drained()
+    assert frontier.client.sismember(frontier.visited_key, 'http://a/1')
+    assert len(frontier.merged_results()) == 0
@@ -0,0 +1,130 @@
+import pytest
+import requests
+
+from src.core import scraper as scraper_module
+from src.core.incremental import FingerprintStore, ScrapeDiff
+from src.core.scraper import WebScraper
+
+BASE = 'http://listing.test'
+
+
+def tool(name, description='AI writing tool', category='Writing', rating='4.5'):
+    return {'name': name, 'description': description, 'category': category, 'rating': rating}
+
+
+def test_diff_keys_tools_by_name_across_pages():
+    diff = ScrapeDiff()
+    # Tool B moved from page 1 to page 2 and C changed its description
+    diff.record_page(f'{BASE}/1', [tool('A')])
+    diff.record_page(f'{BASE}/2', [tool('B'), tool('C', 'New description'), tool('D')])
+    diff.finish([dict(tool('A'), url=f'{BASE}/1'), dict(tool('B'), url=f'{BASE}/1'),
+                 dict(tool('C'), url=f'{BASE}/2'), dict(tool('E'), url=f'{BASE}/3')])
+
+    assert [t['name'] for t in diff.added] == ['D']
+    assert [t['name'] for t in diff.changed] == ['C']
+    assert [t['name'] for t in diff.removed] == ['E']
+    assert diff.summary()['changed_pages'] == 2
+
+
+def test_store_tracks_pages_per_crawl(tmp_path):
+    store = FingerprintStore(str(tmp_path / 'fingerprints.json'))
+    store.put(f'{BASE}/1', 'raw', 'content', f'{BASE}/2', [tool('A')], start_url=f'{BASE}/1')
+    store.put('http://other.test/', 'raw', 'content', None, [tool('Z')], start_url='http://other.test/')
+    store.save()
+
+    reloaded = FingerprintStore(str(tmp_path / 'fingerprints.json'))
+    assert reloaded.crawl_pages(f'{BASE}/1') == [f'{BASE}/1']
+    assert reloaded.crawl_tools(f'{BASE}/1') == [dict(tool('A'), url=f'{BASE}/1')]
+    reloaded.forget(f'{BASE}/1')
+    assert reloaded.crawl_pages(f'{BASE}/1') == []
+
+
+def listing(names, next_page=None):
+    cards = ''.join(f'<div class="ai-tool-card"><h3>{name}</h3><p>AI writing tool for {name}</p></div>'
+                    for name in names)
+    link = f'<a href="{BASE}/{next_page}">Next</a>' if next_page else ''
+    return f'<html><body><main>{cards}</main>{link}</body></html>'
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path):
+    pages = {}
+
+    def fetch(self, url, use_proxy=False, page=1):
+        if url not in pages:
+            response = requests.Response()
+            response.status_code, response.url = 404, url
+            raise requests.exceptions.HTTPError('404', response=response)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        response._content = pages[url].encode('utf-8')
+        return response
+
+    store_path = str(tmp_path / 'fingerprints.json')
+    monkeypatch.setattr(WebScraper, '_fetch', fetch)
+    monkeypatch.setattr(scraper_module, 'get_store', lambda: None)
+    monkeypatch.setattr(scraper_module, 'FingerprintStore', lambda: FingerprintStore(store_path))
+    return pages
+
+
+def scrape(max_pages=10):
+    scraper = WebScraper()
+    scraper.wait_time = 0
+    return scraper.scrape(f'{BASE}/1', max_pages=max_pages, incremental=True, checkpoint=False, profile=False)
+
+
+def test_shorter_listing_reports_unreached_tools_as_removed(site):
+    site.update({f'{BASE}/1': listing(['A', 'B'], 2), f'{BASE}/2': listing(['C', 'D'], 3),
+                 f'{BASE}/3': listing(['E'])})
+    first = scrape()
+    assert len(first.diff.added) == 5
+
+    # Page 3 is gone and B moved to page 2
+    site.update({f'{BASE}/1': listing(['A'], 2), f'{BASE}/2': listing(['B', 'C', 'D'])})
+    del site[f'{BASE}/3']
+    second = scrape()
+    assert second.diff.added == []
+    assert second.diff.changed == []
+    assert [t['name'] for t in second.diff.removed] == ['E']
+
+    # The forgotten page is not reported again
+    third = scrape()
+    assert third.diff.summary()['removed'] == 0
+    assert third.diff.summary()['unchanged_pages'] == 2
+
+
+def test_lower_max_pages_reports_unreached_tools_as_removed(site):
+    site.update({f'{BASE}/1': listing(['A'], 2), f'{BASE}/2': listing(['B'])})
+    scrape()
+    assert [t['name'] for t in scrape(max_pages=1).diff.removed] == ['B']
+
+
+def test_failed_fetch_carries_unreached_tools_over(site):
+    site.update({f'{BASE}/1': listing(['A', 'B'], 2), f'{BASE}/2': listing(['C'], 3),
+                 f'{BASE}/3': listing(['D'])})
+    scrape()
+
+    # B vanished from a reached page; C and D are behind the failed fetch
+    site[f'{BASE}/1'] = listing(['A'], 2)
+    page_two = site.pop(f'{BASE}/2')
+    diff = scrape().diff
+    assert [t['name'] for t in diff.removed] == ['B']
+    assert diff.added == []
+
+    site[f'{BASE}/2'] = page_two
+    assert scrape().diff.summary() == {'added': 0, 'changed': 0, 'removed': 0,
+                                       'unchanged_pages': 3, 'changed_pages': 0}
+
+
+def test_failed_first_fetch_removes_nothing(site):
+    site.update({f'{BASE}/1': listing(['A'], 2), f'{BASE}/2': listing(['B'])})
+    scrape()
+    pages = dict(site)
+    site.clear()
+    assert scrape().diff.summary()['removed'] == 0
+
+    site.update(pages)
+    assert scrape().diff.summary() == {'added': 0, 'changed': 0, 'removed': 0,
+                                       'unchanged_pages': 2, 'changed_pages': 0}
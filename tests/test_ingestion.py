@@ -0,0 +1,47 @@
+import io
+import json
+
+import pandas as pd
+
+from src.core.ingestion import file_digest, iter_row_batches, iter_row_texts, read_columns
+
+
+def test_file_digest_streams_and_rewinds(tmp_path):
+    data = b'name,description\n' + b'Tool,AI tool\n' * 20000
+    path = tmp_path / 'tools.csv'
+    path.write_bytes(data)
+    upload = io.BytesIO(data)
+    upload.read(10)
+
+    assert file_digest(upload) == file_digest(str(path))
+    assert upload.tell() == 0
+    assert file_digest(io.BytesIO(data + b'x')) != file_digest(upload)
+
+
+def batches(data: bytes, columns=None, batch_size=2):
+    return list(iter_row_batches(io.BytesIO(data), 'json', batch_size=batch_size, columns=columns))
+
+
+def test_json_array_streams_in_batches():
+    frames = batches(json.dumps([{'name': 'A', 'rating': 4}, {'name': 'B'}, 7]).encode('utf-8'))
+    assert [len(frame) for frame in frames] == [2, 1]
+    assert frames[0].to_dict('records')[0] == {'name': 'A', 'rating': 4}
+    assert frames[1].to_dict('records') == [{'value': 7}]
+
+
+def test_object_shaped_json_is_read_like_pandas():
+    frame = pd.DataFrame({'name': ['A', 'B', 'C'], 'description': ['x', 'y', 'z'], 'rating': [4.5, 3.0, 5.0]})
+    data = b'\xef\xbb\xbf  ' + frame.to_json().encode('utf-8')
+    frames = batches(data)
+    assert [len(batch) for batch in frames] == [2, 1]
+    assert pd.concat(frames).to_dict('records') == frame.to_dict('records')
+
+    assert read_columns(io.BytesIO(data), 'json') == ['name', 'description', 'rating']
+    rows = list(iter_row_texts(batches(data, columns=['name', 'rating'])))
+    assert rows == ['name: A | rating: 4.5', 'name: B | rating: 3.0', 'name: C | rating: 5.0']
+
+
+def test_json_array_with_byte_order_mark(tmp_path):
+    path = tmp_path / 'tools.json'
+    path.write_bytes(b'\xef\xbb\xbf' + json.dumps([{'name': 'A'}]).encode('utf-8'))
+    assert [frame.to_dict('records') for frame in iter_row_batches(str(path), 'json')] == [[{'name': 'A'}]]
@@ -0,0 +1,73 @@
+import pytest
+
+from src.core.records import ToolTable
+
+RESULTS = [
+    {'url': 'http://a/1', 'page': 1, 'language': 'en', 'tools': [
+        {'name': 'Writer', 'description': 'Writes text', 'category': 'Writing', 'rating': '4.5'},
+        {'name': 'Painter', 'description': 'Draws images', 'category': 'Image', 'rating': 'N/A'}
+    ]},
+    {'url': 'http://a/2', 'page': 2, 'language': 'en', 'tools': []},
+    {'url': 'http://a/3', 'page': 3, 'language': 'ar', 'tools': [
+        {'name': 'كاتب', 'description': 'يكتب النصوص', 'category': 'Writing', 'rating': '4.0'}
+    ]}
+]
+
+
+def records():
+    return [dict(tool, url=result['url'], page=result['page'], language=result['language'])
+            for result in RESULTS for tool in result['tools']]
+
+
+def test_pages_round_trip():
+    table = ToolTable.from_results(RESULTS)
+    assert len(table) == 3
+    assert table.num_tools == 3
+    assert list(table) == RESULTS
+    assert table[-1] == RESULTS[-1]
+    assert table[1:] == RESULTS[1:]
+    assert ToolTable.from_results(table) is table
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_missing_category_and_rating_get_defaults():
+    table = ToolTable()
+    table.add_page('http://a/1', 1, 'en', [{'name': 'A', 'description': 'd', 'category': '', 'rating': None}])
+    assert table[0]['tools'] == [{'name': 'A', 'description': 'd', 'category': 'Uncategorized', 'rating': 'N/A'}]
+
+
+def test_iter_records():
+    assert list(ToolTable.from_results(RESULTS).iter_records()) == records()
+
+
+def test_to_pandas():
+    frame = ToolTable.from_results(RESULTS).to_pandas()
+    assert frame.to_dict('records') == records()
+    assert str(frame['category'].dtype) == 'category'
+    assert list(frame['category'].cat.categories) == ['Writing', 'Image']
+
+
+def test_table_grows_after_export():
+    table = ToolTable.from_results(RESULTS)
+    frame = table.to_pandas()
+    table.add_page('http://a/4', 4, 'en', [{'name': 'Coder', 'description': 'Writes code', 'category': 'Code'}])
+
+    assert len(frame) == 3
+    assert table.to_pandas()['category'].tolist() == ['Writing', 'Image', 'Writing', 'Code']
+
+
+def test_to_arrow():
+    pytest.importorskip('pyarrow')
+    table = ToolTable.from_results(RESULTS)
+    arrow = table.to_arrow()
+    assert arrow.to_pylist() == records()
+    assert str(arrow.schema.field('url').type) == 'dictionary<values=string, indices=int32, ordered=0>'
+
+    table.add_page('http://a/4', 4, 'en', [])
+    assert arrow.num_rows == 3
+    assert ToolTable().to_arrow().num_rows == 0
+
+
+def test_empty_table_exports():
+    assert ToolTable().to_pandas().empty
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('streamlit')
+
+from src.core.records import ToolTable
+from src.ui.results import filter_results, page_bounds, rating_values
+
+RESULTS = [
+    {'url': 'http://a/1', 'page': 1, 'language': 'en', 'tools': [
+        {'name': 'writer', 'description': 'Writes blog posts', 'category': 'Writing', 'rating': '4.5 stars'},
+        {'name': 'Painter', 'description': 'Draws images', 'category': 'Image', 'rating': 'N/A'}
+    ]},
+    {'url': 'http://a/2', 'page': 2, 'language': 'en', 'tools': [
+        {'name': 'Coder', 'description': 'Writes code', 'category': 'Code', 'rating': '4,8'},
+        {'name': 'Artist', 'description': 'Edits photos', 'category': 'Image', 'rating': '3'}
+    ]}
+]
+
+
+@pytest.fixture
+def frame():
+    return ToolTable.from_results(RESULTS).to_pandas()
+
+
+def names(frame, rows):
+    return frame.loc[rows, 'name'].tolist()
+
+
+def test_rating_values():
+    ratings = pd.Series(['4.5 stars', '4,8', 'N/A', '3'])
+    assert rating_values(ratings).tolist()[:2] == [4.5, 4.8]
+    assert pd.isna(rating_values(ratings)[2])
+
+
+def test_unfiltered_results_keep_scrape_order(frame):
+    assert names(frame, filter_results(frame)) == ['writer', 'Painter', 'Coder', 'Artist']
+
+
+def test_search_is_case_insensitive_across_columns(frame):
+    assert names(frame, filter_results(frame, 'WRITES')) == ['writer', 'Coder']
+    assert names(frame, filter_results(frame, 'a/2')) == ['Coder', 'Artist']
+    assert names(frame, filter_results(frame, 'image')) == ['Painter', 'Artist']
+    assert len(filter_results(frame, 'no such tool')) == 0
+
+
+def test_category_filter_combines_with_search(frame):
+    assert names(frame, filter_results(frame, categories=['Image', 'Code'])) == ['Painter', 'Coder', 'Artist']
+    assert names(frame, filter_results(frame, 'photos', categories=['Image'])) == ['Artist']
+
+
+def test_sort(frame):
+    assert names(frame, filter_results(frame, sort_by='name')) == ['Artist', 'Coder', 'Painter', 'writer']
+    assert names(frame, filter_results(frame, sort_by='category', descending=True)) == \
+        ['writer', 'Painter', 'Artist', 'Coder']
+    # Unrated tools go last in either direction
+    assert names(frame, filter_results(frame, sort_by='rating')) == ['Artist', 'writer', 'Coder', 'Painter']
+    assert names(frame, filter_results(frame, sort_by='rating', descending=True)) == \
+        ['Coder', 'writer', 'Artist', 'Painter']
+
+
+@pytest.mark.parametrize('total, page, page_size, expected', [
+    (0, 1, 10, (1, 0, 0)),
+    (25, 1, 10, (3, 0, 10)),
+    (25, 3, 10, (3, 20, 25)),
+    (25, 9, 10, (3, 20, 25)),
+    (25, 0, 10, (3, 0, 10)),
+    (20, 2, 10, (2, 10, 20))
+])
+def test_page_bounds(total, page, page_size, expected):
+    assert page_bounds(total, page, page_size) == expected
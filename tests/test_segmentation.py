@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.core.embeddings import encode_batched, token_lengths
+from src.core.segmentation import split_sentences
+
+
+class LengthEncoder:
+    """Encoder double embedding each text as [len(text), first char code] and recording batches"""
+
+    max_seq_length = 512
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size):
+        self.batches.append(list(texts))
+        return [[len(text), ord(text[0])] for text in texts]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('First sentence. Second one! Third?', ['First sentence.', 'Second one!', 'Third?']),
+    ('هذه أداة رائعة؟ نعم، إنها كذلك.', ['هذه أداة رائعة؟', 'نعم، إنها كذلك.']),
+    ('Line one\nLine two', ['Line one', 'Line two']),
+    ('Prices start at 9.99 dollars. Dr. Smith agrees.', ['Prices start at 9.99 dollars.', 'Dr. Smith agrees.']),
+    ('He said "Stop." Then left.', ['He said "Stop."', 'Then left.']),
+    ('Ok. 42. ... Real sentence.', ['Ok.', 'Real sentence.'])
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text, min_chars=3, max_chars=1000) == expected
+
+
+def test_long_sentences_break_at_clauses():
+    sentence = 'first clause here, second clause here, third clause here.'
+    assert split_sentences(sentence, min_chars=3, max_chars=25) == [
+        'first clause here,', 'second clause here,', 'third clause here.'
+    ]
+
+
+def test_encode_batched_keeps_input_order():
+    texts = ['a' * 40, 'b' * 4, 'c' * 400, 'd' * 8, 'e' * 120]
+    encoder = LengthEncoder()
+    embeddings = encode_batched(encoder, texts, token_budget=64, max_batch_size=8)
+
+    assert embeddings.dtype == np.float32
+    assert embeddings.tolist() == [[len(text), ord(text[0])] for text in texts]
+    # Batches are length-sorted and each fits the padded-token budget
+    assert [text[0] for batch in encoder.batches for text in batch] == ['b', 'd', 'a', 'e', 'c']
+    for batch in encoder.batches:
+        assert len(batch) == 1 or len(batch) * token_lengths(encoder, batch).max() <= 64
+
+
+def test_encode_batched_respects_max_batch_size():
+    encoder = LengthEncoder()
+    encode_batched(encoder, ['x' * 10] * 10, token_budget=10000, max_batch_size=4)
+    assert [len(batch) for batch in encoder.batches] == [4, 4, 2]
+
+
+def test_encode_batched_empty():
+    assert encode_batched(LengthEncoder(), []).shape == (0, 0)
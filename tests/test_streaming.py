@@ -0,0 +1,81 @@
+import pytest
+
+from src.core.streaming import ListingWatcher, read_body
+
+CARD_CLASSES = ('ai-tool-card',)
+NEXT_LINK_TEXTS = ('Next',)
+
+
+class ChunkedResponse:
+    """Response double serving a body in fixed-size chunks"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+def card(i: int) -> str:
+    filler = 'Writes, summarizes and translates text. ' * 35
+    return f'<div class="ai-tool-card"><h3>Tool {i}</h3><p>{filler}</p></div>'
+
+
+def page(listing: str, top_link: bool = True) -> bytes:
+    top = '<nav><a href="/p2">Next</a></nav>' if top_link else ''
+    footer = '<footer>' + '<p>footer</p>' * 5000 + '</footer>'
+    return (f'<html><body>{top}<main>{listing}</main>'
+            f'<div class="pagination"><a href="/p2">Next</a></div>{footer}</body></html>').encode('utf-8')
+
+
+def read(body: bytes, tail_bytes: int = 4096):
+    watcher = ListingWatcher(CARD_CLASSES, NEXT_LINK_TEXTS)
+    return read_body(ChunkedResponse(body), 10 * len(body), chunk_size=4096,
+                     watcher=watcher, tail_bytes=tail_bytes)
+
+
+def test_grid_columns_keep_listing_open():
+    # Each card is the only child of its column, so the card's parent is not the listing
+    grid = '<div class="row">' + ''.join(f'<div class="col-md-4">{card(i)}</div>' for i in range(100)) + '</div>'
+    body, reason = read(page(grid))
+    assert body.count(b'class="ai-tool-card"') == 100
+    assert reason == 'early_stop'
+    assert b'class="pagination"' in body
+
+
+def test_grid_rows_keep_listing_open():
+    rows = ''.join(
+        '<div class="row">' + ''.join(f'<div class="col">{card(row * 3 + i)}</div>' for i in range(3)) + '</div>'
+        for row in range(20)
+    )
+    body, reason = read(page(f'<div class="grid">{rows}</div>'))
+    assert body.count(b'class="ai-tool-card"') == 60
+    assert reason == 'early_stop'
+
+
+def test_flat_list_stops_at_pagination():
+    body, reason = read(page(''.join(card(i) for i in range(10)), top_link=False))
+    assert reason == 'early_stop'
+    assert body.count(b'class="ai-tool-card"') == 10
+    assert len(body) < len(page(''.join(card(i) for i in range(10)), top_link=False)) // 2
+
+
+def test_single_card_is_never_done():
+    watcher = ListingWatcher(CARD_CLASSES, NEXT_LINK_TEXTS)
+    watcher.feed(page(card(0)).decode('utf-8'))
+    assert watcher.cards == 1
+    assert not watcher.listing_done
+
+
+def test_max_cards_ends_listing():
+    watcher = ListingWatcher(CARD_CLASSES, NEXT_LINK_TEXTS, max_cards=2)
+    watcher.feed(card(0) + card(1))
+    assert watcher.listing_done
+
+
+@pytest.mark.parametrize('max_bytes', [100, 5000])
+def test_size_limit(max_bytes):
+    body, reason = read_body(ChunkedResponse(b'x' * 10000), max_bytes, chunk_size=1024)
+    assert reason == 'size_limit'
+    assert len(body) == max_bytes